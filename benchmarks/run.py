@@ -0,0 +1,707 @@
+"""Benchmark every showcase chart and Tufte helper, and catch regressions.
+
+Two groups of cases. ``showcase`` renders each registered showcase job on
+its bundled data (12 months, five products, ...), exactly as
+``_docs/generate_showcase.py`` does. The scaling cases draw the same charts
+with the ``tufte`` helpers on synthetic data, from those 12 points up to
+10 million, and from 1 series (or facet, row, bar) up to 1000. Each case
+runs in a fresh interpreter, so its peak RSS is its own and nothing is
+warmed up by an earlier case. Per case the runner records the best wall
+time of ``--repeat`` runs, the first (cold) run, peak RSS and the size of
+the written file, and appends the run to a JSON history:
+
+    python benchmarks/run.py                       # everything up to 1e7 values
+    python benchmarks/run.py --quick               # smallest size of each case
+    python benchmarks/run.py line 'scatter*' --max-values 1e6
+    python benchmarks/run.py --list
+
+Every run is compared with the latest earlier run of the same case on the
+same machine in the history; a case that got more than ``--threshold``
+slower (or grew that much in peak RSS or output bytes) is reported and the
+exit status is 1. ``--no-save`` checks without recording.
+"""
+
+import argparse
+import fnmatch
+import itertools
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+HISTORY = Path(__file__).resolve().parent / "history.json"
+
+sys.path.insert(0, str(ROOT))
+from tufte.style import PALETTE, PALETTE_DARK, TUFTE_DARK_RC, TUFTE_RC
+
+POINTS = (12, 1_000, 100_000, 1_000_000, 10_000_000)
+SERIES = (1, 10, 100, 1000)
+
+# Cases with more values (points x series) than this are skipped: a 1e7 x 1000
+# float array alone is 80 GB.
+MAX_VALUES = 10_000_000
+
+
+# --- Cases --------------------------------------------------------------------
+
+CASES = {}
+
+
+def bench(name, rc=TUFTE_RC, **params):
+    """Register ``fn(**params)`` as the benchmark ``name`` over the grid ``params``.
+
+    ``fn`` does the untimed setup (building the data) and returns
+    ``run(out_dir)``, the timed part, which renders into ``out_dir`` and
+    returns the path it wrote. ``params`` maps each parameter to its values;
+    every combination is one case. ``run`` is called under
+    ``plt.rc_context(rc)`` unless ``rc`` is None.
+    """
+    def register(fn):
+        CASES[name] = (fn, rc, params)
+        return fn
+    return register
+
+
+def walks(points, series, seed=0):
+    """``(series, points)`` random walks around 50, one row per series."""
+    rng = np.random.default_rng(seed)
+    return 50 + np.cumsum(rng.standard_normal((series, points)), axis=1)
+
+
+def _save(fig, path):
+    import matplotlib.pyplot as plt
+
+    from tufte.layout import save
+
+    save(fig, path)
+    plt.close(fig)
+    return path
+
+
+def _line(points, series, palette, name="line.png", variants=None):
+    """The line chart; with ``variants`` ({theme: name}) also saved re-skinned in each."""
+    import matplotlib.pyplot as plt
+
+    from tufte.downsample import plot_line
+    from tufte.frame import tufte_axes
+    from tufte.marks import direct_labels
+
+    x = np.arange(points, dtype=float)
+    ys = walks(points, series)
+
+    def run(out):
+        fig, ax = plt.subplots(figsize=(9, 6))
+        colors = [palette["highlight"]] + [palette["gray"]] * (series - 1)
+        for y, color in zip(ys, colors):
+            plot_line(ax, x, y, color=color, linewidth=2 if color == colors[0] else 1)
+        tufte_axes(ax, x, tuple(ys))
+        direct_labels(ax, np.full(series, x[-1]), [y[-1] for y in ys],
+                      [f"Series {i}" for i in range(series)], colors)
+        fig.text(0.125, 0.95, "Revenue Exceeded Target", fontsize=18, color=palette["text"])
+        if not variants:
+            return _save(fig, out / name)
+        from tufte.themes import save_themes
+
+        paths = save_themes(fig, {"light": out / name,
+                                  **{theme: out / file for theme, file in variants.items()}})
+        plt.close(fig)
+        return paths["light"]
+    return run
+
+
+@bench("line", points=POINTS, series=SERIES[:3])
+def line(points, series):
+    return _line(points, series, PALETTE)
+
+
+@bench("dark", rc=TUFTE_DARK_RC, points=POINTS, series=SERIES[:3])
+def dark(points, series):
+    return _line(points, series, PALETTE_DARK)
+
+
+@bench("themes", points=POINTS, series=SERIES[:3])
+def themes(points, series):
+    # "line" and "dark" from one figure: drawn and laid out once, re-skinned for dark
+    return _line(points, series, PALETTE, variants={"dark": "line-dark.png"})
+
+
+@bench("vector", points=POINTS[:4], series=SERIES[:2], format=("svg", "pdf"))
+def vector(points, series, format):
+    # The line chart through tufte.vector: rounded, pruned, fonts subset
+    return _line(points, series, PALETTE, f"line.{format}")
+
+
+@bench("before_after", points=POINTS[:4], series=(2, 10))
+def before_after(points, series):
+    import matplotlib.pyplot as plt
+
+    from tufte.downsample import plot_line
+    from tufte.frame import tufte_axes
+    from tufte.layout import tufte_layout
+
+    x = np.arange(points, dtype=float)
+    ys = walks(points, series)
+
+    def run(out):
+        fig, (before, after) = plt.subplots(1, 2, figsize=(16, 5.5))
+        # Before: every point drawn, grid, legend, boxed axes
+        before.grid(True, color="#cccccc", linewidth=0.8, alpha=0.7)
+        for i, y in enumerate(ys):
+            before.plot(x, y, linewidth=2, label=f"Series {i}")
+        before.legend(loc="upper left", frameon=True)
+        for spine in before.spines.values():
+            spine.set_visible(True)
+        # After: downsampled to the axes width, range frame
+        for i, y in enumerate(ys):
+            plot_line(after, x, y, color=PALETTE["highlight"] if i == 0 else PALETTE["gray"],
+                      linewidth=2 if i == 0 else 1.5)
+        tufte_axes(after, x, tuple(ys))
+        tufte_layout(fig)
+        return _save(fig, out / "before-after.png")
+    return run
+
+
+@bench("bar", points=(5, 12, 100, 1000))
+def bar(points):
+    from matplotlib.figure import Figure
+
+    from tufte.spec import Chart, to_matplotlib
+
+    rng = np.random.default_rng(0)
+    spec = {"kind": "bar", "title": "Product A Leads Revenue",
+            "x": [f"Product {i}" for i in range(points)],
+            "series": [{"name": "Revenue", "values": rng.uniform(5, 50, points).round(1).tolist()}]}
+
+    def run(out):
+        fig = Figure(figsize=(9, max(5, points * 0.25)))
+        to_matplotlib(Chart(spec), fig.add_subplot())
+        return _save(fig, out / "bar.png")
+    return run
+
+
+@bench("light_dark", points=(5, 12, 100, 1000))
+def light_dark(points):
+    from matplotlib.figure import Figure
+
+    from tufte.spec import Chart, to_matplotlib
+
+    rng = np.random.default_rng(0)
+    spec = {"kind": "bar", "title": "Product A Leads Revenue",
+            "x": [f"Product {i}" for i in range(points)],
+            "series": [{"name": "Revenue", "values": rng.uniform(5, 50, points).round(1).tolist()}]}
+
+    def run(out):
+        fig = Figure(figsize=(16, max(5.5, points * 0.25)))
+        for i, theme in enumerate(("light", "dark")):
+            to_matplotlib(Chart({**spec, "theme": theme}), fig.add_subplot(1, 2, i + 1))
+        return _save(fig, out / "light-dark.png")
+    return run
+
+
+@bench("small_multiples", points=POINTS[:4], series=SERIES)
+def small_multiples_chart(points, series):
+    import matplotlib.pyplot as plt
+
+    from tufte.multiples import small_multiples
+
+    values = walks(points, series)
+
+    def run(out):
+        fig = plt.figure(figsize=(16, 3.5 if series <= 4 else 10))
+        ax = fig.add_axes((0.08, 0.1, 0.9, 0.72))
+        small_multiples(ax, values, titles=[f"Region {i}" for i in range(series)],
+                        colors=PALETTE["gray"], axis_color=PALETTE["axis"],
+                        tick_color=PALETTE["text3"], title_color=PALETTE["text"])
+        return _save(fig, out / "small-multiples.png")
+    return run
+
+
+@bench("scatter", points=POINTS[:4], series=(1, 3, 10))
+def scatter(points, series):
+    import matplotlib.pyplot as plt
+
+    from tufte.frame import tufte_axes
+
+    rng = np.random.default_rng(0)
+    groups = [(rng.normal(20 + 50 * i / series, 10, points), rng.normal(50, 12, points))
+              for i in range(series)]
+    markers = "osD^v<>ph*"
+
+    def run(out):
+        fig, ax = plt.subplots(figsize=(9, 6))
+        for i, (gx, gy) in enumerate(groups):
+            color = PALETTE["cat"][i % len(PALETTE["cat"])]
+            ax.scatter(gx, gy, marker=markers[i % len(markers)], c=color, s=40, alpha=0.7,
+                       edgecolors="none")
+            ax.annotate(f"Group {i}", xy=(gx.mean(), gy.mean()), xytext=(12, 0),
+                        textcoords="offset points", color=color, va="center")
+        tufte_axes(ax, [g[0] for g in groups], [g[1] for g in groups])
+        return _save(fig, out / "scatter.png")
+    return run
+
+
+@bench("scatter_plotly", rc=None, points=POINTS, series=(1, 3, 10))
+def scatter_plotly(points, series):
+    from tufte.plotly_figure import tufte_figure
+    from tufte.scatter import add_scatter, scatter_mode
+
+    rng = np.random.default_rng(0)
+    groups = [(rng.normal(20 + 50 * i / series, 10, points), rng.normal(50, 12, points))
+              for i in range(series)]
+
+    def run(out):
+        fig = tufte_figure(title="Enterprise Wins Faster")
+        mode = scatter_mode(points * series)
+        for i, (gx, gy) in enumerate(groups):
+            add_scatter(fig, gx, gy, f"Group {i}", mode=mode)
+        path = out / "scatter.json"
+        path.write_text(fig.to_json())
+        return path
+    return run
+
+
+@bench("slopegraph", points=(5, 12, 100, 1000))
+def slopegraph(points):
+    from tufte.service import render_spec
+
+    rng = np.random.default_rng(0)
+    before = rng.uniform(5, 50, points).round()
+    spec = {"kind": "slope", "title": "Engineering Grew Most",
+            "labels": [f"Team {i}" for i in range(points)], "before": before.tolist(),
+            "after": (before + rng.normal(0, 5, points)).round().tolist(),
+            "headers": ["2024", "2025"], "highlight": [0]}
+
+    def run(out):
+        path = out / "slopegraph.png"
+        path.write_bytes(render_spec(spec)[0])
+        return path
+    return run
+
+
+@bench("direct_labels", series=(10, 100, 500, 1000), backend=("matplotlib", "plotly"))
+def labels(series, backend):
+    # Every series ends in the same narrow band, so nearly every label collides
+    ys = walks(30, series)
+    ys -= ys[:, -1:] * 0.9
+    x = np.arange(30)
+    names = [f"Series {i}" for i in range(series)]
+
+    if backend == "plotly":
+        from tufte.plotly_figure import add_direct_labels, tufte_figure
+
+        traces = [dict(type="scatter", x=x, y=y, mode="lines", name=name)
+                  for y, name in zip(ys, names)]
+
+        def run(out):
+            fig = tufte_figure(traces, validate=False, height=max(450, series * 18))
+            add_direct_labels(fig, traces)
+            path = out / "labels.json"
+            path.write_text(fig.to_json())
+            return path
+        return run
+
+    import matplotlib.pyplot as plt
+
+    from tufte.marks import direct_labels
+
+    def run(out):
+        fig, ax = plt.subplots(figsize=(9, max(6, series * 0.2)), dpi=50)
+        ax.plot(x, ys.T, color=PALETTE["gray"], linewidth=0.5)
+        direct_labels(ax, np.full(series, x[-1]), ys[:, -1], names, PALETTE["gray"])
+        return _save(fig, out / "labels.png")
+    return run
+
+
+@bench("stream", points=(100, 1000), series=(2, 10), backend=("matplotlib", "plotly"))
+def stream(points, series, backend):
+    # ``points`` ticks of one value per series into a 600-point window
+    ys = walks(points, series)
+    names = [f"Series {i}" for i in range(series)]
+
+    if backend == "plotly":
+        from tufte.stream import PlotlyStream
+
+        def run(out):
+            chart = PlotlyStream(names, window=600, highlight=0, peak=0)
+            messages = [chart.figure().to_plotly_json()]
+            messages += [chart.append(i, ys[:, i]) for i in range(points)]
+            path = out / "stream.json"
+            path.write_text(json.dumps(messages, default=list))
+            return path
+        return run
+
+    import matplotlib.pyplot as plt
+
+    from tufte.stream import StreamingChart
+
+    def run(out):
+        fig, ax = plt.subplots(figsize=(9, 5), dpi=50)
+        chart = StreamingChart(ax, names, window=600, highlight=0, peak=0)
+        fig.canvas.draw()
+        for i in range(points):
+            chart.append(i, ys[:, i])
+            chart.draw()
+        return _save(fig, out / "stream.png")
+    return run
+
+
+@bench("source", points=POINTS[1:], format=("npy", "parquet", "arrow"))
+def source(points, format):
+    # A range-frame line chart straight from a file, read in chunks
+    import matplotlib.pyplot as plt
+
+    from tufte.frame import tufte_axes
+    from tufte.source import open_source, plot_source
+
+    path = Path(tempfile.mkdtemp()) / f"walk.{format}"
+    columns = {"t": np.arange(points, dtype=float), "y": walks(points, 1)[0]}
+    if format == "npy":
+        path.mkdir()
+        for name, values in columns.items():
+            np.save(path / f"{name}.npy", values)
+    else:
+        import pyarrow as pa
+        import pyarrow.feather
+        import pyarrow.parquet
+
+        table = pa.table(columns)
+        if format == "parquet":
+            pa.parquet.write_table(table, path, row_group_size=1_000_000)
+        else:
+            pa.feather.write_feather(table, path, compression="uncompressed")
+
+    def run(out):
+        fig, ax = plt.subplots(figsize=(9, 6))
+        line, = plot_source(ax, open_source(path), "t", "y", color=PALETTE["highlight"])
+        tufte_axes(ax, *line.get_data())
+        return _save(fig, out / "source.png")
+    return run
+
+
+@bench("sparklines", points=POINTS[:4], series=SERIES)
+def sparkline_table(points, series):
+    import matplotlib.pyplot as plt
+
+    from tufte.sparklines import sparklines
+
+    data = walks(points, series)
+
+    def run(out):
+        fig, ax = plt.subplots(figsize=(8, max(4.5, series * 0.05)))
+        sparklines(ax, data, labels=[f"Metric {i}" for i in range(series)],
+                   color=PALETTE["gray"], min_color=PALETTE["highlight"],
+                   max_color=PALETTE["cat"][0], separators="#eeeeee")
+        return _save(fig, out / "sparklines.png")
+    return run
+
+
+@bench("sparklines_svg", rc=None, points=POINTS[:4], series=SERIES)
+def sparklines_svg(points, series):
+    from tufte.svg import sparkline_svgs
+
+    data = walks(points, series)
+
+    def run(out):
+        path = out / "sparklines.html"
+        path.write_text("\n".join(sparkline_svgs(data)))
+        return path
+    return run
+
+
+@bench("table", points=(4, 12, 1000, 10_000))
+def table(points):
+    from tufte.table import Table
+
+    rng = np.random.default_rng(0)
+    q = rng.uniform(5, 20, (points, 4))
+    rows = [[f"Region {i}", *r, r.sum(), f"{rng.integers(-10, 30):+d}%"] for i, r in enumerate(q)]
+    headers = ["Region", "Q1", "Q2", "Q3", "Q4", "Total", "vs. Prior"]
+
+    def run(out):
+        path = out / "table.pdf"
+        Table(rows, headers, fmt="{:.1f}").save(path)
+        return path
+    return run
+
+
+@bench("gif", points=POINTS[:3], series=(2, 10))
+def gif(points, series):
+    import matplotlib.pyplot as plt
+
+    from tufte.animate import build_palette, render_frames, save_animation, transition_times
+    from tufte.downsample import plot_line
+
+    x = np.arange(points, dtype=float)
+    ys = walks(points, series)
+    start, end = np.array([0.12, 0.47, 0.71]), np.array([0.89, 0.10, 0.11])
+
+    def run(out):
+        fig, ax = plt.subplots(figsize=(9, 6), dpi=100)
+        lines = [plot_line(ax, x, y, linewidth=2)[0] for y in ys]
+        label = ax.text(x[-1], ys[0, -1], " Series 0", alpha=0)
+
+        def update(t):
+            lines[0].set_color(start + (end - start) * t)
+            for line in lines[1:]:
+                line.set_alpha(1 - 0.6 * t)
+            label.set_alpha(t)
+
+        path = out / "animated.gif"
+        palette = build_palette(render_frames(fig, update, [0.0, 0.5, 1.0]))
+        save_animation(path, render_frames(fig, update, transition_times()), fps=15,
+                       palette=palette)
+        plt.close(fig)
+        return path
+    return run
+
+
+@bench("downsample", rc=None, points=POINTS[2:], method=("m4", "lttb"))
+def downsampling(points, method):
+    from tufte.downsample import downsample
+
+    x = np.arange(points, dtype=float)
+    y = walks(points, 1)[0]
+
+    def run(out):
+        path = out / "downsample.npy"
+        np.save(path, np.vstack(downsample(x, y, 800, method)))
+        return path
+    return run
+
+
+@bench("bundle", rc=None, points=(12, 1_000, 100_000), series=(1, 10, 100))
+def bundle(points, series):
+    from tufte.bundle import write_bundle
+    from tufte.plotly_figure import direct_label, tufte_figure
+
+    x = np.arange(points)
+    ys = walks(points, series)
+
+    def run(out):
+        figures = [tufte_figure([dict(type="scatter", x=x, y=y, mode="lines")],
+                                annotations=[direct_label(x[-1], y[-1], f"Series {i}")],
+                                validate=False)
+                   for i, y in enumerate(ys)]
+        path = out / "bundle"
+        write_bundle(path, figures, shared_js=True, float32=True)
+        return path / "index.html"
+    return run
+
+
+@bench("showcase", rc=None, chart=("tufte-line-chart.png", "tufte-bar-chart.png",
+                                   "before-after.png", "small-multiples.png",
+                                   "tufte-dark-mode.png", "tufte-accessible-scatter.png",
+                                   "tufte-light-dark.png", "tufte-slopegraph.png",
+                                   "tufte-sparklines.png", "tufte-data-table.png",
+                                   "before-after-animated.gif"))
+def showcase(chart):
+    sys.path.insert(0, str(ROOT / "_docs"))
+    import generate_showcase
+
+    def run(out):
+        generate_showcase.render_job(chart, out)
+        return out / chart
+    return run
+
+
+# --- Running one case ---------------------------------------------------------
+
+def case_id(name, params):
+    return f"{name}[{','.join(f'{k}={v}' for k, v in params.items())}]"
+
+
+def expand(name):
+    """Every parameter combination of benchmark ``name``, as dicts."""
+    _, _, grid = CASES[name]
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*grid.values())]
+
+
+def _size(params):
+    return params.get("points", 1) * params.get("series", 1)
+
+
+def _peak_rss_mb():
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def measure(name, params, repeat):
+    """Set up and run one case ``repeat`` times in this process; returns its record."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    fn, rc, _ = CASES[name]
+    run = fn(**params)
+    setup_rss = _peak_rss_mb()
+    times = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for _ in range(repeat):
+            out = Path(tempfile.mkdtemp(dir=tmp))
+            start = time.perf_counter()
+            if rc is None:
+                path = run(out)
+            else:
+                with plt.rc_context(rc):
+                    path = run(out)
+            times.append(time.perf_counter() - start)
+        size = Path(path).stat().st_size
+    return {"seconds": min(times), "first": times[0], "peak_rss_mb": round(_peak_rss_mb(), 1),
+            "setup_rss_mb": round(setup_rss, 1), "bytes": size}
+
+
+def run_case(name, params, repeat, timeout):
+    """``measure`` in a fresh interpreter; returns its record or ``{"error": ...}``."""
+    cmd = [sys.executable, __file__, "--child", name, json.dumps(params), "--repeat", str(repeat)]
+    try:
+        proc = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return {"error": f"timed out after {timeout:g}s"}
+    if proc.returncode:
+        return {"error": (proc.stderr.strip().splitlines() or ["exit %d" % proc.returncode])[-1]}
+    return json.loads(proc.stdout.splitlines()[-1])
+
+
+# --- History and regressions ------------------------------------------------
+
+def machine():
+    return {"node": platform.node(), "machine": platform.machine(),
+            "python": platform.python_version(), "cpus": os.cpu_count()}
+
+
+def versions():
+    import matplotlib
+    import plotly
+
+    return {"numpy": np.__version__, "matplotlib": matplotlib.__version__,
+            "plotly": plotly.__version__}
+
+
+def commit():
+    proc = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                          capture_output=True, text=True)
+    return proc.stdout.strip() or None
+
+
+def load_history(path):
+    path = Path(path)
+    return json.loads(path.read_text()) if path.exists() else {"runs": []}
+
+
+def baseline(history, key, host):
+    """The latest recorded result of case ``key`` on ``host``, or None."""
+    for entry in reversed(history["runs"]):
+        result = entry["results"].get(key)
+        if entry["machine"] == host and result and "error" not in result:
+            return result
+    return None
+
+
+def regressions(result, base, threshold, min_seconds=0.01):
+    """Names of the metrics in which ``result`` is worse than ``base`` by over ``threshold``.
+
+    Times below ``min_seconds`` of difference are noise and never count.
+    """
+    worse = []
+    if (result["seconds"] > base["seconds"] * (1 + threshold)
+            and result["seconds"] - base["seconds"] > min_seconds):
+        worse.append("time")
+    if result["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold):
+        worse.append("rss")
+    if result["bytes"] > base["bytes"] * (1 + threshold):
+        worse.append("bytes")
+    return worse
+
+
+def _row(key, result, base, worse):
+    if "error" in result:
+        return f"  {key:<52} {result['error']}"
+    line = (f"  {key:<52} {result['seconds']:8.3f}s {result['peak_rss_mb']:8.0f} MB "
+            f"{result['bytes']:>11,} B")
+    if base:
+        line += f"   {result['seconds'] / base['seconds']:5.2f}x"
+    if worse:
+        line += f"   REGRESSION ({', '.join(worse)})"
+    return line
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("cases", nargs="*", help="benchmark names or glob patterns (default: all)")
+    parser.add_argument("--list", action="store_true", help="list the cases and exit")
+    parser.add_argument("--quick", action="store_true",
+                        help="only the smallest value of each parameter")
+    parser.add_argument("--max-values", type=float, default=MAX_VALUES,
+                        help="skip cases with more than points x series values (default: 1e7)")
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case (default: 3)")
+    parser.add_argument("--timeout", type=float, default=600,
+                        help="seconds before a case is abandoned (default: 600)")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed slowdown/growth vs. the last run, as a fraction "
+                             "(default: 0.25)")
+    parser.add_argument("--history", default=HISTORY, help="JSON history file")
+    parser.add_argument("--no-save", action="store_true", help="do not record this run")
+    parser.add_argument("--child", nargs=2, metavar=("NAME", "PARAMS"), help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.child:
+        name, params = args.child
+        print(json.dumps(measure(name, json.loads(params), args.repeat)))
+        return 0
+
+    names = [n for n in CASES
+             if not args.cases or any(fnmatch.fnmatch(n, p) for p in args.cases)]
+    if not names:
+        parser.error(f"no benchmark matches; choose from {', '.join(CASES)}")
+    todo = []
+    for name in names:
+        grid = expand(name)
+        if args.quick:
+            grid = grid[:1]
+        todo += [(name, p) for p in grid if _size(p) <= args.max_values]
+    if args.list:
+        for name, params in todo:
+            print(case_id(name, params))
+        return 0
+
+    history = load_history(args.history)
+    host = machine()
+    results, failed = {}, []
+    print(f"Running {len(todo)} benchmark cases ({args.repeat} runs each):")
+    for name, params in todo:
+        key = case_id(name, params)
+        result = results[key] = run_case(name, params, args.repeat, args.timeout)
+        base = worse = None
+        if "error" not in result:
+            base = baseline(history, key, host)
+            worse = base and regressions(result, base, args.threshold)
+            if worse:
+                failed.append(key)
+        print(_row(key, result, base, worse), flush=True)
+
+    if not args.no_save:
+        history["runs"].append({
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "commit": commit(), "machine": host, "versions": versions(), "results": results,
+        })
+        Path(args.history).write_text(json.dumps(history, indent=1) + "\n")
+    if failed:
+        print(f"{len(failed)} regression(s) beyond {args.threshold:.0%}: {', '.join(failed)}")
+        return 1
+    print("No regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
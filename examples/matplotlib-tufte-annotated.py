@@ -52,12 +52,30 @@ COLORS = {
 
 # --- Helper functions ---------------------------------------------------------
 
+def data_bounds(*series):
+    """Min and max across all series, ignoring NaN and +/-inf."""
+    lo, hi = np.inf, -np.inf
+    for s in series:
+        a = np.asarray(s, dtype=float)
+        s_lo, s_hi = np.nanmin(a), np.nanmax(a)
+        if not (np.isfinite(s_lo) and np.isfinite(s_hi)):
+            a = a[np.isfinite(a)]  # copy only when the series holds +/-inf
+            s_lo, s_hi = a.min(), a.max()
+        lo, hi = min(lo, s_lo), max(hi, s_hi)
+    return lo, hi
+
+
 def tufte_axes(ax, x_data, y_data):
-    """Apply Tufte range-frame to axes."""
+    """Apply Tufte range-frame to axes.
+
+    x_data and y_data may each be one series or a tuple of series.
+    """
+    xs = x_data if isinstance(x_data, tuple) else (x_data,)
+    ys = y_data if isinstance(y_data, tuple) else (y_data,)
     ax.spines["top"].set_visible(False)
     ax.spines["right"].set_visible(False)
-    ax.spines["bottom"].set_bounds(min(x_data), max(x_data))
-    ax.spines["left"].set_bounds(min(y_data), max(y_data))
+    ax.spines["bottom"].set_bounds(*data_bounds(*xs))
+    ax.spines["left"].set_bounds(*data_bounds(*ys))
     ax.tick_params(direction="in", length=3, width=0.5)
     return ax
 
@@ -95,9 +113,8 @@ ax.plot(months, target, color=COLORS["series_default"], linewidth=1, linestyle="
 # Revenue line (highlighted)
 ax.plot(months, revenue, color=COLORS["highlight"], linewidth=2)
 
-# Range-frame axes
-all_y = revenue + target
-tufte_axes(ax, months, all_y)
+# Range-frame axes (both series, without concatenating them)
+tufte_axes(ax, months, (revenue, target))
 
 # Direct labels (not legend)
 direct_label(ax, months, revenue, "Revenue", color=COLORS["highlight"])
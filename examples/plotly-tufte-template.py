@@ -2,11 +2,17 @@
 Tufte-styled charts using Plotly with a reusable template.
 
 Demonstrates: custom Plotly template, no legend, direct annotations,
-off-white background, serif fonts, minimal tooltip.
+off-white background, serif fonts, minimal tooltip, and large scatters that
+switch to WebGL or binned density as the point count grows, all written
+to one offline report that embeds plotly.js once.
 """
 
+import json
+
+import numpy as np
 import plotly.graph_objects as go
 import plotly.io as pio
+from plotly.offline import get_plotlyjs
 
 # --- Register Tufte template -------------------------------------------------
 
@@ -86,33 +92,22 @@ fig.add_trace(go.Scatter(
     hovertemplate="%{y:$,.0f}<extra>Revenue</extra>",
 ))
 
-# Direct labels at endpoints
-fig.add_annotation(
-    x=months[-1], y=revenue[-1],
-    text=f"  Revenue: ${revenue[-1]:,}",
-    showarrow=False, xanchor="left",
-    font=dict(size=13, color=TUFTE["highlight"]),
-)
-fig.add_annotation(
-    x=months[-1], y=target[-1],
-    text=f"  Target: ${target[-1]:,}",
-    showarrow=False, xanchor="left",
-    font=dict(size=13, color=TUFTE["text_secondary"]),
-)
-
-# Annotate peak
+# Direct labels at endpoints and the peak annotation, added in one call
 peak_idx = revenue.index(max(revenue))
-fig.add_annotation(
-    x=months[peak_idx], y=revenue[peak_idx],
-    text=f"Peak: ${revenue[peak_idx]:,}",
-    showarrow=True, arrowhead=0, arrowwidth=0.5, arrowcolor="#ccc",
-    ax=0, ay=-30,
-    font=dict(size=12, color="#333", family='"Palatino Linotype", Georgia, serif'),
-)
-
 fig.update_layout(
     title="Monthly Revenue vs. Target",
     width=750, height=500,
+    annotations=[
+        dict(x=months[-1], y=revenue[-1], text=f"  Revenue: ${revenue[-1]:,}",
+             showarrow=False, xanchor="left",
+             font=dict(size=13, color=TUFTE["highlight"])),
+        dict(x=months[-1], y=target[-1], text=f"  Target: ${target[-1]:,}",
+             showarrow=False, xanchor="left",
+             font=dict(size=13, color=TUFTE["text_secondary"])),
+        dict(x=months[peak_idx], y=revenue[peak_idx], text=f"Peak: ${revenue[peak_idx]:,}",
+             showarrow=True, arrowhead=0, arrowwidth=0.5, arrowcolor="#ccc", ax=0, ay=-30,
+             font=dict(size=12, color="#333", family='"Palatino Linotype", Georgia, serif')),
+    ],
 )
 
 fig.write_html("tufte-plotly-line.html")
@@ -121,19 +116,17 @@ fig.show()
 
 # --- Example 2: Horizontal bar chart -----------------------------------------
 
-import plotly.express as px
-import pandas as pd
-
-df = pd.DataFrame({
-    "product": ["Product A", "Product B", "Product C", "Product D", "Product E"],
-    "revenue": [42000, 38000, 27000, 19000, 12000],
-}).sort_values("revenue")
+# Smallest at the bottom: Plotly draws the first category lowest
+products, revenue = zip(*sorted(zip(
+    ["Product A", "Product B", "Product C", "Product D", "Product E"],
+    [42000, 38000, 27000, 19000, 12000],
+), key=lambda row: row[1]))
 
-fig2 = px.bar(
-    df, x="revenue", y="product", orientation="h",
-    text="revenue",
-    color_discrete_sequence=[TUFTE["series_default"]],
-)
+fig2 = go.Figure(go.Bar(
+    x=revenue, y=products, orientation="h",
+    text=revenue,
+    marker_color=TUFTE["series_default"],
+))
 
 fig2.update_traces(
     texttemplate="$%{text:,.0f}",
@@ -157,3 +150,80 @@ fig2.update_layout(
 
 fig2.write_html("tufte-plotly-bar.html")
 fig2.show()
+
+
+# --- Example 3: Large scatter (SVG -> WebGL -> binned density) ----------------
+
+GL_ABOVE = 10_000       # points per trace before switching to Scattergl
+BIN_ABOVE = 500_000     # points per trace before switching to a 2-D histogram
+
+
+def tufte_scatter(x, y, name, color, bin_range):
+    """Scatter trace whose renderer follows the point count; same look in every mode."""
+    if len(x) > BIN_ABOVE:
+        counts, xe, ye = np.histogram2d(x, y, bins=(200, 150), range=bin_range)
+        rgb = ",".join(str(int(color[i:i + 2], 16)) for i in (1, 3, 5))
+        return go.Heatmap(
+            x=(xe[:-1] + xe[1:]) / 2, y=(ye[:-1] + ye[1:]) / 2,
+            z=np.where(counts.T > 0, np.log1p(counts.T), np.nan),
+            customdata=counts.T, showscale=False, hoverongaps=False,
+            colorscale=[[0, f"rgba({rgb},0.15)"], [1, f"rgba({rgb},0.9)"]],
+            hovertemplate=f"%{{customdata:,.0f}} points<extra>{name}</extra>",
+        )
+    trace = go.Scattergl if len(x) > GL_ABOVE else go.Scatter
+    return trace(
+        x=x, y=y, mode="markers",
+        marker=dict(color=color, size=6, opacity=0.7, line=dict(width=0)),
+        hovertemplate=f"%{{x:.0f}} days, %{{y:.0f}}%<extra>{name}</extra>",
+    )
+
+
+rng = np.random.default_rng(42)
+segments = {"Enterprise": ("#4e79a7", 45, 62), "Mid-Market": ("#f28e2b", 70, 48),
+            "SMB": ("#e15759", 95, 35)}
+n = 50_000  # per segment: Scattergl; try 1_000_000 for the density view
+bin_range = ((0, 160), (0, 100))
+
+fig3 = go.Figure()
+for name, (color, days, win) in segments.items():
+    x = rng.normal(days, 15, n)
+    y = rng.normal(win, 8, n)
+    fig3.add_trace(tufte_scatter(x, y, name, color, bin_range))
+    # Direct label at the median, in every mode
+    fig3.add_annotation(x=np.median(x), y=np.median(y), text=f"<b>{name}</b>",
+                        showarrow=False, xanchor="left", xshift=12,
+                        font=dict(size=13, color=color))
+
+fig3.update_layout(
+    title="Enterprise Wins Faster and More Often",
+    xaxis_title="Deal cycle (days)", yaxis_title="Win rate (%)",
+    width=750, height=500,
+)
+
+fig3.write_html("tufte-plotly-scatter.html")
+fig3.show()
+
+
+# --- Example 4: All charts in one offline report ------------------------------
+# plotly.js is embedded once, not once per chart; each chart initialises only
+# when it scrolls into view.
+
+report = ["<!DOCTYPE html><html><head><meta charset='utf-8'>",
+          f"<script>{get_plotlyjs()}</script></head>",
+          "<body style='background:#fffff8'>"]
+for i, f in enumerate([fig, fig2, fig3]):
+    spec = f.to_json().replace("</", "<\\/")   # NumPy arrays are already base64
+    report.append(f"<div class='chart' id='chart-{i}' style='height:{f.layout.height or 450}px'></div>"
+                  f"<script type='application/json' id='spec-{i}'>{spec}</script>")
+report.append("""<script>
+const observer = new IntersectionObserver(entries => entries.forEach(e => {
+  if (!e.isIntersecting) return;
+  observer.unobserve(e.target);
+  const spec = JSON.parse(document.getElementById(e.target.id.replace("chart", "spec")).textContent);
+  Plotly.newPlot(e.target, spec.data, spec.layout, %s);
+}), {rootMargin: "300px 0px"});
+document.querySelectorAll(".chart").forEach(d => observer.observe(d));
+</script></body></html>""" % json.dumps({"displaylogo": False, "responsive": True}))
+
+with open("tufte-plotly-report.html", "w", encoding="utf-8") as out:
+    out.write("\n".join(report))
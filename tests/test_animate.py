@@ -0,0 +1,15 @@
+import numpy as np
+import pytest
+
+from tufte.animate import GifWriter, build_palette
+
+
+def test_gif_writer_rejects_a_palette_that_uses_the_transparent_index(tmp_path):
+    frame = np.random.default_rng(0).integers(0, 256, (40, 40, 4), dtype=np.uint8)
+    palette = build_palette([frame], colors=256)
+    with pytest.raises(ValueError, match="256 colors"):
+        GifWriter(tmp_path / "out.gif", palette=palette)
+    assert not (tmp_path / "out.gif").exists()
+    with GifWriter(tmp_path / "ok.gif", palette=build_palette([frame])) as writer:
+        writer.add(frame)
+    assert (tmp_path / "ok.gif").read_bytes().startswith(b"GIF89a")
@@ -0,0 +1,12 @@
+import numpy as np
+
+from tufte.downsample import _lttb_edges
+
+
+def test_lttb_edges_cover_every_interior_point():
+    for size in range(4, 300):
+        for n in range(3, size):
+            edges = _lttb_edges(size, n)
+            assert edges[0] == 1 and edges[-1] == size - 1, (size, n)
+            assert (np.diff(edges) > 0).all(), (size, n)
+
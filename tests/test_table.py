@@ -0,0 +1,10 @@
+from tufte.table import Table
+
+
+def test_short_fmt_headers_and_align_are_padded():
+    table = Table([[1, 2.5, 3]], headers=["a", "b"], fmt=["{:.1f}"], align=["left"])
+    assert table.headers == ["a", "b", ""]
+    assert table.cells == [["1.0", "2.50", "3"]]
+    assert table.align == ["left", "right", "right"]
+    assert len(table.widths) == 3
+    assert '<th style="text-align: right"></th>' in table.to_html()
@@ -0,0 +1,87 @@
+"""Tufte chart helpers shared by the showcase generator and the examples.
+
+``import tufte`` loads only the style constants (plain dicts), so a tool that
+needs a color pays no numpy, matplotlib or Plotly import:
+
+    from tufte import PALETTE, TUFTE_RC
+
+Everything else is imported from its module on first access (PEP 562), and
+then cached on the package:
+
+    tufte.tufte_axes(ax, months, (revenue, target))   # imports tufte.frame now
+    tufte.add_direct_labels(fig, traces)              # tufte.plotly_figure
+
+Submodules (``tufte.spec``, ``tufte.service``, ...) load the same way.
+``python -m tufte.importtime`` checks the import cost against its budget.
+"""
+
+from tufte.style import PALETTE, PALETTE_DARK, TUFTE_DARK_RC, TUFTE_RC
+
+__version__ = "0.1.0"
+
+# Public name -> module that defines it. Names equal to a submodule's name
+# (e.g. ``sparklines``) are left out: importing the submodule would replace
+# the attribute with the module.
+_LAZY = {
+    "data_bounds": "tufte.frame",
+    "tufte_axes": "tufte.frame",
+    "range_frame": "tufte.frame",
+    "padded_range": "tufte.frame",
+    "direct_label": "tufte.marks",
+    "direct_labels": "tufte.marks",
+    "annotate_point": "tufte.marks",
+    "rug_marks": "tufte.marks",
+    "sparkline": "tufte.sparklines",
+    "sparkline_svg": "tufte.svg",
+    "sparkline_svgs": "tufte.svg",
+    "small_multiples": "tufte.multiples",
+    "Table": "tufte.table",
+    "plot_line": "tufte.downsample",
+    "tufte_template": "tufte.plotly_figure",
+    "tufte_figure": "tufte.plotly_figure",
+    "add_direct_labels": "tufte.plotly_figure",
+    "add_annotations": "tufte.plotly_figure",
+    "add_scatter": "tufte.scatter",
+    "write_bundle": "tufte.bundle",
+    "Chart": "tufte.spec",
+    "load_spec": "tufte.spec",
+    "RenderCache": "tufte.cache",
+    "profiling": "tufte.profile",
+    "TufteLayout": "tufte.layout",
+    "tufte_layout": "tufte.layout",
+    "layout_margins": "tufte.layout",
+    "StreamingChart": "tufte.stream",
+    "PlotlyStream": "tufte.stream",
+    "open_source": "tufte.source",
+    "plot_source": "tufte.source",
+    "save_vector": "tufte.vector",
+    "figure": "tufte.figures",
+    "themed": "tufte.figures",
+    "render_figure": "tufte.figures",
+    "save_themes": "tufte.themes",
+    "render_themes": "tufte.themes",
+}
+
+_SUBMODULES = {"animate", "bundle", "cache", "downsample", "figures", "fonts", "frame",
+               "importtime", "labels", "layout", "marks", "multiples", "plotly_figure",
+               "profile", "scatter", "service", "source", "sparklines", "spec", "stream",
+               "style", "svg", "table", "themes", "vector"}
+
+__all__ = ["PALETTE", "PALETTE_DARK", "TUFTE_DARK_RC", "TUFTE_RC", *_LAZY]
+
+
+def __getattr__(name):
+    from importlib import import_module
+
+    if name in _LAZY:
+        value = getattr(import_module(_LAZY[name]), name)
+    elif name in _SUBMODULES:
+        value = import_module(f"tufte.{name}")
+    else:
+        raise AttributeError(f"module 'tufte' has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted({*globals(), *_LAZY, *_SUBMODULES})
@@ -0,0 +1,243 @@
+"""Render transition animations from one reused matplotlib figure.
+
+Rebuilding a figure per frame pays for artist creation, layout and a PNG
+encode/decode round trip on every frame. Here the caller builds the figure
+once and supplies ``update(t)``, which only restyles existing artists
+(alpha, color, linewidth, text). Each frame is then one Agg draw, read
+straight from the canvas buffer:
+
+    fig, update = build_transition(...)
+    save_animation("out.gif", render_frames(fig, update, transition_times()), fps=15)
+
+The figure's layout must be fixed before rendering (no ``bbox_inches="tight"``
+per frame), so every frame has the same pixel size.
+
+GIFs are streamed: each frame is quantized against one shared palette and
+written as soon as the next differing frame arrives, so memory stays at two
+paletted frames regardless of length or dpi. Runs of identical frames (the
+holds before and after a transition) become one frame with a longer delay,
+and changed frames store only the rectangle that differs from the last one.
+"""
+
+import hashlib
+import struct
+from pathlib import Path
+
+from tufte.profile import profiled
+
+
+def transition_times(before=15, during=30, after=30):
+    """Return ``t`` for each frame: hold at 0, ease linearly to 1, hold at 1."""
+    return ([0.0] * before
+            + [i / during for i in range(during)]
+            + [1.0] * after)
+
+
+def render_frames(fig, update, times):
+    """Yield an ``(H, W, 4)`` uint8 RGBA view of the canvas for each ``t``.
+
+    The arrays are zero-copy views of the Agg buffer and are overwritten by
+    the next draw: consume (encode or copy) each one before advancing.
+    """
+    import numpy as np
+
+    canvas = fig.canvas
+    for t in times:
+        update(t)
+        canvas.draw()
+        yield np.asarray(canvas.buffer_rgba())
+
+
+def _rgb_image(frame):
+    from PIL import Image
+
+    h, w = frame.shape[:2]
+    return Image.frombuffer("RGBA", (w, h), frame, "raw", "RGBA", 0, 1).convert("RGB")
+
+
+@profiled("encode")
+def build_palette(frames, colors=255):
+    """Return a paletted image whose palette covers every frame in ``frames``.
+
+    Pass a handful of key frames (e.g. ``t`` = 0, 0.5 and 1); they are
+    stacked and quantized together, once, and the result is shared by every
+    frame of the animation. The default of 255 colors leaves the last GIF
+    index free for ``GifWriter``'s "unchanged pixel" transparency.
+    """
+    from PIL import Image
+
+    tiles = [_rgb_image(frame) for frame in frames]
+    if not tiles:
+        raise ValueError("no frames to build a palette from")
+    w = tiles[0].width
+    mosaic = Image.new("RGB", (w, sum(tile.height for tile in tiles)))
+    y = 0
+    for tile in tiles:
+        mosaic.paste(tile, (0, y))
+        y += tile.height
+    return mosaic.quantize(colors, method=Image.Quantize.MEDIANCUT)
+
+
+class GifWriter:
+    """Stream RGBA frames into an animated GIF with a fixed, shared palette.
+
+    ``palette`` is a paletted image from ``build_palette``; without one the
+    palette is taken from the first frame. Pixels a frame shares with the
+    previous one are written as transparent index 255, so they cost almost
+    nothing after LZW compression; ``palette`` may therefore have at most
+    255 colors.
+    """
+
+    UNCHANGED = 255
+
+    def __init__(self, path, fps=15, loop=0, palette=None):
+        if palette is not None and len(palette.getpalette()) > 3 * self.UNCHANGED:
+            raise ValueError(f"GIF palette has {len(palette.getpalette()) // 3} colors; at most "
+                             f"{self.UNCHANGED} fit beside the transparent index")
+        self.path = Path(path)
+        self.frame_ms = 1000 / fps
+        self.loop = loop
+        self.palette = palette
+        self.frames_in = 0
+        self.frames_out = 0
+        self._clock = 0.0      # ms of animation written so far
+        self._fp = open(self.path, "wb")
+        self._digest = None
+        self._pending = None   # (indices, frame count) waiting for its duration
+        self._shown = None     # indices currently on the GIF canvas
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if exc[0] is None:
+            self.close()
+        else:
+            # Keep the body's error; an unfinished GIF is not worth completing
+            self._fp.close()
+
+    def add(self, frame):
+        """Append one ``(H, W, 4)`` uint8 RGBA frame."""
+        import numpy as np
+        from PIL import Image
+
+        self.frames_in += 1
+        digest = hashlib.blake2b(np.ascontiguousarray(frame), digest_size=16).digest()
+        if digest == self._digest:
+            self._pending = (self._pending[0], self._pending[1] + 1)
+            return
+        self._digest = digest
+
+        rgb = _rgb_image(frame)
+        if self.palette is None:
+            self.palette = build_palette([frame])
+        indices = np.asarray(rgb.quantize(palette=self.palette, dither=Image.Dither.NONE))
+        if self._pending is not None and np.array_equal(indices, self._pending[0]):
+            # Different pixels, same palette indices: still a repeat.
+            self._pending = (self._pending[0], self._pending[1] + 1)
+            return
+        self._flush()
+        self._pending = (indices, 1)
+
+    def _flush(self):
+        import numpy as np
+        from PIL import GifImagePlugin, Image
+
+        if self._pending is None:
+            return
+        indices, count = self._pending
+        self._pending = None
+        params = {"duration": self._elapsed(count) * 10, "disposal": 1}
+        if self._shown is None:
+            self._write_header(indices.shape[1], indices.shape[0])
+            top, left, crop = 0, 0, indices
+        else:
+            changed = indices != self._shown
+            rows = changed.any(axis=1).nonzero()[0]
+            cols = changed.any(axis=0).nonzero()[0]
+            top, bottom, left, right = rows[0], rows[-1] + 1, cols[0], cols[-1] + 1
+            crop = np.where(changed[top:bottom, left:right],
+                            indices[top:bottom, left:right], self.UNCHANGED).astype(np.uint8)
+            params["transparency"] = self.UNCHANGED
+        image = Image.fromarray(crop, "P")
+        for chunk in GifImagePlugin.getdata(image, offset=(int(left), int(top)), **params):
+            self._fp.write(chunk)
+        self._shown = indices
+        self.frames_out += 1
+
+    def _elapsed(self, count):
+        # Frame delays are whole centiseconds; round the running total rather
+        # than each frame so a long animation does not drift.
+        start, self._clock = self._clock, self._clock + count * self.frame_ms
+        return round(self._clock / 10) - round(start / 10)
+
+    def _write_header(self, width, height):
+        colors = self.palette.getpalette()[:768]
+        colors += [0] * (768 - len(colors))
+        self._fp.write(b"GIF89a" + struct.pack("<HHBBB", width, height, 0xF7, 0, 0))
+        self._fp.write(bytes(colors))
+        if self.loop is not None:
+            self._fp.write(b"!\xff\x0bNETSCAPE2.0\x03\x01" + struct.pack("<H", self.loop) + b"\x00")
+
+    def close(self):
+        if self._fp.closed:
+            return
+        try:
+            self._flush()
+            if self.frames_out == 0:
+                raise ValueError("no frames to save")
+            self._fp.write(b";")
+        finally:
+            self._fp.close()
+
+
+_FORMATS = {".gif": "GIF", ".png": "PNG", ".apng": "PNG", ".webp": "WEBP"}
+
+
+@profiled("encode")
+def save_animation(path, frames, fps=15, loop=0, palette=None):
+    """Encode RGBA ``frames`` to an animated GIF, APNG (``.png``) or WebP.
+
+    The format follows the file suffix. GIFs are streamed through
+    ``GifWriter`` with ``palette`` (see ``build_palette``). Pillow's APNG and
+    WebP encoders need every frame up front, so for those identical
+    consecutive frames are collapsed first and only distinct ones are kept.
+    """
+    import numpy as np
+    from PIL import Image
+
+    path = Path(path)
+    try:
+        fmt = _FORMATS[path.suffix.lower()]
+    except KeyError:
+        raise ValueError(f"unsupported animation format {path.suffix!r}; "
+                         f"use one of {', '.join(_FORMATS)}") from None
+
+    if fmt == "GIF":
+        with GifWriter(path, fps=fps, loop=loop, palette=palette) as writer:
+            for frame in frames:
+                writer.add(frame)
+        return
+
+    images, counts, digest = [], [], None
+    for frame in frames:
+        frame_digest = hashlib.blake2b(np.ascontiguousarray(frame), digest_size=16).digest()
+        if frame_digest == digest:
+            counts[-1] += 1
+            continue
+        digest = frame_digest
+        h, w = frame.shape[:2]
+        # frombuffer wraps the canvas memory; copy before the next draw reuses it.
+        images.append(Image.frombuffer("RGBA", (w, h), frame, "raw", "RGBA", 0, 1).copy())
+        counts.append(1)
+    if not images:
+        raise ValueError("no frames to save")
+
+    images[0].save(
+        path,
+        format=fmt,
+        save_all=True,
+        append_images=images[1:],
+        duration=[round(n * 1000 / fps) for n in counts],
+        loop=loop,
+    )
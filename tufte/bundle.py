@@ -0,0 +1,189 @@
+"""Write many Plotly figures into one lean, offline HTML report.
+
+``fig.write_html`` per chart embeds the whole plotly.js bundle (~4.8 MB)
+in every file, serialises every number as JSON text and repeats the full
+template in every figure. ``write_bundle`` writes plotly.js once, either
+inline in a single page or as one shared ``plotly.min.js`` next to it, and
+for each figure:
+
+- encodes numeric trace arrays as base64 typed arrays (``{"dtype", "bdata"}``,
+  which plotly.js decodes natively), optionally downcast to float32;
+- strips ``layout.template`` and stores each distinct template once, as
+  compact JSON;
+- stores the spec in an inert ``<script type="application/json">`` block
+  that is parsed and plotted only when the chart scrolls near the viewport
+  (``IntersectionObserver``).
+
+Nothing is fetched from the network, so the report opens offline:
+
+    write_bundle("report.html", figures, titles=names)
+    write_bundle("report/", figures, shared_js=True)   # report/index.html + plotly.min.js
+"""
+
+import base64
+import json
+from html import escape
+from pathlib import Path
+
+import numpy as np
+
+# plotly.js typed-array dtypes (no 64-bit integers).
+_DTYPES = {"f8", "f4", "i4", "u4", "i2", "u2", "i1", "u1"}
+
+_LOADER = """\
+(function () {
+  var templates = JSON.parse(document.getElementById("tufte-templates").textContent);
+  var config = %(config)s;
+  function plot(div) {
+    var spec = JSON.parse(document.getElementById(div.dataset.spec).textContent);
+    if (spec.template !== null) spec.layout.template = templates[spec.template];
+    Plotly.newPlot(div, spec.data, spec.layout, config);
+  }
+  var charts = document.querySelectorAll(".tufte-chart");
+  if (!("IntersectionObserver" in window)) { charts.forEach(plot); return; }
+  var observer = new IntersectionObserver(function (entries) {
+    entries.forEach(function (entry) {
+      if (entry.isIntersecting) { observer.unobserve(entry.target); plot(entry.target); }
+    });
+  }, {rootMargin: "300px 0px"});
+  charts.forEach(function (div) { observer.observe(div); });
+})();
+"""
+
+
+def _typed(a, float32):
+    """Return ``a`` as a plotly.js typed-array spec, or None if it is not numeric."""
+    if a.dtype.kind == "b" or a.dtype.kind not in "iuf" or a.size == 0:
+        return None
+    if a.dtype.kind == "f":
+        a = a.astype("<f4" if float32 else "<f8", copy=False)
+    elif a.dtype.itemsize == 8:
+        lo, hi = a.min(), a.max()
+        if a.dtype.kind == "u" and hi <= np.iinfo(np.uint32).max:
+            a = a.astype("<u4")
+        elif np.iinfo(np.int32).min <= lo and hi <= np.iinfo(np.int32).max:
+            a = a.astype("<i4")
+        else:
+            a = a.astype("<f8")
+    code = a.dtype.str[1:]
+    if code not in _DTYPES:
+        return None
+    spec = {"dtype": code, "bdata": base64.b64encode(np.ascontiguousarray(a)).decode("ascii")}
+    if a.ndim > 1:
+        spec["shape"] = ",".join(map(str, a.shape))
+    return spec
+
+
+def _decode(spec):
+    a = np.frombuffer(base64.b64decode(spec["bdata"]), dtype="<" + spec["dtype"])
+    if "shape" in spec:
+        a = a.reshape([int(n) for n in str(spec["shape"]).split(",")])
+    return a
+
+
+def _pack(value, float32, min_length):
+    """Replace numeric arrays inside a trace with typed-array specs, recursively."""
+    if isinstance(value, dict):
+        if "bdata" in value and "dtype" in value:
+            if float32 and value["dtype"] == "f8":
+                return _typed(_decode(value), True)
+            return value
+        return {k: _pack(v, float32, min_length) for k, v in value.items()}
+    if isinstance(value, np.ndarray):
+        return _typed(value, float32) or value.tolist()
+    if isinstance(value, (list, tuple)) and len(value) >= min_length:
+        first = value[0]
+        if isinstance(first, (int, float)) and not isinstance(first, bool) or isinstance(first, list):
+            try:
+                a = np.asarray(value)
+            except ValueError:  # ragged
+                a = None
+            if a is not None:
+                spec = _typed(a, float32)
+                if spec is not None:
+                    return spec
+        return [_pack(v, float32, min_length) for v in value]
+    return value
+
+
+def figure_spec(fig, float32=False, min_length=8):
+    """Return ``(data, layout, template)`` of ``fig`` ready for compact JSON.
+
+    Numeric trace arrays of at least ``min_length`` values become typed
+    arrays; ``float32`` halves float payloads at ~7 significant digits.
+    ``template`` is the layout's template, removed from ``layout``.
+    """
+    spec = fig.to_plotly_json()
+    layout = dict(spec.get("layout", {}))
+    template = layout.pop("template", None)
+    data = [_pack(trace, float32, min_length) for trace in spec.get("data", [])]
+    return data, layout, template
+
+
+def _dumps(obj):
+    from plotly.utils import PlotlyJSONEncoder
+
+    text = json.dumps(obj, cls=PlotlyJSONEncoder, separators=(",", ":"))
+    # Keep "</script>" inside the data from closing the script block.
+    return text.replace("</", "<\\/")
+
+
+def write_bundle(path, figures, titles=None, *, shared_js=False, float32=False,
+                 config=None, page_title="Charts", css=""):
+    """Write ``figures`` into one HTML page and return its path.
+
+    With ``shared_js`` ``path`` is a directory: ``index.html`` goes there
+    next to a single ``plotly.min.js``, which is only rewritten when its
+    contents change. Otherwise ``path`` is the page and plotly.js is
+    inlined once. ``titles`` adds an ``<h2>`` above each chart. ``config``
+    is passed to every ``Plotly.newPlot`` (default: no logo, responsive).
+    """
+    from plotly.offline import get_plotlyjs
+
+    figures = list(figures)
+    plotlyjs = get_plotlyjs()
+    path = Path(path)
+    if shared_js:
+        path.mkdir(parents=True, exist_ok=True)
+        asset = path / "plotly.min.js"
+        if not asset.exists() or asset.read_text(encoding="utf-8") != plotlyjs:
+            asset.write_text(plotlyjs, encoding="utf-8")
+        page = path / "index.html"
+        script = '<script src="plotly.min.js"></script>'
+    else:
+        page = path
+        script = f"<script>{plotlyjs}</script>"
+
+    templates, template_ids = [], {}
+    body = []
+    for i, fig in enumerate(figures):
+        data, layout, template = figure_spec(fig, float32)
+        ref = None
+        if template is not None:
+            key = _dumps(template)
+            ref = template_ids.get(key)
+            if ref is None:
+                ref = template_ids[key] = len(templates)
+                templates.append(key)
+        width = layout.get("width")
+        height = layout.get("height") or 450
+        style = f"height:{height}px" + (f";width:{width}px" if width else "")
+        if titles is not None:
+            body.append(f"<h2>{escape(str(titles[i]))}</h2>")
+        body.append(f'<div class="tufte-chart" data-spec="spec-{i}" style="{style}"></div>')
+        body.append(f'<script type="application/json" id="spec-{i}">'
+                    f'{_dumps({"data": data, "layout": layout, "template": ref})}</script>')
+
+    config = {"displaylogo": False, "responsive": True} if config is None else config
+    html = "".join([
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n",
+        f"<title>{escape(page_title)}</title>\n",
+        f"<style>body{{background:#fffff8;margin:2em}}{css}</style>\n",
+        script, "\n</head>\n<body>\n",
+        "\n".join(body),
+        f'\n<script type="application/json" id="tufte-templates">[{",".join(templates)}]</script>\n',
+        f"<script>\n{_LOADER % {'config': json.dumps(config)}}</script>\n",
+        "</body>\n</html>\n",
+    ])
+    page.write_text(html, encoding="utf-8")
+    return page
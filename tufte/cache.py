@@ -0,0 +1,185 @@
+"""Content-addressed render cache.
+
+A rendered chart is a pure function of its inputs: the data, the rcParams, the
+palette, dpi and figsize, and the code that draws it. ``RenderCache`` hashes
+all of those into a key and keeps the rendered file under that key, so an
+unchanged chart is copied back instead of being drawn and encoded again.
+
+    cache = RenderCache(".render-cache", max_bytes=256 * 2**20)
+    cache.render("chart.png", line_chart, tufte_axes,
+                 rc=TUFTE_RC, palette=C, revenue=revenue, figsize=(9, 6))
+
+The directory is bounded: entries are evicted least-recently-used first once
+it exceeds ``max_bytes`` or ``max_entries``.
+"""
+
+import filecmp
+import hashlib
+import importlib
+import inspect
+import os
+import shutil
+import tempfile
+from functools import lru_cache
+from pathlib import Path
+
+
+def fingerprint(*code, **inputs):
+    """Return a hex digest of the source of ``code`` and the values of ``inputs``.
+
+    ``code`` are the callables that draw the chart; their source text is
+    hashed, so editing a drawing function invalidates its entries. ``inputs``
+    may hold scalars, strings, lists, tuples, dicts and array-likes (NumPy
+    arrays, pandas Series); arrays are hashed by dtype, shape and raw bytes.
+    """
+    h = hashlib.sha256()
+    for fn in code:
+        _update(h, fn)
+    _update(h, inputs)
+    return h.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def source_digest(package):
+    """Return a hex digest of every ``.py`` file in ``package`` (a package name).
+
+    For ``inputs``: unlike ``code``, it covers private helpers and modules a
+    chart reaches only indirectly, so any edit to the package invalidates
+    the entries. Computed once per process.
+    """
+    root = Path(importlib.import_module(package).__file__).parent
+    h = hashlib.sha256()
+    for path in sorted(root.rglob("*.py")):
+        _update(h, path.relative_to(root).as_posix())
+        _update(h, path.read_bytes())
+    return h.hexdigest()
+
+
+def _update(h, obj):
+    # Every value is prefixed with a type tag so that e.g. [1, 2] and (1, 2),
+    # or "1" and 1, never collide.
+    if obj is None or isinstance(obj, (bool, int, float, complex)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, str):
+        h.update(f"str:{len(obj)}:".encode() + obj.encode())
+    elif isinstance(obj, bytes):
+        h.update(f"bytes:{len(obj)}:".encode() + obj)
+    elif isinstance(obj, os.PathLike):
+        _update(h, os.fspath(obj))
+    elif isinstance(obj, dict):
+        h.update(f"dict:{len(obj)}:".encode())
+        for key in sorted(obj, key=repr):
+            _update(h, key)
+            _update(h, obj[key])
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}:{len(obj)}:".encode())
+        for item in obj:
+            _update(h, item)
+    elif hasattr(obj, "__array__"):
+        import numpy as np
+
+        arr = np.ascontiguousarray(np.asarray(obj))
+        if arr.dtype.hasobject:
+            _update(h, arr.tolist())
+        else:
+            h.update(f"ndarray:{arr.dtype.str}:{arr.shape}:".encode())
+            h.update(arr.view(np.uint8).data)
+    elif callable(obj):
+        h.update(b"code:")
+        h.update(inspect.getsource(obj).encode())
+    else:
+        raise TypeError(f"cannot fingerprint {type(obj).__name__!r} value {obj!r}")
+
+
+class RenderCache:
+    """A size-bounded, LRU-evicted directory of rendered chart files."""
+
+    def __init__(self, root, max_bytes=256 * 2**20, max_entries=None):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+
+    def path(self, key, suffix=""):
+        return self.root / key[:2] / f"{key}{suffix}"
+
+    def fetch(self, key, dest):
+        """Copy the entry for ``key`` to ``dest``; return False on a miss.
+
+        ``dest`` is left untouched when it already holds the cached bytes, so
+        unchanged outputs keep their modification time.
+        """
+        dest = Path(dest)
+        cached = self.path(key, dest.suffix)
+        try:
+            os.utime(cached)  # mark as recently used
+        except FileNotFoundError:
+            return False
+        if not (dest.exists() and filecmp.cmp(cached, dest, shallow=False)):
+            shutil.copyfile(cached, dest)
+        return True
+
+    def store(self, key, src):
+        """Add the rendered file ``src`` under ``key`` and evict if over budget."""
+        src = Path(src)
+        cached = self.path(key, src.suffix)
+        cached.parent.mkdir(parents=True, exist_ok=True)
+        # Write-then-rename so concurrent workers never see a partial entry.
+        fd, tmp = tempfile.mkstemp(dir=cached.parent, suffix=".tmp")
+        os.close(fd)
+        try:
+            shutil.copyfile(src, tmp)
+            os.replace(tmp, cached)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+        self.evict()
+
+    def render(self, dest, draw, *helpers, **inputs):
+        """Produce ``dest`` from the cache, or by calling ``draw(dest)`` on a miss.
+
+        The key covers the source of ``draw`` and of any ``helpers`` it calls,
+        plus every value in ``inputs``. Returns True on a cache hit.
+        """
+        key = fingerprint(draw, *helpers, **inputs)
+        if self.fetch(key, dest):
+            return True
+        draw(dest)
+        self.store(key, dest)
+        return False
+
+    def entries(self):
+        """Return ``(mtime, size, path)`` for every entry, oldest first."""
+        found = []
+        for path in self.root.glob("??/*"):
+            if path.suffix == ".tmp":
+                continue
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue  # evicted by another process
+            found.append((st.st_mtime, st.st_size, path))
+        found.sort()
+        return found
+
+    def evict(self):
+        """Remove least-recently-used entries until within budget; return bytes freed."""
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        count = len(entries)
+        freed = 0
+        for _, size, path in entries:
+            over_bytes = self.max_bytes is not None and total > self.max_bytes
+            over_count = self.max_entries is not None and count > self.max_entries
+            if not (over_bytes or over_count):
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            total -= size
+            count -= 1
+            freed += size
+        return freed
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
@@ -0,0 +1,187 @@
+"""Downsample line series to what the output can actually show.
+
+A 9 x 6 inch range-frame chart at 150 dpi has about 1350 pixel columns; every
+point beyond that costs render time and output size without changing a
+pixel. Three reducers are provided, all returning sorted indices into the
+input so callers can slice x, y and any aligned columns alike:
+
+``lttb``
+    Largest-Triangle-Three-Buckets: ``n`` points that keep the visual shape.
+``m4``
+    First, last, min and max of each of ``n`` x-buckets (pixel columns); the
+    rasterised line is identical to plotting every point.
+``minmax``
+    Min and max of each bucket: the cheaper envelope, for dense noise.
+
+All three keep the global minimum and maximum, so peak annotations and
+min/max dots computed on the downsampled series match the raw data. NaN
+points are dropped. ``x`` must be sorted ascending.
+"""
+
+import numpy as np
+
+from tufte.profile import profiled
+
+METHODS = ("lttb", "m4", "minmax")
+
+
+def _as_float(a):
+    a = np.asarray(a)
+    if a.dtype.kind in "mM":
+        return a.view("i8").astype(float)
+    return a.astype(float, copy=False)
+
+
+def _x_or_index(x, n):
+    return np.arange(n, dtype=float) if x is None else _as_float(x)
+
+
+def _extremes(y):
+    return np.array([np.argmin(y), np.argmax(y)])
+
+
+def lttb(x, y, n):
+    """Return indices of ``n`` points chosen by Largest-Triangle-Three-Buckets.
+
+    The first and last points are always kept; the interior is split into
+    ``n - 2`` equal-count buckets and from each the point forming the largest
+    triangle with the previous pick and the next bucket's centroid is taken.
+    Bucket centroids are computed for all buckets at once with ``reduceat``;
+    only the pick itself walks the buckets in order.
+    """
+    y = _as_float(y)
+    size = len(y)
+    if n >= size:
+        return np.arange(size)
+    if n < 3:
+        raise ValueError(f"lttb needs n >= 3, got {n}")
+    x = _x_or_index(x, size)
+
+    edges = _lttb_edges(size, n)
+    counts = np.diff(edges)
+    avg_x = np.add.reduceat(x[:size - 1], edges[:-1]) / counts
+    avg_y = np.add.reduceat(y[:size - 1], edges[:-1]) / counts
+    # The bucket after the last one is the final point itself.
+    avg_x = np.append(avg_x[1:], x[-1])
+    avg_y = np.append(avg_y[1:], y[-1])
+
+    out = np.empty(n, dtype=np.intp)
+    out[0], out[-1] = 0, size - 1
+    a = 0
+    for i in range(n - 2):
+        lo, hi = edges[i], edges[i + 1]
+        ax_, ay_ = x[a], y[a]
+        area = np.abs((ax_ - avg_x[i]) * (y[lo:hi] - ay_)
+                      - (ax_ - x[lo:hi]) * (avg_y[i] - ay_))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return np.union1d(out, _extremes(y))
+
+
+def _lttb_edges(size, n):
+    """Bounds of LTTB's ``n - 2`` interior buckets: ``edges[i]:edges[i + 1]``, from 1 to ``size - 1``.
+
+    Integer arithmetic, so the last edge is exactly ``size - 1`` and no
+    interior point falls between buckets.
+    """
+    return np.arange(n - 1, dtype=np.intp) * (size - 2) // (n - 2) + 1
+
+
+def _buckets(x, n):
+    """Start index of each non-empty bucket when ``x`` is cut into ``n`` equal spans."""
+    edges = np.linspace(x[0], x[-1], n + 1)[:-1]
+    return np.unique(np.searchsorted(x, edges, side="left"))
+
+
+def _bucket_arg(y, starts, counts, reduce):
+    """Index of the first min (or max) of ``y`` within each bucket."""
+    best = reduce.reduceat(y, starts)
+    hits = np.flatnonzero(y == np.repeat(best, counts))
+    # Every bucket holds its own best, so the first hit from its start is in it
+    return hits[np.searchsorted(hits, starts)]
+
+
+def m4(x, y, n):
+    """Return indices of the first, last, min and max point of ``n`` x-buckets."""
+    y = _as_float(y)
+    size = len(y)
+    if 4 * n >= size:
+        return np.arange(size)
+    x = _x_or_index(x, size)
+    starts = _buckets(x, n)
+    counts = np.diff(np.append(starts, size))
+    return np.unique(np.concatenate([
+        starts,
+        starts + counts - 1,
+        _bucket_arg(y, starts, counts, np.minimum),
+        _bucket_arg(y, starts, counts, np.maximum),
+    ]))
+
+
+def minmax(x, y, n):
+    """Return indices of the min and max point of ``n`` x-buckets, plus the ends."""
+    y = _as_float(y)
+    size = len(y)
+    if 2 * n >= size:
+        return np.arange(size)
+    x = _x_or_index(x, size)
+    starts = _buckets(x, n)
+    counts = np.diff(np.append(starts, size))
+    return np.unique(np.concatenate([
+        [0, size - 1],
+        _bucket_arg(y, starts, counts, np.minimum),
+        _bucket_arg(y, starts, counts, np.maximum),
+    ]))
+
+
+_REDUCERS = {"lttb": lttb, "m4": m4, "minmax": minmax}
+
+
+def downsample_indices(x, y, n, method="lttb"):
+    """Return sorted indices of the points to draw; see the module docstring."""
+    try:
+        reduce = _REDUCERS[method]
+    except KeyError:
+        raise ValueError(f"unknown method {method!r}; choose from {', '.join(METHODS)}") from None
+    y = _as_float(y)
+    finite = np.isfinite(y)
+    if finite.all():
+        return reduce(x, y, n)
+    # Reduce the finite points only and map the picks back to input positions.
+    keep = np.flatnonzero(finite)
+    x = None if x is None else np.asarray(x)[keep]
+    return keep[reduce(x, y[keep], n)]
+
+
+@profiled("data")
+def downsample(x, y, n, method="lttb"):
+    """Return ``(x, y)`` reduced to about ``n`` pixel columns' worth of points.
+
+    ``x`` and ``y`` are sliced, not copied into lists, so NumPy arrays and
+    pandas Series keep their dtype (and index, for Series). With ``x=None``
+    the returned x are the kept points' positions in ``y``.
+    """
+    idx = downsample_indices(x, y, n, method)
+    return (idx if x is None else _take(x, idx)), _take(y, idx)
+
+
+def _take(a, idx):
+    if hasattr(a, "iloc"):
+        return a.iloc[idx]
+    return np.asarray(a)[idx]
+
+
+def pixel_width(ax):
+    """Width of a matplotlib axes in display pixels at the figure's dpi."""
+    return max(int(round(ax.get_window_extent().width)), 1)
+
+
+@profiled("artists")
+def plot_line(ax, x, y, *args, method="m4", n=None, **kwargs):
+    """``ax.plot`` that first downsamples to the axes' pixel width.
+
+    ``n`` overrides the bucket count, e.g. when saving at a higher dpi than
+    the figure's own.
+    """
+    xs, ys = downsample(x, y, n or pixel_width(ax), method)
+    return ax.plot(xs, ys, *args, **kwargs)
@@ -0,0 +1,138 @@
+"""Pyplot-free figures with a per-call theme, safe to render from many threads.
+
+``plt.subplots`` registers every figure in pyplot's global figure manager,
+and ``plt.rcParams.update(TUFTE_DARK_RC)`` switches the theme for the whole
+process, so two threads rendering a light and a dark chart at once see each
+other's settings. Here a figure is a plain ``Figure`` on its own Agg canvas
+and the theme is applied around the one call that draws it:
+
+    def draw(fig):
+        ax = fig.add_subplot()
+        ax.plot(months, revenue, color=PALETTE_DARK["highlight"])
+
+    png = render_figure(draw, theme="dark", size=(9, 6), dpi=150)
+
+or, to keep the ``Figure`` for other uses:
+
+    with themed("dark"):
+        fig = figure(figsize=(9, 6))
+        ...
+        save(fig, "revenue.svg")
+
+matplotlib has one rcParams dict per process, and artists read it while
+they are created and again while they are drawn, so ``themed`` holds
+``RC_LOCK`` while its theme is in effect: the Python drawing code of two
+charts never interleaves, which the GIL would not have allowed anyway.
+PNG compression releases the GIL, and ``render_figure`` does it after the
+lock is released, so threads do overlap there. Code that changes rcParams
+without ``themed`` is not covered.
+
+``tufte.service.render`` runs JSON chart specs this way on a bounded thread
+pool, for asyncio servers; ``tufte.themes`` renders one figure in several
+themes.
+"""
+
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from io import BytesIO
+
+import numpy as np
+
+from tufte.style import TUFTE_DARK_RC, TUFTE_RC
+
+THEMES = {"light": TUFTE_RC, "dark": TUFTE_DARK_RC}
+
+# Held while a theme's rcParams are in effect; reentrant so themed() nests
+RC_LOCK = threading.RLock()
+
+
+def _theme_rc(theme):
+    if isinstance(theme, dict):
+        return theme
+    try:
+        return THEMES[theme]
+    except KeyError:
+        raise ValueError(f"unknown theme {theme!r}; expected one of {sorted(THEMES)} "
+                         f"or an rcParams dict") from None
+
+
+@contextmanager
+def themed(theme="light"):
+    """Apply ``theme`` (``light``, ``dark`` or an rcParams dict) to this thread's block only.
+
+    Other threads entering ``themed`` wait until the block ends.
+    """
+    from matplotlib import rc_context
+
+    rc = _theme_rc(theme)
+    with RC_LOCK, rc_context(rc):
+        yield rc
+
+
+def figure(**kwargs):
+    """A ``Figure`` with an Agg canvas, unknown to pyplot; ``kwargs`` go to ``Figure``.
+
+    Create, draw and save it inside ``themed`` so it sees one theme throughout.
+    Nothing needs closing: the figure is freed with its last reference.
+    """
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(**kwargs)
+    FigureCanvasAgg(fig)
+    return fig
+
+
+@lru_cache(maxsize=None)
+def _capture_canvas():
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    class CaptureCanvas(FigureCanvasAgg):
+        """Agg canvas whose PNG output is the drawn pixels, to be compressed later."""
+
+        def print_png(self, filename_or_obj, *, metadata=None, pil_kwargs=None, **kwargs):
+            # matplotlib filters savefig's extra keywords for its own canvases only
+            FigureCanvasAgg.draw(self)
+            pixels = np.asarray(self.buffer_rgba()).copy()
+            self.captured = (pixels, self.figure.dpi, metadata, pil_kwargs)
+    return CaptureCanvas
+
+
+def _encode_png(pixels, dpi, metadata, pil_kwargs):
+    from matplotlib.image import imsave
+
+    out = BytesIO()
+    # A byte memoryview takes imsave's no-copy path, as the Agg canvas's own does
+    imsave(out, memoryview(pixels), format="png", origin="upper", dpi=dpi,
+           metadata=metadata, pil_kwargs=pil_kwargs)
+    return out.getvalue()
+
+
+def _save(fig, format, dpi, savefig_kw):
+    """Save ``fig`` while ``RC_LOCK`` is held; ``_finish`` the result after releasing it."""
+    out = BytesIO()
+    if format == "png":
+        canvas = _capture_canvas()(fig)
+        fig.savefig(out, format="png", dpi=dpi, **savefig_kw)
+        return canvas.captured
+    fig.savefig(out, format=format, dpi=dpi, **savefig_kw)
+    return out.getvalue()
+
+
+def _finish(saved):
+    return _encode_png(*saved) if isinstance(saved, tuple) else saved
+
+
+def render_figure(draw, theme="light", format="png", size=(8, 5), dpi=100, **savefig_kw):
+    """Call ``draw(fig)`` on a new figure under ``theme`` and return the saved bytes.
+
+    ``format`` is any ``savefig`` format; PNGs are byte-identical to
+    ``savefig``'s, compressed outside ``RC_LOCK``. ``savefig_kw`` go to
+    ``savefig``.
+    """
+    with themed(theme):
+        fig = figure(figsize=size)
+        draw(fig)
+        saved = _save(fig, format, dpi, savefig_kw)
+    return _finish(saved)
@@ -0,0 +1,76 @@
+"""Cached font metrics for measuring text without a renderer.
+
+Matplotlib measures text by drawing it: ``tight_layout`` and
+``bbox_inches="tight"`` each run a draw pass just to learn how big the
+labels are. For laying out a chart, advance widths and the font's line
+height are enough, and they depend only on the font file and size, so they
+are read from FreeType once per character and kept:
+
+    g = glyphs_for_prop(text.get_fontproperties())
+    g.width("Revenue"), g.ascent, g.descent     # points
+
+``glyphs(family, size, weight, style)`` resolves a family name against the
+active rcParams first ("serif" means whatever ``font.serif`` finds).
+Kerning is ignored, so widths can be off by a fraction of a point per pair.
+"""
+
+from functools import lru_cache
+
+
+class Glyphs:
+    """Advance widths and line metrics for one font, cached per character."""
+
+    def __init__(self, prop):
+        from matplotlib.font_manager import get_font
+
+        self.prop = prop
+        self.size = prop.get_size_in_points()
+        self._font = get_font(prop.get_file())
+        self._advances = {}
+        # Line height the way matplotlib lays text out: the ink extent of "lp".
+        self._font.set_size(self.size, 72)
+        self._font.set_text("lp", 0.0)
+        self.descent = self._font.get_descent() / 64
+        self.ascent = self._font.get_width_height()[1] / 64 - self.descent
+
+    def advance(self, char):
+        try:
+            return self._advances[char]
+        except KeyError:
+            pass
+        try:
+            from matplotlib.ft2font import LoadFlags
+            flags = LoadFlags.NO_HINTING
+        except ImportError:  # matplotlib < 3.10
+            from matplotlib.ft2font import LOAD_NO_HINTING as flags
+
+        self._font.set_size(self.size, 72)
+        glyph = self._font.load_char(ord(char), flags=flags)
+        width = self._advances[char] = glyph.linearHoriAdvance / 65536
+        return width
+
+    def width(self, text):
+        """Width of ``text`` in points."""
+        return sum(map(self.advance, text))
+
+
+def glyphs(family, size, weight="normal", style="normal"):
+    """``Glyphs`` for ``family`` at ``size`` points, resolved under the current rcParams."""
+    from matplotlib.font_manager import FontProperties
+
+    return glyphs_for_prop(FontProperties(family=family, size=size, weight=weight, style=style))
+
+
+def glyphs_for_prop(prop):
+    """``Glyphs`` for a matplotlib ``FontProperties``, e.g. ``text.get_fontproperties()``."""
+    from matplotlib.font_manager import findfont
+
+    # Key the cache on the resolved file: "serif" depends on the active rcParams.
+    return _glyphs_for(findfont(prop), prop.get_size_in_points())
+
+
+@lru_cache(maxsize=None)
+def _glyphs_for(fname, size):
+    from matplotlib.font_manager import FontProperties
+
+    return Glyphs(FontProperties(fname=fname, size=size))
@@ -0,0 +1,68 @@
+"""Measure what importing tufte costs, and fail when it exceeds its budget.
+
+Each import is timed in a fresh interpreter with ``python -X importtime``,
+which reports the cumulative time of every top-level import; the median of
+``--runs`` runs is kept. The budget applies to ``import tufte`` itself,
+which must stay at the cost of reading a few constants. The backend modules
+are reported for reference, since they pull in numpy, matplotlib or Plotly:
+
+    python -m tufte.importtime                 # exit status 1 if over budget
+    python -m tufte.importtime --budget-ms 5 --runs 9
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+
+BUDGET_MS = 10.0
+
+MODULES = ("tufte", "tufte.frame", "tufte.spec", "tufte.table", "tufte.plotly_figure",
+           "tufte.service")
+
+# What a first call into each backend additionally imports.
+BACKENDS = {"tufte.table": "matplotlib.backends.backend_agg",
+            "tufte.plotly_figure": "plotly.graph_objects"}
+
+
+def import_ms(statement, module, runs=5):
+    """Median cumulative import time of ``module``, in ms, when running ``statement``."""
+    times = []
+    for _ in range(runs):
+        err = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                             capture_output=True, text=True, check=True).stderr
+        total = 0
+        for line in err.splitlines():
+            # "import time: self [us] | cumulative | imported package"
+            fields = line.split("|")
+            if len(fields) == 3 and fields[2].strip() == module:
+                total = max(total, int(fields[1]))
+        times.append(total / 1000)
+    return statistics.median(times)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=BUDGET_MS,
+                        help="limit for 'import tufte' (default: %(default)s)")
+    parser.add_argument("--runs", type=int, default=5, help="runs per module (default: 5)")
+    args = parser.parse_args(argv)
+
+    core = None
+    for module in MODULES:
+        ms = import_ms(f"import {module}", module, args.runs)
+        if module == "tufte":
+            core = ms
+        line = f"  {module:<24} {ms:8.1f} ms"
+        if module in BACKENDS:
+            dep = BACKENDS[module]
+            dep_ms = import_ms(f"import {module}, {dep}", dep, args.runs)
+            line += f"   + {dep} on first use: {dep_ms:.0f} ms"
+        print(line)
+    verdict = "within" if core <= args.budget_ms else "OVER"
+    print(f"import tufte: {core:.1f} ms, {verdict} the {args.budget_ms:g} ms budget")
+    return 0 if core <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
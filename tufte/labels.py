@@ -0,0 +1,66 @@
+"""Collision-free placement of direct labels along one axis.
+
+Direct labels sit where their series end, and converging series end close
+together. ``resolve`` moves each label vertically as little as possible,
+in total squared distance, so that no two labels overlap:
+
+    centers = resolve(ends_pt, heights_pt, gap=2, lo=axes_bottom, hi=axes_top)
+
+The labels are sorted once by position. In that order the spacing
+constraints turn the problem into isotonic regression, which a single
+pool-adjacent-violators sweep solves exactly. The whole resolution is
+O(n log n), so 500 converging series cost about a millisecond, where pairwise
+nudging is O(n²) per round. Positions are in any one unit (points for
+matplotlib, pixels for Plotly); ``tufte.marks.direct_labels`` and
+``tufte.plotly_figure.add_direct_labels`` do the conversions.
+"""
+
+import numpy as np
+
+
+def resolve(y, heights, gap=0.0, lo=-np.inf, hi=np.inf):
+    """Label centers closest to ``y`` with no two of the ``heights`` overlapping.
+
+    ``heights`` is one height or one per label, ``gap`` the free space kept
+    between neighbours, and ``lo``/``hi`` bound the centers. Labels keep
+    their order (ties in ``y`` keep input order). A stack taller than
+    ``hi - lo`` is centered on the range and overflows both ends.
+    """
+    y = np.asarray(y, dtype=float)
+    if y.size < 2:
+        return np.clip(y, lo, hi) if y.size else y.copy()
+    h = np.broadcast_to(np.asarray(heights, dtype=float), y.shape)
+    order = np.argsort(y, kind="stable")
+    # Offsets of each center above the lowest one when the stack is packed
+    packed = np.concatenate(([0.0], np.cumsum((h[order][:-1] + h[order][1:]) / 2 + gap)))
+    z = y[order] - packed
+    # Pool adjacent violators: the packed-relative positions must not decrease
+    sums, counts = [], []
+    for value in z.tolist():
+        total, count = value, 1
+        while sums and sums[-1] * count > total * counts[-1]:
+            total += sums.pop()
+            count += counts.pop()
+        sums.append(total)
+        counts.append(count)
+    base = np.repeat(np.array(sums) / np.array(counts), counts)
+    if packed[-1] > hi - lo:
+        base[:] = (lo + hi - packed[-1]) / 2
+    else:
+        base = np.clip(base, lo, hi - packed[-1])
+    out = np.empty_like(y)
+    out[order] = base + packed
+    return out
+
+
+def shifts(y, heights, gap=0.0, lo=-np.inf, hi=np.inf, threshold=None):
+    """``(shift, leader)``: how far ``resolve`` moves each label, and whether it needs a leader.
+
+    A label needs a leader line back to its point when it moved by more
+    than ``threshold``, by default half its height.
+    """
+    y = np.asarray(y, dtype=float)
+    shift = resolve(y, heights, gap, lo, hi) - y
+    if threshold is None:
+        threshold = np.broadcast_to(np.asarray(heights, dtype=float), y.shape) / 2
+    return shift, np.abs(shift) > threshold
@@ -0,0 +1,374 @@
+"""Analytic Tufte layout: margins from cached font metrics, one render per save.
+
+The usual recipe, ``plt.tight_layout()`` then ``subplots_adjust(top=0.88)``
+for a ``fig.text`` title, then ``savefig`` with ``bbox_inches="tight"``,
+draws the figure three times: once to measure for ``tight_layout``, once
+to measure the tight bounding box and once for real. The second call also
+throws away part of what the first computed.
+
+``TufteLayout`` is a matplotlib layout engine that needs no measuring draw.
+At draw time it reads what will be drawn around each grid axes: tick labels
+(from the locator and formatter), axis labels, axes titles, and texts and
+direct labels that stick out past the axes. It sizes all of these from the
+cached per-character metrics in ``tufte.fonts``. The title and subtitle
+added with ``tufte_layout`` are set left-aligned with the axes, at the top.
+Margins are then solved directly, in inches:
+
+    fig, ax = plt.subplots(figsize=(9, 6))
+    ax.plot(months, revenue)
+    direct_label(ax, months, revenue, "Revenue")
+    tufte_layout(fig, "Revenue Exceeded Target Every Month", "Monthly revenue, 2025")
+    save(fig, "revenue.png")        # one draw, no bbox_inches="tight"
+
+``save`` overrides ``savefig.bbox``, and writes PDF and SVG through
+``tufte.vector`` without their creation date, so identical figures produce
+identical bytes.
+Other ``fig.text`` artists stay where they were put; the margins only keep
+clear of them. Labels placed with ``tufte.marks.direct_labels`` are spread
+apart again for the final axes size. Texts are laid out as horizontal or vertical (rotation 0
+or 90) and mathtext is measured as plain text.
+"""
+
+from contextlib import contextmanager
+from pathlib import Path
+
+from matplotlib.layout_engine import LayoutEngine
+
+from tufte.fonts import glyphs_for_prop
+
+TITLE_GID = "tufte-title"
+SUBTITLE_GID = "tufte-subtitle"
+
+
+def text_size(text):
+    """``(width, ascent, descent)`` of a ``Text`` artist in points, before rotation."""
+    g = glyphs_for_prop(text.get_fontproperties())
+    lines = text.get_text().split("\n")
+    width = max(g.width(line) for line in lines)
+    extra = 0.0
+    if len(lines) > 1:
+        spacing = text.get_linespacing()
+        extra = (len(lines) - 1) * g.ascent * (1.2 if spacing == "normal" else spacing)
+    return width, g.ascent + extra, g.descent
+
+
+def _box(text, x, y):
+    """Extent ``(x0, y0, x1, y1)`` in inches of ``text`` anchored at ``(x, y)`` inches."""
+    width, ascent, descent = text_size(text)
+    if round(text.get_rotation()) % 180 == 90:
+        w, h, below = (ascent + descent) / 72, width / 72, 0.0
+    else:
+        w, h, below = width / 72, (ascent + descent) / 72, descent / 72
+    x0 = x - {"left": 0.0, "center": w / 2, "right": w}[text.get_horizontalalignment()]
+    va = text.get_verticalalignment()
+    y0 = y - {"bottom": 0.0, "baseline": below, "center": h / 2, "center_baseline": h / 2,
+              "top": h}[va]
+    return x0, y0, x0 + w, y0 + h
+
+
+def _fraction(ax, coords, xy):
+    """Axes-fraction position of ``xy`` given in ``coords``, or None if unsupported."""
+    if coords == "axes fraction" or coords is ax.transAxes:
+        return tuple(xy)
+    if coords == "data" or coords is ax.transData:
+        x, y = ax.xaxis.convert_units(xy[0]), ax.yaxis.convert_units(xy[1])
+        return tuple((ax.transScale + ax.transLimits).transform((x, y)))
+    return None
+
+
+def _anchor(ax, text, width, height):
+    """Position of ``text`` in inches from the axes' lower left corner, or None."""
+    if hasattr(text, "xyann"):   # Annotation
+        coords = text.anncoords
+        base = text.xy if coords in ("offset points", "offset pixels") else text.xyann
+        frac = _fraction(ax, text.xycoords if coords in ("offset points", "offset pixels")
+                         else coords, base)
+        if frac is None:
+            return None
+        scale = 1 / 72 if coords == "offset points" else 1 / ax.figure.dpi
+        dx, dy = ((text.xyann[0] * scale, text.xyann[1] * scale)
+                  if coords in ("offset points", "offset pixels") else (0.0, 0.0))
+    else:
+        frac = _fraction(ax, text.get_transform(), text.get_unitless_position())
+        if frac is None:
+            return None
+        dx = dy = 0.0
+    return frac[0] * width + dx, frac[1] * height + dy
+
+
+def _tick_labels(axis):
+    """The tick labels ``axis`` will draw, with their axis-fraction positions."""
+    lo, hi = sorted(axis.get_view_interval())
+    locs = axis.get_majorticklocs()
+    labels = axis.major.formatter.format_ticks(locs)
+    span = (hi - lo) or 1.0
+    return [((loc - lo) / span, label) for loc, label in zip(locs, labels)
+            if label and lo - 1e-9 * span <= loc <= hi + 1e-9 * span]
+
+
+def _axis_extent(ax, axis, width, height):
+    """Inches ``axis`` adds outside the axes: ``{side: depth}`` plus end overhangs."""
+    out = {"left": 0.0, "right": 0.0, "bottom": 0.0, "top": 0.0}
+    if not axis.get_visible() or not ax.axison:
+        return out
+    ticks = axis.get_major_ticks(1)
+    labels = _tick_labels(axis) if ticks else []
+    x_axis = axis.axis_name == "x"
+    near, far = ("bottom", "top") if x_axis else ("left", "right")
+    depth = {near: 0.0, far: 0.0}
+    if labels:
+        tick = ticks[0]
+        offset = (tick.get_pad() + tick.get_tick_padding()) / 72
+        for side, label, on in ((near, tick.label1, tick.label1.get_visible()),
+                                (far, tick.label2, tick.label2.get_visible())):
+            if not on:
+                continue
+            g = glyphs_for_prop(label.get_fontproperties())
+            size = (g.ascent + g.descent) / 72
+            widths = [g.width(text) / 72 for _, text in labels]
+            depth[side] = offset + (size if x_axis else max(widths))
+            # Labels centred on the first and last ticks overhang the axes ends
+            length = width if x_axis else height
+            half = widths if x_axis else [size] * len(labels)
+            lo_end, hi_end = ("left", "right") if x_axis else ("bottom", "top")
+            for (frac, _), extent in zip(labels, half):
+                out[lo_end] = max(out[lo_end], extent / 2 - frac * length)
+                out[hi_end] = max(out[hi_end], extent / 2 - (1 - frac) * length)
+    label = axis.label
+    if label.get_visible() and label.get_text():
+        _, ascent, descent = text_size(label)
+        side = near if axis.get_label_position() in ("bottom", "left") else far
+        depth[side] += axis.labelpad / 72 + (ascent + descent) / 72
+    out[near] = max(out[near], depth[near])
+    out[far] = max(out[far], depth[far])
+    return out
+
+
+def decorations(ax, width, height):
+    """Inches needed outside ``ax`` on each side, for an axes ``width`` x ``height`` inches.
+
+    Returns ``{"left", "right", "bottom", "top"}``, each at least 0.
+    """
+    out = {"left": 0.0, "right": 0.0, "bottom": 0.0, "top": 0.0}
+    for axis in (ax.xaxis, ax.yaxis):
+        for side, depth in _axis_extent(ax, axis, width, height).items():
+            out[side] = max(out[side], depth)
+    titles = [t for t in (ax.title, ax._left_title, ax._right_title)
+              if t.get_visible() and t.get_text()]
+    if titles:
+        from matplotlib import rcParams
+
+        pad = rcParams["axes.titlepad"] / 72
+        tallest = max(sum(text_size(t)[1:]) for t in titles) / 72
+        out["top"] += pad + tallest
+    for text in ax.texts:
+        if not (text.get_visible() and text.get_text()):
+            continue
+        anchor = _anchor(ax, text, width, height)
+        if anchor is None:
+            continue
+        x0, y0, x1, y1 = _box(text, *anchor)
+        out["left"] = max(out["left"], -x0)
+        out["right"] = max(out["right"], x1 - width)
+        out["bottom"] = max(out["bottom"], -y0)
+        out["top"] = max(out["top"], y1 - height)
+    return out
+
+
+def _title_block(fig):
+    """Height in inches of the engine's title and subtitle, with their gaps."""
+    height = 0.0
+    for text in fig.texts:
+        if text.get_gid() in (TITLE_GID, SUBTITLE_GID) and text.get_text():
+            _, ascent, descent = text_size(text)
+            height += (ascent + descent * 2) / 72
+    return height
+
+
+def _place_titles(fig, x, top_pad, ha="left"):
+    """Put the title and subtitle at ``x`` inches, aligned ``ha``, below the top pad."""
+    width, height = fig.get_size_inches()
+    y = height - top_pad
+    for gid in (TITLE_GID, SUBTITLE_GID):
+        for text in fig.texts:
+            if text.get_gid() == gid and text.get_text():
+                _, ascent, descent = text_size(text)
+                y -= ascent / 72
+                text.set_position((x / width, y / height))
+                text.set_horizontalalignment(ha)
+                text.set_verticalalignment("baseline")
+                y -= descent * 2 / 72
+
+
+def _fixed_texts(fig, width, height, gap):
+    """Margins that keep the grid clear of ``fig.text`` artists placed by hand."""
+    bottom = top = 0.0
+    for text in fig.texts:
+        if text.get_gid() in (TITLE_GID, SUBTITLE_GID) or not text.get_text():
+            continue
+        if text.get_transform() is not fig.transFigure:
+            continue
+        fx, fy = text.get_unitless_position()
+        _, y0, _, y1 = _box(text, fx * width, fy * height)
+        if (y0 + y1) / 2 > height / 2:
+            top = max(top, height - y0 + gap)
+        else:
+            bottom = max(bottom, y1 + gap)
+    return bottom, top
+
+
+def layout_margins(fig, pad=0.3, w_pad=0.3, h_pad=0.3, title_gap=0.15, title_x="axes",
+                   iterations=4):
+    """Solve the subplot parameters of ``fig`` without drawing it.
+
+    ``pad`` is the outer margin, ``w_pad``/``h_pad`` the clear space between
+    neighbouring axes' decorations and ``title_gap`` the space under the
+    subtitle, all in inches. ``title_x`` is read by ``TufteLayout`` only.
+    Only axes placed on a gridspec (``subplots``,
+    ``add_subplot``) are laid out. Returns ``subplots_adjust`` keyword
+    arguments, or an empty dict when there is nothing to lay out.
+    """
+    axes = [ax for ax in fig.axes if ax.get_subplotspec() is not None and ax.get_visible()]
+    if not axes:
+        return {}
+    gs = axes[0].get_subplotspec().get_topmost_subplotspec().get_gridspec()
+    nrows, ncols = gs.get_geometry()
+    width, height = fig.get_size_inches()
+    fixed_bottom, fixed_top = _fixed_texts(fig, width, height, h_pad / 2)
+    titles = _title_block(fig)
+    top_floor = pad + titles + (title_gap if titles else 0.0)
+
+    top_base, bottom_base = max(top_floor, fixed_top), max(pad, fixed_bottom)
+    left = right = bottom = top = pad
+    gap_w = gap_h = 0.0
+    # Axes sizes depend on the margins and data-anchored labels on the axes
+    # sizes; a few rounds of fixed-point iteration settle both.
+    for _ in range(iterations):
+        ax_w = max((width - left - right - gap_w * (ncols - 1)) / ncols, 0.1)
+        ax_h = max((height - bottom - top - gap_h * (nrows - 1)) / nrows, 0.1)
+        col_left, col_right = [0.0] * ncols, [0.0] * ncols
+        row_top, row_bottom = [0.0] * nrows, [0.0] * nrows
+        for ax in axes:
+            spec = ax.get_subplotspec()
+            rows, cols = spec.rowspan, spec.colspan
+            d = decorations(ax, ax_w * len(cols), ax_h * len(rows))
+            col_left[cols[0]] = max(col_left[cols[0]], d["left"])
+            col_right[cols[-1]] = max(col_right[cols[-1]], d["right"])
+            row_top[rows[0]] = max(row_top[rows[0]], d["top"])
+            row_bottom[rows[-1]] = max(row_bottom[rows[-1]], d["bottom"])
+        new = (pad + col_left[0], pad + col_right[-1], bottom_base + row_bottom[-1],
+               top_base + row_top[0],
+               max((col_right[c] + col_left[c + 1] for c in range(ncols - 1)), default=0) + w_pad,
+               max((row_bottom[r] + row_top[r + 1] for r in range(nrows - 1)), default=0) + h_pad)
+        old = (left, right, bottom, top, gap_w, gap_h)
+        left, right, bottom, top, gap_w, gap_h = new
+        if sum(abs(a - b) for a, b in zip(new, old)) < 1e-3:
+            break
+
+    # Margins that leave no room for the grid (labels overflowing a tiny
+    # figure) are scaled back so subplots_adjust still accepts them.
+    if left + right > 0.9 * width:
+        left, right = (m * 0.9 * width / (left + right) for m in (left, right))
+    if bottom + top > 0.9 * height:
+        bottom, top = (m * 0.9 * height / (bottom + top) for m in (bottom, top))
+    ax_w = max((width - left - right - gap_w * (ncols - 1)) / ncols, 0.1)
+    ax_h = max((height - bottom - top - gap_h * (nrows - 1)) / nrows, 0.1)
+    return dict(left=left / width, right=1 - right / width, bottom=bottom / height,
+                top=1 - top / height, wspace=gap_w / ax_w, hspace=gap_h / ax_h)
+
+
+class TufteLayout(LayoutEngine):
+    """Layout engine running ``layout_margins`` at draw time; see the module docstring.
+
+    ``fig.set_layout_engine(TufteLayout(pad=0.3))``; the keyword arguments
+    are those of ``layout_margins``. The title starts at the left edge of
+    the axes (``title_x="axes"``) or of the figure's padding (``"edge"``),
+    or is centered on the figure (``"center"``).
+    """
+
+    _adjust_compatible = True
+    _colorbar_gridspec = True
+
+    def __init__(self, *, pad=0.3, w_pad=0.3, h_pad=0.3, title_gap=0.15, title_x="axes",
+                 **kwargs):
+        super().__init__(**kwargs)
+        self._params = dict(pad=pad, w_pad=w_pad, h_pad=h_pad, title_gap=title_gap,
+                            title_x=title_x)
+
+    def set(self, **kwargs):
+        unknown = set(kwargs) - set(self._params)
+        if unknown:
+            raise TypeError(f"unknown TufteLayout parameter(s): {', '.join(sorted(unknown))}")
+        self._params.update(kwargs)
+
+    def execute(self, fig):
+        from tufte.marks import relabel
+
+        margins = layout_margins(fig, **self._params)
+        if margins:
+            fig.subplots_adjust(**margins)
+            relabel(fig)
+            pad, title_x = self._params["pad"], self._params["title_x"]
+            if title_x == "center":
+                _place_titles(fig, fig.get_figwidth() / 2, pad, ha="center")
+            else:
+                left = margins["left"] * fig.get_figwidth() if title_x == "axes" else pad
+                _place_titles(fig, left, pad)
+
+
+def tufte_layout(fig, title=None, subtitle=None, *, color="#111111", subtitle_color="#666666",
+                 size=18, subtitle_size=13, **params):
+    """Attach a ``TufteLayout`` to ``fig`` with an optional title and subtitle.
+
+    The title and subtitle are serif ``fig.text`` artists, positioned by the
+    engine on every draw. ``params`` go to ``TufteLayout``. Returns the engine.
+    """
+    if title:
+        fig.text(0, 1, title, fontsize=size, color=color, fontfamily="serif", gid=TITLE_GID)
+    if subtitle:
+        fig.text(0, 1, subtitle, fontsize=subtitle_size, color=subtitle_color,
+                 fontfamily="serif", gid=SUBTITLE_GID)
+    engine = TufteLayout(**params)
+    fig.set_layout_engine(engine)
+    return engine
+
+
+@contextmanager
+def laid_out(fig):
+    """Apply ``fig``'s ``TufteLayout`` now and detach it for the block.
+
+    Matplotlib runs a measuring draw before saving a figure that has a
+    layout engine; with the layout already applied it is wasted.
+    """
+    engine = fig.get_layout_engine()
+    if not isinstance(engine, TufteLayout):
+        yield fig
+        return
+    engine.execute(fig)
+    fig.set_layout_engine(None)
+    try:
+        yield fig
+    finally:
+        fig.set_layout_engine(engine)
+
+
+def save(fig, path, **kwargs):
+    """``fig.savefig(path)`` with one render and reproducible bytes.
+
+    Matplotlib runs a measuring draw before saving whenever a figure has a
+    layout engine or ``savefig.bbox`` is ``"tight"``. Here a ``TufteLayout``
+    is applied up front and detached for the save, and ``savefig.bbox`` is
+    ``"standard"`` whatever the rc says (pass ``bbox_inches`` to override),
+    set through ``themed`` so other threads' rcParams are left alone.
+    ``.svg`` and ``.pdf`` go through ``tufte.vector.save_vector``, which
+    also leaves out their creation date and makes them small.
+    """
+    from tufte.figures import themed
+
+    if Path(path).suffix.lower() in (".svg", ".pdf"):
+        from tufte.vector import save_vector
+
+        return save_vector(fig, path, **kwargs)
+    with laid_out(fig), themed({"savefig.bbox": "standard"}):
+        fig.savefig(path, **kwargs)
+    return path
@@ -0,0 +1,160 @@
+"""Direct labels, point annotations and rug marks for matplotlib axes.
+
+Tufte labels series where they end instead of in a legend, calls out the
+one point worth noticing, and shows marginal distributions as rug marks
+along the axes instead of separate histograms:
+
+    ax.plot(months, revenue, color=PALETTE["highlight"])
+    direct_label(ax, months, revenue, "Revenue", color=PALETTE["highlight"])
+    annotate_point(ax, months[peak], revenue[peak], "Peak: $82k")
+    rug_marks(ax, x, y)
+
+Many series ending close together are labelled in one call, which spreads
+the labels apart and adds leader lines where a label had to move:
+
+    direct_labels(ax, ends_x, ends_y, names, colors)
+"""
+
+import numpy as np
+
+from tufte.labels import shifts
+from tufte.profile import profiled
+
+# Attribute of an Axes holding its label groups, re-resolved by ``relabel`` when
+# the axes are resized. Kept on the Axes so the groups die with the figure.
+_GROUPS = "_tufte_label_groups"
+
+
+def _groups(ax):
+    return getattr(ax, _GROUPS, ())
+
+
+@profiled("artists")
+def direct_label(ax, x, y, label, color="#111111", offset=(8, 0), **kwargs):
+    """Write ``label`` just right of the last point of the series ``(x, y)``."""
+    return ax.annotate(label, xy=(np.asarray(x)[-1], np.asarray(y)[-1]), xytext=offset,
+                       textcoords="offset points", va="center",
+                       **{"fontsize": 12, "color": color, "fontfamily": "serif", **kwargs})
+
+
+@profiled("artists")
+def direct_labels(ax, x, y, labels, colors="#111111", side="right", offset=8, gap=2,
+                  leader_offset=24, leader_color="#cccccc", **kwargs):
+    """Label each point ``(x[i], y[i])`` with ``labels[i]``, moving labels apart so none overlap.
+
+    ``colors`` is one color or one per label; ``side`` puts the labels
+    right or left of their points. Labels are spread vertically within the
+    axes with at least ``gap`` points between them. If any label moved by
+    more than half its height, all labels go ``leader_offset`` points out
+    instead of ``offset`` and the moved ones get a hairline leader. The
+    placement is resolved for the axes' current size and limits, so call
+    this after setting the limits; ``TufteLayout`` resolves it again after
+    resizing the axes. Returns the annotations.
+    """
+    from matplotlib.collections import LineCollection
+    from matplotlib.transforms import Affine2D
+
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    colors = [colors] * len(labels) if isinstance(colors, str) else list(colors)
+    props = {"fontsize": 12, "fontfamily": "serif", **kwargs}
+    ha = "left" if side == "right" else "right"
+    texts = [ax.annotate(label, xy=(xi, yi), xytext=(0, 0), textcoords="offset points",
+                         ha=ha, va="center", color=color, **props)
+             for label, xi, yi, color in zip(labels, x, y, colors)]
+    # Leaders are drawn in points, each offset to its label's data point
+    leaders = LineCollection([], colors=leader_color, linewidths=0.5, clip_on=False,
+                             offsets=np.empty((0, 2)), offset_transform=ax.transData,
+                             transform=Affine2D().scale(1 / 72) + ax.figure.dpi_scale_trans,
+                             animated=kwargs.get("animated", False))
+    ax.add_collection(leaders, autolim=False)
+    group = dict(x=x, y=y, texts=texts, heights=_heights(texts), leaders=leaders,
+                 sign=1 if side == "right" else -1, offset=offset, gap=gap,
+                 leader_offset=leader_offset)
+    if not hasattr(ax, _GROUPS):
+        setattr(ax, _GROUPS, [])
+    getattr(ax, _GROUPS).append(group)
+    _place(ax, group)
+    return texts
+
+
+def _heights(texts):
+    """Heights of ``texts`` in points, measured once per font and line count."""
+    from tufte.layout import text_size
+
+    known = {}
+    for text in texts:
+        key = (text.get_fontproperties(), text.get_text().count("\n"))
+        if key not in known:
+            known[key] = sum(text_size(text)[1:])
+    return np.array([known[(t.get_fontproperties(), t.get_text().count("\n"))] for t in texts])
+
+
+def _place(ax, group):
+    ax.get_ylim()  # apply any pending autoscaling before reading transData
+    points = 72 / ax.figure.dpi
+    anchors = ax.transData.transform(np.column_stack([group["x"], group["y"]]))[:, 1] * points
+    shift, leader = shifts(anchors, group["heights"], group["gap"], ax.bbox.y0 * points,
+                           ax.bbox.y1 * points)
+    sign = group["sign"]
+    dx = sign * (group["leader_offset"] if leader.any() else group["offset"])
+    for text, dy in zip(group["texts"], shift.tolist()):
+        text.xyann = (dx, dy)
+    end = dx - sign * 2
+    group["leaders"].set_segments([[(sign * 2, 0), (end, dy)] for dy in shift[leader].tolist()])
+    group["leaders"].set_offsets(np.column_stack([group["x"], group["y"]])[leader])
+
+
+def update_labels(ax, texts, x, y):
+    """Move the ``direct_labels`` annotations ``texts`` to new points and resolve them again."""
+    for group in _groups(ax):
+        if group["texts"] is texts:
+            break
+    else:
+        raise ValueError("texts were not created by direct_labels on this axes")
+    group["x"] = np.asarray(x, dtype=float)
+    group["y"] = np.asarray(y, dtype=float)
+    for text, xy in zip(texts, zip(group["x"].tolist(), group["y"].tolist())):
+        text.xy = xy
+    _place(ax, group)
+
+
+def relabel(fig):
+    """Re-resolve the ``direct_labels`` of every axes in ``fig`` for its current size."""
+    for ax in fig.axes:
+        for group in _groups(ax):
+            _place(ax, group)
+
+
+@profiled("artists")
+def annotate_point(ax, x, y, text, color="#333333", offset=(0, 24), line_color="#cccccc",
+                   **kwargs):
+    """Annotate ``(x, y)`` with italic ``text`` above it and a hairline leader."""
+    # The leader starts 4pt off the text: what clipping it against the padded
+    # text box gives, without the per-draw bezier search
+    return ax.annotate(text, xy=(x, y), xytext=offset, textcoords="offset points", ha="center",
+                       arrowprops=dict(arrowstyle="-", color=line_color, lw=0.5, patchA=None,
+                                       shrinkA=4),
+                       **{"fontsize": 11, "fontstyle": "italic", "color": color,
+                          "fontfamily": "serif", **kwargs})
+
+
+@profiled("artists")
+def rug_marks(ax, x_data=None, y_data=None, color="#999999", size=4, alpha=0.4):
+    """Add rug marks along the bottom (``x_data``) and left (``y_data``) edges.
+
+    The marks sit on the axes edges in axes coordinates, so they stay there
+    if the limits change later. Each side is a single ``Line2D``. Returns the
+    created lines, ``x`` first.
+    """
+    lines = []
+    style = dict(linestyle="none", color=color, markersize=size, alpha=alpha, clip_on=False)
+    if x_data is not None:
+        x = np.asarray(x_data)
+        lines += ax.plot(x, np.zeros(len(x)), marker="|", transform=ax.get_xaxis_transform(),
+                         **style)
+    if y_data is not None:
+        y = np.asarray(y_data)
+        lines += ax.plot(np.zeros(len(y)), y, marker="_", transform=ax.get_yaxis_transform(),
+                         **style)
+    return lines
@@ -0,0 +1,288 @@
+"""Small multiples stamped from one panel template.
+
+A grid of ``plt.subplots`` axes pays for every panel's spines, tickers and
+labels separately, and each panel is laid out again on every draw. Here the
+whole grid is drawn in one Axes. The shared scale is computed once, with
+NumPy, over a ``(panels, series, time)`` array; ticks and spines are worked
+out once for a template panel and stamped at every panel offset:
+
+    fig, ax = grid_figure(nrows=20, ncols=10)
+    small_multiples(ax, values, x, titles=names, ncols=10)
+
+That is one ``LineCollection`` for all lines, one for all spines, one
+``Line2D`` of tick markers per axis, plus the text: panel titles, and tick
+labels on the left column and bottom row only.
+
+``render_tiles`` draws bands of grid rows and stacks the pixels into one
+image. Each worker process pays about a second of start-up for bands that
+take milliseconds to draw, so the bands are drawn in parallel only from
+``PARALLEL_FACETS`` facets up; below that one ``small_multiples`` Axes is
+the fastest way to draw a grid.
+
+Panels use axes-free coordinates: panel ``(r, c)`` spans ``[0, 1]`` in x and
+y, offset by ``1 + wgap`` per column and ``1 + hgap`` per row, with the
+``hgap`` band above each panel holding its title.
+"""
+
+import os
+
+import numpy as np
+
+from tufte.profile import profiled
+
+
+def facet_array(frame, facet, x, y, series=None):
+    """Pivot a long-format frame into ``(names, xs, values)``.
+
+    ``frame`` is a DataFrame or a mapping of columns; ``facet``, ``x``, ``y``
+    and ``series`` are column names. ``values`` has shape ``(panels, series,
+    len(xs))`` with NaN where a combination is missing. Panels and series
+    keep their sorted order.
+    """
+    names, f_idx = np.unique(np.asarray(frame[facet]), return_inverse=True)
+    xs, x_idx = np.unique(np.asarray(frame[x]), return_inverse=True)
+    if series is None:
+        s_idx, n_series = np.zeros(len(f_idx), dtype=np.intp), 1
+    else:
+        labels, s_idx = np.unique(np.asarray(frame[series]), return_inverse=True)
+        n_series = len(labels)
+    values = np.full((len(names), n_series, len(xs)), np.nan)
+    values[f_idx, s_idx, x_idx] = np.asarray(frame[y], dtype=float)
+    return names.tolist(), xs, values
+
+
+def as_panels(values):
+    """View ``values`` as a ``(panels, series, time)`` float array."""
+    a = np.asarray(values, dtype=float)
+    if a.ndim == 2:
+        a = a[:, None, :]
+    if a.ndim != 3:
+        raise ValueError(f"expected a (panels, [series,] time) array, got shape {a.shape}")
+    return a
+
+
+def shared_limits(values, padding=0.0):
+    """Return ``(lo, hi)`` over every finite value, widened by ``padding`` of the span."""
+    a = np.asarray(values, dtype=float)
+    finite = a[np.isfinite(a)] if not np.isfinite(a).all() else a
+    if finite.size == 0:
+        raise ValueError("no finite values to scale")
+    lo, hi = float(finite.min()), float(finite.max())
+    pad = (hi - lo) * padding
+    return lo - pad, hi + pad
+
+
+def grid_shape(n, ncols=None):
+    """``(nrows, ncols)`` for ``n`` panels; roughly square unless ``ncols`` is given."""
+    ncols = ncols or int(np.ceil(np.sqrt(n)))
+    return -(-n // ncols), ncols
+
+
+def grid_figure(nrows, ncols, panel_size=(2.0, 1.2), wgap=0.15, hgap=0.3,
+                margins=(0.6, 0.4, 0.2, 0.6), **fig_kw):
+    """Create a pyplot-free figure and one Axes sized for an ``nrows`` x ``ncols`` grid.
+
+    ``panel_size`` is in inches; ``margins`` (left, bottom, right, top, in
+    inches) leave room for tick labels and a headline. Pass the returned
+    Axes to ``small_multiples`` with the same gaps.
+    """
+    from tufte.figures import figure
+
+    left, bottom, right, top = margins
+    grid_w = panel_size[0] * (ncols + (ncols - 1) * wgap)
+    grid_h = panel_size[1] * nrows * (1 + hgap)
+    width, height = left + grid_w + right, bottom + grid_h + top
+    fig = figure(figsize=(width, height), **fig_kw)
+    ax = fig.add_axes((left / width, bottom / height, grid_w / width, grid_h / height))
+    return fig, ax
+
+
+def _ticks(lo, hi, ticks, n=4):
+    if ticks is not None:
+        return np.asarray(ticks, dtype=float)
+    from matplotlib.ticker import MaxNLocator
+
+    t = MaxNLocator(n).tick_values(lo, hi)
+    return t[(t >= lo) & (t <= hi)]
+
+
+def _label(value):
+    return f"{value:g}"
+
+
+@profiled("artists")
+def small_multiples(ax, values, x=None, titles=None, *, ncols=None, positions=None, total=None,
+                    colors="#666666", linewidth=1.5, xlim=None, ylim=None,
+                    xticks=None, xticklabels=None, yticks=None, yticklabels=None,
+                    axis_color="#cccccc", tick_color="#999999", title_color="#111111",
+                    title_size=14, tick_size=9, wgap=0.15, hgap=0.3):
+    """Draw every panel of ``values`` on ``ax`` with one shared scale.
+
+    ``values`` is ``(panels, series, time)`` or ``(panels, time)``; ``x``
+    is the shared time axis (default ``0..time-1``). ``colors`` is one color
+    or one per series. ``xlim``/``ylim`` default to the data extent over all
+    panels. ``positions`` places the panels of ``values`` at those grid
+    positions out of ``total`` (default: all of them, in order), so a slice
+    of a larger grid can be drawn with the full grid's geometry;
+    ``render_tiles`` uses this.
+
+    Returns a dict of the created artists.
+    """
+    from matplotlib.collections import LineCollection
+    from matplotlib.colors import is_color_like
+    from matplotlib.transforms import offset_copy
+
+    v = as_panels(values)
+    n, n_series, length = v.shape
+    xs = np.arange(length, dtype=float) if x is None else np.asarray(x, dtype=float)
+    idx = np.arange(n) if positions is None else np.asarray(positions)
+    total = n if total is None else total
+    nrows, ncols = grid_shape(total, ncols)
+    x_lo, x_hi = xlim or shared_limits(xs)
+    y_lo, y_hi = ylim or shared_limits(v)
+    x_span = (x_hi - x_lo) or 1.0
+    y_span = (y_hi - y_lo) or 1.0
+
+    col, row = idx % ncols, idx // ncols
+    left = col * (1 + wgap)
+    bottom = -(row + 1) * (1 + hgap)
+
+    # Template panel in unit coordinates, stamped at each panel's offset.
+    ux = (xs - x_lo) / x_span
+    uy = (v - y_lo) / y_span
+    xy = np.empty((n, n_series, length, 2))
+    xy[..., 0] = left[:, None, None] + ux
+    xy[..., 1] = bottom[:, None, None] + uy
+    # An RGB(A) tuple is one color, not one per series
+    line_colors = [colors] if is_color_like(colors) else list(colors)
+    series_colors = [line_colors[i % len(line_colors)] for i in range(n_series)]
+    artists = {"lines": ax.add_collection(
+        LineCollection(xy.reshape(-1, length, 2), linewidths=linewidth,
+                       colors=series_colors * n),
+        autolim=False)}
+
+    x_ticks = _ticks(x_lo, x_hi, xticks)
+    y_ticks = _ticks(y_lo, y_hi, yticks)
+    tx, ty = (x_ticks - x_lo) / x_span, (y_ticks - y_lo) / y_span
+    first_col = col == 0
+    last_row = idx + ncols >= total  # nothing below: label the x axis
+
+    spines = [np.stack([np.column_stack([left, bottom]),
+                        np.column_stack([left + 1, bottom])], axis=1)]
+    spines.append(np.stack([np.column_stack([left[first_col], bottom[first_col]]),
+                            np.column_stack([left[first_col], bottom[first_col] + 1])], axis=1))
+    artists["spines"] = ax.add_collection(
+        LineCollection(np.concatenate(spines), colors=axis_color, linewidths=0.5),
+        autolim=False)
+
+    # Tick marks point into the panel: TICKUP (2) on x, TICKRIGHT (1) on y.
+    px = (left[:, None] + tx).ravel()
+    py = np.repeat(bottom, len(tx))
+    artists["xticks"], = ax.plot(px, py, linestyle="none", marker=2, markersize=3,
+                                 markeredgewidth=0.5, color=axis_color)
+    qx = np.repeat(left[first_col], len(ty))
+    qy = (bottom[first_col][:, None] + ty).ravel()
+    artists["yticks"], = ax.plot(qx, qy, linestyle="none", marker=1, markersize=3,
+                                 markeredgewidth=0.5, color=axis_color)
+
+    fig = ax.get_figure()
+    below = offset_copy(ax.transData, fig, 0, -4, units="points")
+    beside = offset_copy(ax.transData, fig, -4, 0, units="points")
+    above = offset_copy(ax.transData, fig, 0, 4, units="points")
+    text_kw = dict(fontfamily="serif", clip_on=False)
+    x_labels = [_label(t) for t in x_ticks] if xticklabels is None else list(xticklabels)
+    y_labels = [_label(t) for t in y_ticks] if yticklabels is None else list(yticklabels)
+    artists["labels"] = [
+        ax.text(l + t, b, s, transform=below, ha="center", va="top",
+                fontsize=tick_size, color=tick_color, **text_kw)
+        for l, b in zip(left[last_row], bottom[last_row]) for t, s in zip(tx, x_labels)
+    ] + [
+        ax.text(l, b + t, s, transform=beside, ha="right", va="center",
+                fontsize=tick_size, color=tick_color, **text_kw)
+        for l, b in zip(left[first_col], bottom[first_col]) for t, s in zip(ty, y_labels)
+    ]
+    if titles is not None:
+        artists["titles"] = [
+            ax.text(l, b + 1, titles[i], transform=above, ha="left", va="bottom",
+                    fontsize=title_size, color=title_color, **text_kw)
+            for i, l, b in zip(range(n), left, bottom)
+        ]
+
+    ax.set_xlim(0, ncols * (1 + wgap) - wgap)
+    ax.set_ylim(-nrows * (1 + hgap), 0)
+    ax.set_axis_off()
+    return artists
+
+
+def _render_tile(args):
+    """Worker: draw one band of grid rows and return its RGBA pixels."""
+    from tufte.figures import themed
+
+    (values, x, titles, rows, total, ncols, panel_size, margins, dpi,
+     facecolor, rc, kwargs) = args
+    left, bottom, right, top = margins
+    r0, r1 = rows
+    nrows = grid_shape(total, ncols)[0]
+    wgap, hgap = kwargs.get("wgap", 0.15), kwargs.get("hgap", 0.3)
+    with themed(rc or {}):
+        # Only the first band carries the top margin and the last the bottom one.
+        band = dict(top=top if r0 == 0 else 0, bottom=bottom if r1 == nrows else 0)
+        fig, ax = grid_figure(r1 - r0, ncols, panel_size, wgap, hgap,
+                              (left, band["bottom"], right, band["top"]),
+                              dpi=dpi, facecolor=facecolor)
+        positions = np.arange(r0 * ncols, r0 * ncols + len(values))
+        small_multiples(ax, values, x, titles, ncols=ncols, positions=positions,
+                        total=total, **kwargs)
+        ax.set_ylim(-r1 * (1 + hgap), -r0 * (1 + hgap))
+        fig.canvas.draw()
+        pixels = np.asarray(fig.canvas.buffer_rgba()).copy()
+    return pixels
+
+
+# Facets from which render_tiles uses worker processes by default. At ~3.5 ms
+# a facet and ~1 s to start a spawned worker, 4 workers break even near 400
+# facets; 203 facets took 4.2 s on 4 workers against 1.2 s on one Axes.
+PARALLEL_FACETS = 1000
+
+
+def render_tiles(path, values, x=None, titles=None, *, ncols=None, rows_per_tile=4,
+                 workers=None, panel_size=(2.0, 1.2), margins=(0.6, 0.4, 0.2, 0.6),
+                 dpi=100, facecolor="#fffff8", rc=None, **kwargs):
+    """Render a large grid in horizontal bands, in parallel, and stack them.
+
+    Each band of ``rows_per_tile`` grid rows is drawn by ``small_multiples``
+    in a worker process, and the bands' pixels are stacked into one image
+    written to ``path`` with Pillow. ``workers=1`` stays in-process, which
+    is the default below ``PARALLEL_FACETS`` facets or on one CPU.
+    Limits default to the data extent over *all* panels, computed once
+    here, so every band shares one scale. ``rc`` is applied in each worker;
+    ``kwargs`` go to ``small_multiples``. Returns the ``(H, W, 4)`` image.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    from PIL import Image
+
+    v = as_panels(values)
+    if workers is None and (len(v) < PARALLEL_FACETS or (os.cpu_count() or 1) == 1):
+        workers = 1
+    nrows, ncols = grid_shape(len(v), ncols)
+    xs = np.arange(v.shape[2]) if x is None else np.asarray(x)
+    kwargs.setdefault("xlim", shared_limits(xs))
+    kwargs.setdefault("ylim", shared_limits(v))
+    jobs = []
+    for r0 in range(0, nrows, rows_per_tile):
+        r1 = min(r0 + rows_per_tile, nrows)
+        band = slice(r0 * ncols, r1 * ncols)
+        # Ship each worker only its own panels.
+        jobs.append((v[band], xs, None if titles is None else list(titles[band]),
+                     (r0, r1), len(v), ncols, panel_size, margins, dpi, facecolor, rc, kwargs))
+
+    if workers == 1 or len(jobs) == 1:
+        tiles = [_render_tile(job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            tiles = list(pool.map(_render_tile, jobs))
+    width = min(tile.shape[1] for tile in tiles)
+    image = np.concatenate([tile[:, :width] for tile in tiles])
+    Image.fromarray(image, "RGBA").save(path)
+    return image
@@ -0,0 +1,203 @@
+"""Fast Tufte Plotly figures: a memoized dict template and batched annotations.
+
+Building ``go.layout.Template`` / ``go.Layout`` objects and calling
+``fig.add_annotation`` once per label runs Plotly's property validation on
+every call, which dominates the cost of small figures. Here the template is
+a plain dict built once per theme (``tufte_template``), labels and
+annotations are plain dicts (``direct_label``, ``point_annotation``), and
+``tufte_figure`` hands everything to a single ``go.Figure`` constructor:
+
+    fig = tufte_figure(
+        [dict(type="scatter", x=t, y=revenue, mode="lines", line=dict(color=hl))],
+        theme="dark",
+        annotations=[direct_label(t[-1], revenue[-1], "Revenue", hl),
+                     point_annotation(t[peak], revenue[peak], "Peak", theme="dark")],
+        validate=False,
+        title="Revenue",
+    )
+
+With ``validate=False`` Plotly stores the specs as given, without checking
+property names or values; use it for specs built by trusted code, and keep
+the default while developing.
+"""
+
+from functools import lru_cache
+
+SERIF = '"Palatino Linotype", Palatino, Georgia, serif'
+SANS = "system-ui, sans-serif"
+
+# Height of a line of text as a multiple of its font size, for spacing labels
+LINE_HEIGHT = 1.25
+
+THEMES = {
+    "light": {
+        "bg": "#fffff8",
+        "text": "#111",
+        "text_secondary": "#666",
+        "text_tertiary": "#999",
+        "axis": "#ccc",
+        "annotation": "#333",
+        "hover_bg": "rgba(255,255,248,0.9)",
+        "series_default": "#666",
+        "highlight": "#e41a1c",
+        "categorical": ["#4e79a7", "#f28e2b", "#e15759", "#76b7b2"],
+    },
+    "dark": {
+        "bg": "#151515",
+        "text": "#ddd",
+        "text_secondary": "#999",
+        "text_tertiary": "#666",
+        "axis": "#444",
+        "annotation": "#bbb",
+        "hover_bg": "rgba(21,21,21,0.9)",
+        "series_default": "#999",
+        "highlight": "#fc8d62",
+        "categorical": ["#6a9fd8", "#f2a860", "#e87a7c", "#8accc7"],
+    },
+}
+
+
+def _palette(theme):
+    try:
+        return THEMES[theme]
+    except KeyError:
+        raise ValueError(f"unknown theme {theme!r}; expected one of {sorted(THEMES)}") from None
+
+
+@lru_cache(maxsize=None)
+def tufte_template(theme="light"):
+    """Return the Tufte Plotly template for ``theme`` as a plain dict.
+
+    Built once per theme and shared between calls, so treat it as read-only;
+    Plotly copies it into each figure.
+    """
+    c = _palette(theme)
+    ticks = dict(ticks="inside", ticklen=3, tickwidth=0.5,
+                 tickfont=dict(family=SANS, size=11, color=c["text_tertiary"]))
+    return {"layout": {
+        "font": dict(family=SERIF, size=13, color=c["text"]),
+        "paper_bgcolor": c["bg"],
+        "plot_bgcolor": c["bg"],
+        "title": dict(font=dict(size=20, color=c["text"]), x=0.0, xanchor="left"),
+        "showlegend": False,
+        "xaxis": dict(showgrid=False, zeroline=False, showline=True, linewidth=0.5,
+                      linecolor=c["axis"], **ticks),
+        "yaxis": dict(showgrid=False, zeroline=False, showline=False, **ticks),
+        "margin": dict(l=60, r=80, t=80, b=50),
+        "hoverlabel": dict(bgcolor=c["hover_bg"], bordercolor="rgba(0,0,0,0)",
+                           font=dict(family=SANS, size=12, color=c["annotation"])),
+    }}
+
+
+def direct_label(x, y, text, color=None, theme="light", size=13, shift=0, leader=0):
+    """Annotation dict labelling a series at ``(x, y)``, left-aligned to the right of it.
+
+    ``shift`` moves the label up by that many pixels. With ``leader`` the
+    label sits ``leader`` pixels to the right instead, with a hairline back
+    to ``(x, y)``.
+    """
+    c = _palette(theme)
+    label = dict(x=x, y=y, text=f"  {text}", showarrow=False, xanchor="left",
+                 font=dict(family=SERIF, size=size, color=c["text"] if color is None else color))
+    if leader:
+        label.update(text=text, showarrow=True, arrowhead=0, arrowwidth=0.5,
+                     arrowcolor=c["axis"], standoff=2, ax=leader, ay=-shift)
+    elif shift:
+        label["yshift"] = shift
+    return label
+
+
+def direct_labels(x, y, texts, colors=None, theme="light", size=13, *, y_range,
+                  plot_height, gap=2, leader=24):
+    """``direct_label`` dicts for each ``(x[i], y[i])``, spread apart so none overlap.
+
+    Plotly places annotations in the browser, so the caller describes the
+    plot area: ``y_range`` is the (linear) y-axis range and ``plot_height``
+    the height in pixels between the top and bottom margins. If any label
+    has to move by more than half its height, all labels go ``leader``
+    pixels out and the moved ones get leader lines.
+    """
+    import numpy as np
+
+    from tufte.labels import shifts
+
+    y0, y1 = y_range
+    if y1 == y0:  # a flat series: Plotly centres it, so give the range a span of 1 around it
+        y0, y1 = y0 - 0.5, y0 + 0.5
+    scale = plot_height / (y1 - y0)
+    shift, moved = shifts((np.asarray(y, dtype=float) - y0) * scale, size * LINE_HEIGHT, gap,
+                          0, plot_height)
+    colors = [colors] * len(texts) if colors is None or isinstance(colors, str) else colors
+    if not moved.any():
+        return [direct_label(xi, yi, text, color, theme, size, round(dy, 1))
+                for xi, yi, text, color, dy in zip(x, y, texts, colors, shift.tolist())]
+    labels = []
+    for xi, yi, text, color, dy, m in zip(x, y, texts, colors, shift.tolist(), moved.tolist()):
+        label = direct_label(xi, yi, text, color, theme, size, round(dy, 1), leader if m else 0)
+        if not m:
+            label.update(text=text, xshift=leader)
+        labels.append(label)
+    return labels
+
+
+def point_annotation(x, y, text, theme="light", ax=0, ay=-30, size=12):
+    """Annotation dict pointing at a notable ``(x, y)`` with a thin leader line."""
+    c = _palette(theme)
+    return dict(x=x, y=y, text=text, showarrow=True, arrowhead=0, arrowwidth=0.5,
+                arrowcolor=c["axis"], ax=ax, ay=ay,
+                font=dict(family=SERIF, size=size, color=c["annotation"]))
+
+
+def add_annotations(fig, annotations):
+    """Append ``annotations`` to ``fig`` in one ``update_layout`` call; returns ``fig``."""
+    fig.update_layout(annotations=[*fig.layout.annotations, *annotations])
+    return fig
+
+
+def add_direct_labels(fig, traces, theme="light", size=13, gap=2, leader=24):
+    """Label each of ``traces`` at its last point, in one ``update_layout`` call.
+
+    ``traces`` are dicts with ``x``, ``y``, ``name`` and optional ``color``.
+    Labels are spread apart as in ``direct_labels``, for the figure's
+    height, margins and y range (the range of all its traces unless set).
+    """
+    import numpy as np
+
+    layout = fig.layout
+    y_range = layout.yaxis.range
+    if y_range is None:
+        ys = np.concatenate([np.asarray(t.y, dtype=float) for t in fig.data if t.y is not None]
+                            + [np.asarray(t["y"], dtype=float) for t in traces])
+        y_range = (np.nanmin(ys), np.nanmax(ys))
+    return add_annotations(fig, direct_labels(
+        [t["x"][-1] for t in traces], [t["y"][-1] for t in traces], [t["name"] for t in traces],
+        [t.get("color") for t in traces], theme, size, y_range=y_range,
+        plot_height=_plot_height(layout), gap=gap, leader=leader))
+
+
+def _plot_height(layout):
+    """Pixels between the top and bottom margins of ``layout`` (Plotly's defaults if unset)."""
+    height = layout.height or 450
+    for side, default in (("t", 100), ("b", 80)):
+        margin = layout.margin[side]
+        if margin is None:
+            margin = layout.template.layout.margin[side]
+        height -= default if margin is None else margin
+    return height
+
+
+def tufte_figure(data=(), theme="light", *, annotations=(), validate=True, **layout):
+    """Return a ``go.Figure`` with the Tufte template for ``theme``.
+
+    ``data`` is a list of trace dicts (with a ``type`` key) or trace objects,
+    ``annotations`` a list of annotation dicts, and ``layout`` any layout
+    properties, including magic underscores (``xaxis_range=...``). Everything
+    is passed to one constructor; ``validate=False`` skips Plotly's property
+    validation.
+    """
+    import plotly.graph_objects as go
+
+    layout["template"] = tufte_template(theme)
+    if annotations:
+        layout["annotations"] = list(annotations)
+    return go.Figure(data=list(data), layout=layout, _validate=validate)
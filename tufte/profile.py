@@ -0,0 +1,260 @@
+"""Opt-in profiling of chart rendering, phase by phase.
+
+A slow chart spends its time in one of a few places: preparing data
+(downsampling, layout of sparklines), creating artists (the helpers),
+``tight_layout``, measuring text, drawing and rasterizing, or encoding the
+PNG/GIF. Inside ``profiling()`` each of those is recorded as an event with
+its wall time, the change in resident memory and, for helpers and saves,
+how many artists exist afterwards:
+
+    with profiling("events.jsonl", trace="trace.json") as prof:
+        fig, ax = plt.subplots()
+        plot_line(ax, x, y)
+        tufte_axes(ax, x, y)
+        fig.savefig("chart.png")
+    print(format_summary(prof.events))
+
+Events are JSON lines; the optional trace is a Chrome trace (open it in
+``chrome://tracing`` or https://ui.perfetto.dev). While profiling,
+``Figure.tight_layout``, ``TufteLayout.execute``, ``Figure.draw``,
+``Figure.savefig``, Agg text measurement and ``matplotlib.image.imsave``
+are wrapped; text measurement is too frequent for one event per call, so
+each event carries the number and total time of the measurements made
+inside it instead. Helpers decorated with ``profiled`` record themselves.
+Outside ``profiling()`` nothing is patched and a decorated helper costs one
+global lookup.
+``python _docs/generate_showcase.py --profile events.jsonl`` profiles
+every showcase job and prints ``format_summary`` at the end.
+"""
+
+import functools
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+
+# Summary columns, in pipeline order; "other" is the job's own, unrecorded code.
+PHASES = ("data", "artists", "layout", "text", "draw", "encode", "savefig", "other")
+
+_active = None
+
+
+def rss_mb():
+    """Current resident set size in MB (peak RSS where that is unavailable)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+    except OSError:
+        import resource
+
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def _artist_count(obj):
+    """Number of artists under ``obj`` (an Axes or Figure), or None for anything else."""
+    findobj = getattr(obj, "findobj", None)
+    return len(findobj()) if findobj is not None and hasattr(obj, "get_children") else None
+
+
+class Profiler:
+    """Collects phase events for one ``job``; see ``profiling``."""
+
+    def __init__(self, job=None):
+        self.job = job
+        self.events = []
+        self._stack = []
+        # Wall-clock anchor, so events from several processes share one timeline
+        self._origin = time.time() - time.perf_counter()
+
+    @contextmanager
+    def phase(self, name, category, target=None, **args):
+        """Record the enclosed block as one event; ``target`` is counted for artists."""
+        frame = {"children": 0.0, "text_calls": 0, "text_seconds": 0.0, "own_text": 0.0}
+        self._stack.append(frame)
+        rss = rss_mb()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self._stack.pop()
+            if self._stack:
+                parent = self._stack[-1]
+                parent["children"] += seconds
+                parent["text_calls"] += frame["text_calls"]
+                parent["text_seconds"] += frame["text_seconds"]
+            after = rss_mb()
+            self.events.append({
+                "job": self.job, "phase": name, "category": category,
+                "time": round(self._origin + start, 6), "seconds": round(seconds, 6),
+                "self_seconds": round(seconds - frame["children"] - frame["own_text"], 6),
+                "depth": len(self._stack),
+                "rss_mb": round(after, 1), "rss_delta_mb": round(after - rss, 1),
+                "artists": _artist_count(target),
+                "text_calls": frame["text_calls"],
+                "text_seconds": round(frame["text_seconds"], 6),
+                "pid": os.getpid(), **args,
+            })
+
+    def count_text(self, seconds):
+        if self._stack:
+            frame = self._stack[-1]
+            frame["text_calls"] += 1
+            frame["text_seconds"] += seconds
+            frame["own_text"] += seconds
+
+
+def phase(name, category="data", target=None, **args):
+    """A context manager recording ``name`` when profiling, else a no-op."""
+    if _active is None:
+        return nullcontext()
+    return _active.phase(name, category, target, **args)
+
+
+def profiled(category):
+    """Decorate a helper so each call is a ``category`` event while profiling.
+
+    The helper's first argument, when it is an Axes or Figure, is the one
+    whose artists are counted.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return fn(*args, **kwargs)
+            target = args[0] if args else None
+            with _active.phase(fn.__qualname__, category, target):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def _hooks():
+    """``(owner, attribute, category)`` of every matplotlib call wrapped while profiling."""
+    import matplotlib.image
+    from matplotlib.figure import Figure
+
+    from tufte.layout import TufteLayout
+
+    return [(Figure, "tight_layout", "layout"), (TufteLayout, "execute", "layout"),
+            (Figure, "draw", "draw"), (Figure, "savefig", "savefig"),
+            (matplotlib.image, "imsave", "encode")]
+
+
+def _wrap(fn, name, category, prof):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        target = args[0] if args else None
+        with prof.phase(name, category, target):
+            return fn(*args, **kwargs)
+    return wrapper
+
+
+def _timed_text(fn, prof):
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            prof.count_text(time.perf_counter() - start)
+    return wrapper
+
+
+@contextmanager
+def profiling(events=None, trace=None, job=None):
+    """Profile the enclosed block; yields the ``Profiler``.
+
+    On exit the events are appended to the JSON-lines file ``events`` and
+    written as a Chrome trace to ``trace``, when given. Not reentrant, and
+    the matplotlib patches are process-wide: profile one thread at a time.
+    """
+    global _active
+
+    from matplotlib.backends.backend_agg import RendererAgg
+
+    if _active is not None:
+        raise RuntimeError("profiling() is already active")
+    prof = Profiler(job)
+    patched = []
+    for owner, attr, category in _hooks():
+        patched.append((owner, attr, getattr(owner, attr)))
+        setattr(owner, attr, _wrap(getattr(owner, attr), attr, category, prof))
+    measure = RendererAgg.get_text_width_height_descent
+    patched.append((RendererAgg, "get_text_width_height_descent", measure))
+    RendererAgg.get_text_width_height_descent = _timed_text(measure, prof)
+    _active = prof
+    try:
+        with prof.phase(job or "profile", "job"):
+            yield prof
+    finally:
+        _active = None
+        for owner, attr, original in patched:
+            setattr(owner, attr, original)
+        if events is not None:
+            write_events(events, prof.events)
+        if trace is not None:
+            write_trace(trace, prof.events)
+
+
+def write_events(path, events, mode="a"):
+    """Append ``events`` to ``path`` as JSON lines."""
+    with open(path, mode) as f:
+        for event in events:
+            f.write(json.dumps(event) + "\n")
+
+
+def write_trace(path, events):
+    """Write ``events`` as a Chrome trace: one row per process, one track per job."""
+    jobs = {}
+    trace = []
+    origin = min((e["time"] for e in events), default=0)
+    for e in events:
+        pid, tid = jobs.setdefault(e["job"], (e["pid"], len(jobs)))
+        args = {k: e[k] for k in ("artists", "rss_mb", "rss_delta_mb", "text_calls",
+                                  "text_seconds") if e.get(k) is not None}
+        trace.append({"name": e["phase"], "cat": e["category"], "ph": "X", "pid": pid,
+                      "tid": tid, "ts": (e["time"] - origin) * 1e6,
+                      "dur": e["seconds"] * 1e6, "args": args})
+    trace += [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+               "args": {"name": str(job)}} for job, (pid, tid) in jobs.items()]
+    with open(path, "w") as f:
+        json.dump({"traceEvents": trace, "displayTimeUnit": "ms"}, f)
+
+
+def summarize(events):
+    """Per-job totals: exclusive seconds per phase, text calls, artist count and memory growth.
+
+    Each phase column is time spent in that phase itself, not in phases
+    nested inside it (``draw`` inside ``savefig``, a helper inside a helper)
+    and not measuring text, so the columns add up to ``total``. ``other`` is
+    the job's own code outside any recorded phase: plain ``ax.plot`` calls,
+    figure creation and the like.
+    """
+    rows = {}
+    for e in events:
+        row = rows.setdefault(e["job"], {"job": e["job"], "total": 0.0, "text_calls": 0,
+                                         "n_artists": 0, "rss_delta_mb": 0.0,
+                                         **dict.fromkeys(PHASES, 0.0)})
+        if e["category"] == "job":
+            row.update(total=e["seconds"], other=e["self_seconds"], text=e["text_seconds"],
+                       text_calls=e["text_calls"], rss_delta_mb=e["rss_delta_mb"])
+        elif e["category"] in row:
+            row[e["category"]] += e["self_seconds"]
+        if e["category"] in ("draw", "savefig") and e["artists"]:
+            row["n_artists"] = max(row["n_artists"], e["artists"])
+    return list(rows.values())
+
+
+def format_summary(events):
+    """``summarize(events)`` as a fixed-width table, slowest job first."""
+    header = (f"  {'job':<30}{'total':>8}" + "".join(f"{p:>9}" for p in PHASES)
+              + f"{'texts':>8}{'n_artists':>10}{'+MB':>7}")
+    lines = [header]
+    for row in sorted(summarize(events), key=lambda r: -r["total"]):
+        lines.append(f"  {str(row['job']):<30}{row['total']:8.3f}"
+                     + "".join(f"{row[p]:9.3f}" for p in PHASES)
+                     + f"{row['text_calls']:8d}{row['n_artists']:10d}{row['rss_delta_mb']:7.1f}")
+    return "\n".join(lines)
@@ -0,0 +1,124 @@
+"""Plotly scatter traces that stay interactive at any point count.
+
+SVG ``go.Scatter`` puts one DOM node per marker; past ~50k points the
+browser stalls. ``scatter_trace`` picks the renderer from the point count:
+
+``svg``
+    ``go.Scatter`` below ``GL_THRESHOLD`` points.
+``gl``
+    ``go.Scattergl`` (WebGL) up to ``DENSITY_THRESHOLD`` points, with the
+    same marker and hover styling.
+``density``
+    Above that, a ``go.Heatmap`` of point counts binned in NumPy, shaded
+    from transparent to the series color; only the bins are sent to the
+    browser, so size no longer depends on the point count.
+
+``add_scatter`` adds the trace and the Tufte direct label at the group's
+median, identically in all three modes:
+
+    for name, g in groups.items():
+        add_scatter(fig, g["x"], g["y"], name, color=g["color"])
+"""
+
+import numpy as np
+
+GL_THRESHOLD = 10_000
+DENSITY_THRESHOLD = 500_000
+
+
+def scatter_mode(n, gl_threshold=None, density_threshold=None):
+    """Return ``"svg"``, ``"gl"`` or ``"density"`` for ``n`` points."""
+    gl_threshold = GL_THRESHOLD if gl_threshold is None else gl_threshold
+    density_threshold = DENSITY_THRESHOLD if density_threshold is None else density_threshold
+    if n > density_threshold:
+        return "density"
+    if n > gl_threshold:
+        return "gl"
+    return "svg"
+
+
+def _rgba(color, alpha):
+    """``color`` (hex, ``rgb(...)`` or a CSS color name) as an ``rgba(...)`` string."""
+    from plotly.colors import hex_to_rgb, unlabel_rgb
+
+    if color.startswith("#"):
+        if len(color) == 4:
+            color = "#" + "".join(c * 2 for c in color[1:])
+        r, g, b = hex_to_rgb(color[:7])
+    elif color.startswith("rgb"):
+        r, g, b = unlabel_rgb(color)[:3]
+    else:
+        try:
+            from matplotlib.colors import to_rgb
+        except ImportError:
+            raise ImportError(f"density scatter traces need matplotlib to read the color "
+                              f"{color!r}; pass a hex color or pip install matplotlib") from None
+        r, g, b = (255 * c for c in to_rgb(color))
+    return f"rgba({r:g},{g:g},{b:g},{alpha:g})"
+
+
+def binned_density(x, y, bins=(200, 150), range=None):
+    """Count points of ``(x, y)`` on a regular grid, ignoring non-finite points.
+
+    Returns ``(counts, x_centers, y_centers)`` with ``counts`` shaped
+    ``(len(y_centers), len(x_centers))`` as ``go.Heatmap`` expects.
+    ``range`` is ``((xmin, xmax), (ymin, ymax))``; pass the same one to
+    every group so their bins line up.
+    """
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    keep = np.isfinite(x) & np.isfinite(y)
+    if not keep.all():
+        x, y = x[keep], y[keep]
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=bins, range=range)
+    return (counts.T, (x_edges[:-1] + x_edges[1:]) / 2, (y_edges[:-1] + y_edges[1:]) / 2)
+
+
+def scatter_trace(x, y, name=None, *, color="#666", size=6, opacity=0.7, symbol="circle",
+                  hovertemplate=None, mode=None, gl_threshold=None, density_threshold=None,
+                  bins=(200, 150), range=None):
+    """Return a Tufte-styled scatter trace for ``(x, y)``, sized to the point count.
+
+    ``mode`` forces ``"svg"``, ``"gl"`` or ``"density"``; by default it
+    comes from ``scatter_mode``. ``hovertemplate`` applies to the marker
+    modes; density bins hover with their count.
+    """
+    import plotly.graph_objects as go
+
+    mode = mode or scatter_mode(len(x), gl_threshold, density_threshold)
+    if mode == "density":
+        counts, xc, yc = binned_density(x, y, bins, range)
+        # Log shading keeps sparse outliers visible next to dense cores.
+        z = np.where(counts > 0, np.log1p(counts), np.nan)
+        return go.Heatmap(
+            x=xc, y=yc, z=z, customdata=counts, name=name,
+            colorscale=[[0, _rgba(color, 0.15)], [1, _rgba(color, 0.9)]],
+            showscale=False, hoverongaps=False,
+            hovertemplate=f"%{{customdata:,.0f}} points<extra>{name or ''}</extra>",
+        )
+    trace = go.Scattergl if mode == "gl" else go.Scatter
+    return trace(
+        x=x, y=y, name=name, mode="markers",
+        marker=dict(color=color, size=size, opacity=opacity, symbol=symbol, line=dict(width=0)),
+        hovertemplate=hovertemplate or f"%{{x}}, %{{y}}<extra>{name or ''}</extra>",
+    )
+
+
+def add_scatter(fig, x, y, name=None, *, color="#666", label=True, **kwargs):
+    """Add ``scatter_trace(x, y, ...)`` to ``fig`` with a direct label at the median.
+
+    The thresholds apply per call; to give every group of a figure the same
+    renderer, pass ``mode=scatter_mode(total_points)``. Returns the mode used.
+    """
+    trace = scatter_trace(x, y, name, color=color, **kwargs)
+    fig.add_trace(trace)
+    if label and name is not None:
+        fig.add_annotation(
+            x=float(np.nanmedian(np.asarray(x, dtype=float))),
+            y=float(np.nanmedian(np.asarray(y, dtype=float))),
+            text=f"<b>{name}</b>", showarrow=False, xanchor="left", xshift=12,
+            font=dict(size=13, color=color),
+        )
+    if trace.type == "heatmap":
+        return "density"
+    return "gl" if trace.type == "scattergl" else "svg"
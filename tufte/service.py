@@ -0,0 +1,768 @@
+"""Local render service: Tufte charts from JSON specs, by warm worker processes.
+
+A standalone chart script pays interpreter start-up, the matplotlib (or
+Plotly) import and font lookup on every run, often a second or more before
+the first line is drawn. ``RenderPool`` keeps worker processes alive with
+matplotlib imported, ``TUFTE_RC`` applied and the font cache warm, so a
+chart costs only its own drawing and encoding:
+
+    with RenderPool(workers=4) as pool:
+        png, content_type = pool.render({"kind": "line", "title": "Revenue",
+                                         "x": [1, 2, 3], "series": [{"name": "A", "y": [4, 5, 7]}]})
+
+A spec is a JSON object with a ``kind`` (see ``CHARTS``) and optional
+``format`` (``png``, ``svg`` or ``pdf``; ``json`` or ``html`` for
+``plotly``), ``theme`` (``light`` or ``dark``), ``size`` in inches,
+``dpi`` (bounded by ``MAX_INCHES``, ``MAX_DPI`` and ``MAX_PIXELS``),
+``title`` and ``subtitle``. The pool accepts at most
+``workers + max_pending`` jobs at once and rejects the rest with ``Busy``
+instead of queueing without bound; a job running longer than its timeout
+has its worker killed and replaced and raises ``RenderTimeout``.
+
+An asyncio server can render in-process instead, on a bounded thread pool
+(``RenderThreads``) that never blocks the event loop; specs, limits and
+errors are the same:
+
+    png, content_type = await render(spec)
+
+The process pool is served over HTTP on localhost or a Unix socket:
+
+    python -m tufte.service serve --port 8765 -j 4
+    curl -s --data @spec.json localhost:8765/render -o chart.png
+    python -m tufte.service serve --socket /tmp/tufte.sock
+    python -m tufte.service render specs/*.json -o out/
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import queue
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import numpy as np
+
+from tufte.style import PALETTE, PALETTE_DARK, TUFTE_DARK_RC, TUFTE_RC
+
+CONTENT_TYPES = {
+    "png": "image/png",
+    "svg": "image/svg+xml",
+    "pdf": "application/pdf",
+    "json": "application/json",
+    "html": "text/html; charset=utf-8",
+}
+
+THEMES = {"light": (TUFTE_RC, PALETTE), "dark": (TUFTE_DARK_RC, PALETTE_DARK)}
+
+# Bounds on a spec's canvas: a worker allocates size * dpi pixels before drawing
+MAX_INCHES = 40
+MAX_DPI = 600
+MAX_PIXELS = 40_000_000
+
+
+class ServiceError(Exception):
+    """Base class for errors reported back to the caller of a render."""
+
+    status = 500
+
+
+class SpecError(ServiceError, ValueError):
+    """The spec is malformed or names an unknown chart, format or theme."""
+
+    status = 400
+
+
+class Busy(ServiceError):
+    """Every worker is busy and the pending queue is full; retry later."""
+
+    status = 503
+
+
+class RenderTimeout(ServiceError):
+    """The render took longer than its timeout; a worker process is replaced."""
+
+    status = 504
+
+
+# --- Charts ---------------------------------------------------------------------
+
+CHARTS = {}
+
+
+def chart(kind):
+    """Register ``fn(fig, spec, palette)`` as the matplotlib drawing code for ``kind``."""
+    def register(fn):
+        CHARTS[kind] = fn
+        return fn
+    return register
+
+
+def _titles(ax, spec, palette):
+    # Above the axes, left-aligned with it; bbox_inches="tight" keeps them in.
+    if spec.get("title"):
+        ax.text(0, 1.14 if spec.get("subtitle") else 1.06, spec["title"], transform=ax.transAxes,
+                fontsize=16, color=palette["text"], va="bottom")
+    if spec.get("subtitle"):
+        ax.text(0, 1.04, spec["subtitle"], transform=ax.transAxes,
+                fontsize=12, color=palette["text2"], va="bottom")
+
+
+@chart("line")
+def _line(fig, spec, palette):
+    from tufte.frame import tufte_axes
+
+    ax = fig.add_subplot()
+    series = spec["series"]
+    ys = [np.asarray(s["y"], dtype=float) for s in series]
+    xs = [np.asarray(s.get("x", spec.get("x", np.arange(len(y)))), dtype=float)
+          for s, y in zip(series, ys)]
+    for s, x, y in zip(series, xs, ys):
+        color = s.get("color") or (palette["highlight"] if s.get("highlight") else palette["gray"])
+        ax.plot(x, y, color=color, linewidth=2 if s.get("highlight") else 1.2,
+                linestyle=s.get("linestyle", "-"))
+        if s.get("name"):
+            ax.annotate(s["name"], xy=(x[-1], y[-1]), xytext=(6, 0), textcoords="offset points",
+                        fontsize=12, color=color, va="center")
+    tufte_axes(ax, tuple(xs), tuple(ys))
+    if "xlabels" in spec:
+        ax.set_xticks(xs[0][:len(spec["xlabels"])], spec["xlabels"])
+    if spec.get("ylabel"):
+        ax.set_ylabel(spec["ylabel"])
+    _titles(ax, spec, palette)
+
+
+@chart("bar")
+def _bar(fig, spec, palette):
+    ax = fig.add_subplot()
+    labels, values = list(spec["labels"]), np.asarray(spec["values"], dtype=float)
+    if spec.get("sort", True):
+        order = np.argsort(-values, kind="stable")
+        labels, values = [labels[i] for i in order], values[order]
+    highlight = spec.get("highlight", 0)
+    colors = [palette["highlight"] if i == highlight else palette["gray"]
+              for i in range(len(values))]
+    ax.barh(np.arange(len(values)), values, color=colors, height=0.55)
+    fmt = spec.get("fmt", "{:g}")
+    for i, value in enumerate(values):
+        ax.annotate(fmt.format(value), xy=(value, i), xytext=(4, 0), textcoords="offset points",
+                    va="center", fontsize=11, color=palette["text2"])
+    ax.set_yticks(np.arange(len(values)), labels)
+    ax.set_xticks([])
+    ax.tick_params(left=False, labelcolor=palette["text"])
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.invert_yaxis()
+    _titles(ax, spec, palette)
+
+
+@chart("slope")
+def _slope(fig, spec, palette):
+    from tufte.marks import direct_labels
+
+    ax = fig.add_subplot()
+    before = np.asarray(spec["before"], dtype=float)
+    after = np.asarray(spec["after"], dtype=float)
+    names = spec["labels"]
+    if not len(before) == len(after) == len(names):
+        raise SpecError(f"a slope chart needs as many 'before', 'after' and 'labels' entries; "
+                        f"got {len(before)}, {len(after)} and {len(names)}")
+    highlight = set(spec.get("highlight", []))
+    fmt = spec.get("fmt", "{:g}")
+    colors = [palette["highlight"] if i in highlight else palette["gray"]
+              for i in range(len(before))]
+    for i, (a, b, color) in enumerate(zip(before, after, colors)):
+        ax.plot([0, 1], [a, b], color=color, linewidth=2 if i in highlight else 1, marker="o",
+                markersize=4)
+    headers = spec.get("headers", ["", ""])
+    ax.set_xticks([0, 1], headers)
+    ax.xaxis.tick_top()
+    ax.tick_params(top=False, labelcolor=palette["text2"])
+    ax.set_yticks([])
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.set_xlim(-0.05, 1.05)
+    # Endpoints of converging lines crowd together; both columns are resolved.
+    direct_labels(ax, np.zeros(len(before)), before,
+                  [f"{name} {fmt.format(a)}" for name, a in zip(names, before)], colors,
+                  side="left", fontsize=11)
+    direct_labels(ax, np.ones(len(after)), after,
+                  [f"{fmt.format(b)} {name}" for name, b in zip(names, after)], colors,
+                  fontsize=11)
+    _titles(ax, spec, palette)
+
+
+@chart("sparklines")
+def _sparklines(fig, spec, palette):
+    from tufte.sparklines import sparklines
+
+    ax = fig.add_subplot()
+    sparklines(ax, np.asarray(spec["rows"], dtype=float), labels=spec.get("labels"),
+               color=palette["gray"], min_color=palette["highlight"], max_color=palette["cat"][0],
+               fmt=spec.get("fmt", "{:.1f}"),
+               label_kw=dict(fontsize=12, color=palette["text"]),
+               value_kw=dict(fontsize=10, color=palette["text2"]))
+    _titles(ax, spec, palette)
+
+
+@chart("table")
+def _table(fig, spec, palette):
+    from tufte.table import Table
+
+    table = Table(spec["rows"], spec.get("headers"), fontsize=11, color=palette["text"],
+                  header_color=palette["text2"], rule_color=palette["text"])
+    # The table sizes its own figure, so check the pixels it will need again
+    width, height = table.figure_size(len(table))
+    _check_pixels(width, height, _canvas(spec)[1])
+    fig.set_size_inches(width, height)
+    ax = fig.add_axes((0.5 / width, 0.5 / height, 1 - 1 / width, 1 - 1 / height))
+    table.draw(ax)
+    _titles(ax, spec, palette)
+
+
+def _plotly(spec, fmt):
+    from tufte.plotly_figure import tufte_figure
+
+    figure = spec["figure"]
+    fig = tufte_figure(figure.get("data", ()), spec.get("theme", "light"),
+                       validate=spec.get("validate", True), **figure.get("layout", {}))
+    if fmt == "json":
+        return fig.to_json().encode()
+    if fmt == "html":
+        # A fragment for an existing page that already loads plotly.js.
+        return fig.to_html(full_html=False, include_plotlyjs=False).encode()
+    return fig.to_image(format=fmt)  # needs kaleido
+
+
+def _canvas(spec):
+    """The spec's ``(size, dpi)``, checked against ``MAX_INCHES``, ``MAX_DPI`` and ``MAX_PIXELS``."""
+    size, dpi = spec.get("size", (8, 5)), spec.get("dpi", 100)
+    try:
+        width, height = (float(v) for v in size)
+        dpi = float(dpi)
+    except (TypeError, ValueError):
+        raise SpecError(f"size must be [width, height] in inches and dpi a number, "
+                        f"got {size!r} and {dpi!r}") from None
+    if not (0 < width <= MAX_INCHES and 0 < height <= MAX_INCHES):
+        raise SpecError(f"size must be within (0, {MAX_INCHES}] inches, got {size!r}")
+    if not 0 < dpi <= MAX_DPI:
+        raise SpecError(f"dpi must be within (0, {MAX_DPI}], got {dpi:g}")
+    _check_pixels(width, height, dpi)
+    return (width, height), dpi
+
+
+def _check_pixels(width, height, dpi):
+    if width * height * dpi**2 > MAX_PIXELS:
+        raise SpecError(f"a {width:g}x{height:g} in canvas at {dpi:g} dpi exceeds "
+                        f"{MAX_PIXELS:,} pixels")
+
+
+def render_spec(spec):
+    """Render ``spec`` in this process and return ``(data, content_type)``.
+
+    Raises ``SpecError`` for an invalid spec. The theme's rcParams are
+    applied per call with ``tufte.figures.themed``, so this is safe to call
+    from any thread.
+    """
+    from tufte.figures import render_figure
+
+    if not isinstance(spec, dict):
+        raise SpecError(f"a spec must be a JSON object, got {type(spec).__name__}")
+    kind = spec.get("kind")
+    fmt = spec.get("format", "json" if kind == "plotly" else "png")
+    theme = spec.get("theme", "light")
+    if theme not in THEMES:
+        raise SpecError(f"unknown theme {theme!r}; expected one of {sorted(THEMES)}")
+    if fmt not in CONTENT_TYPES:
+        raise SpecError(f"unknown format {fmt!r}; expected one of {sorted(CONTENT_TYPES)}")
+    try:
+        if kind == "plotly":
+            return _plotly(spec, fmt), CONTENT_TYPES[fmt]
+        if kind not in CHARTS:
+            raise SpecError(f"unknown chart kind {kind!r}; expected one of "
+                            f"{sorted([*CHARTS, 'plotly'])}")
+        if fmt not in ("png", "svg", "pdf"):
+            raise SpecError(f"{kind} charts render to png, svg or pdf, not {fmt!r}")
+        rc, palette = THEMES[theme]
+        size, dpi = _canvas(spec)
+        data = render_figure(lambda fig: CHARTS[kind](fig, spec, palette), rc, fmt, size, dpi)
+    except (KeyError, TypeError, ValueError) as exc:
+        if isinstance(exc, SpecError):
+            raise
+        raise SpecError(f"invalid {kind} spec: {type(exc).__name__}: {exc}") from exc
+    return data, CONTENT_TYPES[fmt]
+
+
+def _render_reporting(spec):
+    """``render_spec``, with a bug in drawing code reported as a ``ServiceError``."""
+    try:
+        return render_spec(spec)
+    except ServiceError:
+        raise
+    except Exception as exc:
+        raise ServiceError(f"{type(exc).__name__}: {exc}") from exc
+
+
+# --- Worker pool ----------------------------------------------------------------
+
+def _warm_up(rc):
+    import matplotlib
+
+    matplotlib.use("Agg")
+    matplotlib.rcParams.update(rc)
+    # Resolve fonts and fill the glyph caches before the first real job.
+    render_spec({"kind": "line", "title": "warm-up", "x": [0, 1], "series": [{"name": "a", "y": [0, 1]}]})
+    try:
+        import plotly.graph_objects  # noqa: F401
+    except ImportError:
+        pass
+
+
+def _worker(conn, rc):
+    """Worker process loop: receive a spec, send back ``("ok", data, type)`` or an error."""
+    _warm_up(rc)
+    conn.send(("ready",))
+    while True:
+        try:
+            spec = conn.recv()
+        except EOFError:
+            return
+        if spec is None:
+            return
+        try:
+            # A bug in drawing code must not kill the worker
+            conn.send(("ok", *_render_reporting(spec)))
+        except ServiceError as exc:
+            conn.send(("error", type(exc).__name__, str(exc)))
+
+
+class _Worker:
+    def __init__(self, ctx, rc):
+        self.conn, child = ctx.Pipe()
+        self.process = ctx.Process(target=_worker, args=(child, rc), daemon=True)
+        self.process.start()
+        child.close()
+
+    def wait_ready(self):
+        try:
+            return self.conn.recv()
+        except EOFError:
+            self.process.join()
+            raise ServiceError(f"worker exited during start-up "
+                               f"(exit code {self.process.exitcode})") from None
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+
+
+class RenderPool:
+    """Warm worker processes that render specs; safe to call from many threads.
+
+    ``render`` blocks until a worker is free. At most ``workers + max_pending``
+    renders may be in flight or waiting; beyond that ``render`` raises
+    ``Busy`` at once, so callers see backpressure instead of growing
+    latency. ``timeout`` (seconds) bounds each render.
+    """
+
+    def __init__(self, workers=None, max_pending=None, timeout=30.0, rc=TUFTE_RC):
+        import multiprocessing
+
+        self.workers = workers or os.cpu_count() or 1
+        self.max_pending = 4 * self.workers if max_pending is None else max_pending
+        self.timeout = timeout
+        self._rc = rc
+        # Workers import matplotlib themselves; never fork a threaded server.
+        self._ctx = multiprocessing.get_context("spawn")
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+        self._idle = queue.Queue()
+        self._lock = threading.Lock()
+        self._all = []
+        self.stats = {"rendered": 0, "failed": 0, "rejected": 0, "timed_out": 0}
+        started = [self._spawn() for _ in range(self.workers)]
+        for w in started:
+            w.wait_ready()
+            self._idle.put(w)
+
+    def _spawn(self):
+        w = _Worker(self._ctx, self._rc)
+        with self._lock:
+            self._all.append(w)
+        return w
+
+    def _start(self):
+        w = self._spawn()
+        try:
+            w.wait_ready()
+        except ServiceError:
+            self._retire(w)
+            raise
+        return w
+
+    def _retire(self, w):
+        w.kill()
+        with self._lock:
+            self._all.remove(w)
+
+    def _replace(self, w):
+        """Kill ``w`` and start a new worker, or return None if it fails to start.
+
+        None takes the dead worker's place in ``_idle``; the next render to
+        get it starts a worker again.
+        """
+        self._retire(w)
+        try:
+            return self._start()
+        except ServiceError:
+            return None
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def render(self, spec, timeout=None):
+        """Render ``spec`` on a worker and return ``(data, content_type)``."""
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise Busy(f"{self.workers} workers busy and {self.max_pending} renders queued")
+        try:
+            w = self._idle.get()
+            try:
+                if w is None:
+                    w = self._start()
+                w.conn.send(spec)
+                if not w.conn.poll(self.timeout if timeout is None else timeout):
+                    self._count("timed_out")
+                    w = self._replace(w)
+                    raise RenderTimeout(f"render took longer than "
+                                        f"{self.timeout if timeout is None else timeout:g}s")
+                reply = w.conn.recv()
+            except (EOFError, OSError) as exc:
+                self._count("failed")
+                w = self._replace(w)
+                raise ServiceError(f"worker died: {exc}") from exc
+            finally:
+                self._idle.put(w)
+        finally:
+            self._slots.release()
+        if reply[0] == "ok":
+            self._count("rendered")
+            return reply[1], reply[2]
+        self._count("failed")
+        raise {"SpecError": SpecError}.get(reply[1], ServiceError)(reply[2])
+
+    def status(self):
+        """Counters plus the number of idle workers, for health checks."""
+        with self._lock:
+            return {"workers": self.workers, "idle": self._idle.qsize(),
+                    "max_pending": self.max_pending, **self.stats}
+
+    def close(self):
+        with self._lock:
+            workers, self._all = self._all, []
+        for w in workers:
+            try:
+                w.conn.send(None)
+            except OSError:
+                pass
+            w.process.join(timeout=1)
+            if w.process.is_alive():
+                w.kill()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class RenderThreads:
+    """Renders specs on a bounded pool of threads in this process.
+
+    The in-process counterpart of ``RenderPool``, with the same ``render``,
+    ``status`` and ``Busy`` backpressure: nothing to spawn or warm up, and
+    no pickling of specs and results, but the drawing of two charts does
+    not overlap (see ``tufte.figures``). A thread cannot be killed, so a
+    render past its timeout raises ``RenderTimeout`` and keeps its slot
+    until it finishes.
+    """
+
+    def __init__(self, workers=None, max_pending=None):
+        self.workers = workers or min(os.cpu_count() or 1, 4)
+        self.max_pending = 4 * self.workers if max_pending is None else max_pending
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_pending)
+        self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix="tufte-render")
+        self._lock = threading.Lock()
+        self.stats = {"rendered": 0, "failed": 0, "rejected": 0, "timed_out": 0}
+        self._running = 0
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _run(self, spec):
+        with self._lock:
+            self._running += 1
+        try:
+            result = _render_reporting(spec)
+        except ServiceError:
+            self._count("failed")
+            raise
+        finally:
+            with self._lock:
+                self._running -= 1
+        self._count("rendered")
+        return result
+
+    def submit(self, spec):
+        """Start rendering ``spec``; returns a ``concurrent.futures.Future``.
+
+        Raises ``Busy`` at once when ``workers + max_pending`` renders are
+        already running or waiting.
+        """
+        if not self._slots.acquire(blocking=False):
+            self._count("rejected")
+            raise Busy(f"{self.workers} threads busy and {self.max_pending} renders queued")
+        try:
+            future = self._executor.submit(self._run, spec)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return future
+
+    def render(self, spec, timeout=None):
+        """Render ``spec`` and return ``(data, content_type)``, blocking this thread."""
+        try:
+            return self.submit(spec).result(timeout)
+        except FutureTimeout:
+            self._count("timed_out")
+            raise RenderTimeout(f"render took longer than {timeout:g}s") from None
+
+    async def render_async(self, spec, timeout=None):
+        """``render`` as a coroutine: the event loop keeps serving while it runs."""
+        future = asyncio.wrap_future(self.submit(spec))
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self._count("timed_out")
+            raise RenderTimeout(f"render took longer than {timeout:g}s") from None
+
+    def status(self):
+        """Counters plus the number of idle threads, for health checks."""
+        with self._lock:
+            idle = self.workers - min(self._running, self.workers)
+            return {"workers": self.workers, "idle": idle, "max_pending": self.max_pending,
+                    **self.stats}
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+_threads = None
+_threads_lock = threading.Lock()
+
+
+async def render(spec, timeout=None, threads=None):
+    """Render ``spec`` off the event loop and return ``(data, content_type)``.
+
+    Runs on ``threads`` (a ``RenderThreads``), by default one shared pool
+    created on first use. Raises ``Busy`` when that pool is full, so a
+    server can answer 503 rather than queue without bound:
+
+        png, content_type = await render({"kind": "bar", "labels": ["A", "B"],
+                                          "values": [3, 5]})
+    """
+    global _threads
+
+    if threads is None:
+        with _threads_lock:
+            if _threads is None:
+                _threads = RenderThreads()
+            threads = _threads
+    return await threads.render_async(spec, timeout)
+
+
+# --- HTTP API -------------------------------------------------------------------
+
+MAX_BODY = 32 * 2**20
+
+
+def make_handler(pool):
+    """Return a request handler class serving ``POST /render`` and ``GET /health``."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def _send(self, status, body, content_type="application/json", headers=()):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _error(self, status, message, headers=()):
+            self._send(status, json.dumps({"error": message}).encode(), headers=headers)
+
+        def do_GET(self):
+            if self.path == "/health":
+                self._send(200, json.dumps(pool.status()).encode())
+            else:
+                self._error(404, f"no such endpoint {self.path}")
+
+        def do_POST(self):
+            if self.path != "/render":
+                return self._error(404, f"no such endpoint {self.path}")
+            length = self.headers.get("Content-Length")
+            if length is None:
+                self.close_connection = True
+                return self._error(411, "Content-Length required")
+            if not length.strip().isdigit():
+                self.close_connection = True
+                return self._error(400, f"invalid Content-Length {length!r}")
+            length = int(length)
+            if length > MAX_BODY:
+                self.close_connection = True
+                return self._error(413, f"spec larger than {MAX_BODY} bytes")
+            try:
+                spec = json.loads(self.rfile.read(length))
+            except ValueError as exc:
+                return self._error(400, f"invalid JSON: {exc}")
+            try:
+                data, content_type = pool.render(spec)
+            except Busy as exc:
+                return self._error(exc.status, str(exc), headers=[("Retry-After", "1")])
+            except ServiceError as exc:
+                return self._error(exc.status, str(exc))
+            self._send(200, data, content_type)
+
+        def address_string(self):
+            # Unix-socket clients have no (host, port) address.
+            return self.client_address[0] if self.client_address else "unix"
+
+        def log_message(self, format, *args):
+            if self.server.verbose:
+                super().log_message(format, *args)
+
+    return Handler
+
+
+class _UnixHTTPServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ()
+
+
+def make_server(pool, host="127.0.0.1", port=8765, socket_path=None, verbose=False):
+    """Return an HTTP server for ``pool`` on ``host:port``, or on ``socket_path``."""
+    handler = make_handler(pool)
+    if socket_path is not None:
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server = _UnixHTTPServer(os.fspath(socket_path), handler)
+    else:
+        server = ThreadingHTTPServer((host, port), handler)
+        server.daemon_threads = True
+    server.verbose = verbose
+    return server
+
+
+# --- Command line ---------------------------------------------------------------
+
+def _load_specs(paths):
+    """``(file name, spec)`` pairs; a spec's ``output`` is reduced to its file name."""
+    for path in paths:
+        specs = json.loads(Path(path).read_text())
+        for i, spec in enumerate(specs if isinstance(specs, list) else [specs]):
+            if not isinstance(spec, dict):
+                raise SpecError(f"{path}: a spec must be a JSON object, got {type(spec).__name__}")
+            name = Path(path).stem if not isinstance(specs, list) else f"{Path(path).stem}-{i}"
+            # Never write outside --out-dir, whatever the spec says
+            output = Path(str(spec.get("output") or "")).name
+            yield output or f"{name}.{spec.get('format', 'png')}", spec
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m tufte.service",
+                                     description="Render Tufte charts from JSON specs.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    serve = commands.add_parser("serve", help="serve POST /render over HTTP")
+    serve.add_argument("--host", default="127.0.0.1", help="bind address (default: %(default)s)")
+    serve.add_argument("--port", type=int, default=8765, help="TCP port (default: %(default)s)")
+    serve.add_argument("--socket", metavar="PATH", help="serve on a Unix socket instead of TCP")
+    serve.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    render = commands.add_parser("render", help="render spec files and exit")
+    render.add_argument("specs", nargs="+", metavar="SPEC",
+                        help="JSON file holding one spec or a list of specs")
+    render.add_argument("-o", "--out-dir", type=Path, default=Path("."),
+                        help="output directory (default: current directory)")
+    for sub in (serve, render):
+        sub.add_argument("-j", "--jobs", type=int, default=os.cpu_count(),
+                         help="worker processes (default: all cores)")
+        sub.add_argument("--timeout", type=float, default=30.0,
+                         help="seconds before a render is abandoned (default: %(default)s)")
+    serve.add_argument("--max-pending", type=int, default=None,
+                       help="renders queued beyond the busy workers before "
+                            "rejecting with 503 (default: 4 per worker)")
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        start = time.perf_counter()
+        with RenderPool(args.jobs, args.max_pending, args.timeout) as pool:
+            server = make_server(pool, args.host, args.port, args.socket, args.verbose)
+            where = args.socket or f"http://{args.host}:{server.server_address[1]}"
+            print(f"{args.jobs} workers ready in {time.perf_counter() - start:.2f}s; "
+                  f"serving on {where}", file=sys.stderr)
+            try:
+                server.serve_forever()
+            except KeyboardInterrupt:
+                pass
+            finally:
+                server.server_close()
+                if args.socket:
+                    os.unlink(args.socket)
+        return 0
+
+    try:
+        jobs = list(_load_specs(args.specs))
+    except (OSError, ValueError) as exc:  # SpecError and bad JSON are ValueErrors
+        print(f"cannot load specs: {exc}", file=sys.stderr)
+        return 2
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+    failed = 0
+    with RenderPool(args.jobs, len(jobs), args.timeout) as pool, \
+            ThreadPoolExecutor(max_workers=args.jobs) as threads:
+        def run(job):
+            start = time.perf_counter()
+            data, _ = pool.render(job[1])
+            (args.out_dir / job[0]).write_bytes(data)
+            return time.perf_counter() - start
+
+        for (name, _), future in zip(jobs, [threads.submit(run, job) for job in jobs]):
+            try:
+                print(f"  {name:<32} {future.result() * 1000:7.1f}ms")
+            except ServiceError as exc:
+                failed += 1
+                print(f"  {name:<32} failed: {exc}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,334 @@
+"""Chart data read in chunks from Parquet, Arrow and memory-mapped ``.npy`` files.
+
+A range-frame line chart needs the data bounds, a few extremes and about
+four points per pixel column. None of that needs the whole file in memory,
+so a telemetry file far larger than RAM still makes a chart. A ``Source``
+reads only the columns a reduction asks for, ``chunk_rows`` rows at a time:
+
+    src = open_source("telemetry.parquet")
+    line, = plot_source(ax, src, "t", "p99", color=PALETTE["highlight"])
+    tufte_axes(ax, *line.get_data())        # the reduced line keeps the data bounds
+    _, (t_peak, worst) = src.extremes("p99", x="t")
+    fig.update_yaxes(range=padded_range(*src.bounds("p50", "p99")))    # Plotly
+
+Sources, and how their chunks are read:
+
+``.npy``, or a directory of ``.npy`` files (one column each, named by stem)
+    ``np.load(mmap_mode="r")``; chunks are views of the map. A structured
+    ``.npy`` has one column per field.
+``.arrow`` / ``.feather`` (Arrow IPC)
+    memory-mapped; record batches reference the map without copying.
+``.parquet``
+    decoded one batch at a time. Integer and timestamp bounds come from
+    the row-group statistics, without reading the column.
+An Arrow table, a structured array, a DataFrame or a mapping of name -> array
+    already in hand (``np.memmap``, ndarray, pandas Series), sliced in place.
+
+Arrow nulls read as NaN. ``bounds`` and ``extremes`` ignore NaN and +/-inf,
+like ``tufte.frame.data_bounds``. ``downsample`` runs the ``m4`` or
+``minmax`` reducer of ``tufte.downsample`` in one pass: their buckets are
+equal spans of x, so a chunk needs only the bucket edges, which come from
+the x bounds. ``lttb`` picks each point against the next bucket and is not
+offered. ``x`` must be sorted ascending.
+"""
+
+import os
+from pathlib import Path
+
+import numpy as np
+
+from tufte.downsample import _as_float, _bucket_arg, pixel_width
+from tufte.frame import data_bounds
+from tufte.profile import profiled
+
+CHUNK_ROWS = 1 << 20
+METHODS = ("m4", "minmax")
+
+
+class Source:
+    """Named columns of equal length, read in chunks; build one with ``open_source``.
+
+    ``read(names, rows)`` yields one list of NumPy arrays (one per name) per
+    chunk of at most ``rows`` rows. ``stats(name)`` returns the column's
+    ``(min, max)`` without reading it, or None.
+    """
+
+    def __init__(self, columns, length, read, chunk_rows=CHUNK_ROWS, stats=None):
+        self.columns = list(columns)
+        self.chunk_rows = chunk_rows
+        self._length = length
+        self._read = read
+        self._stats = stats or (lambda name: None)
+
+    def __len__(self):
+        return self._length
+
+    def __repr__(self):
+        return f"Source({len(self):,} rows: {', '.join(self.columns)})"
+
+    def chunks(self, *columns):
+        """Yield ``(start, arrays)``: the first row of each chunk and one array per column."""
+        missing = [c for c in columns if c not in self.columns]
+        if missing:
+            raise KeyError(f"no column {missing[0]!r}; have {', '.join(self.columns)}")
+        start = 0
+        for arrays in self._read(list(columns), self.chunk_rows):
+            yield start, arrays
+            start += len(arrays[0])
+
+    @profiled("data")
+    def bounds(self, *columns):
+        """``(min, max)`` across ``columns``, in one pass over those without statistics."""
+        found, scan = [], []
+        for name in columns:
+            stats = self._stats(name)
+            if stats is None:
+                scan.append(name)
+            else:
+                found.append(stats)
+        if scan:
+            for _, arrays in self.chunks(*scan):
+                try:
+                    found.append(data_bounds(*arrays))
+                except ValueError:
+                    continue
+        if not found:
+            raise ValueError("no finite values to frame")
+        return min(lo for lo, _ in found), max(hi for _, hi in found)
+
+    @profiled("data")
+    def extremes(self, y, x=None):
+        """``((x, min), (x, max))`` of column ``y``, at the first occurrence of each.
+
+        ``x`` is the column to report the position in; by default the row number.
+        """
+        best = [None, None]
+        for start, arrays in self.chunks(*([y] if x is None else [y, x])):
+            values = _as_float(arrays[0])
+            finite = np.isfinite(values)
+            if finite.all():
+                picks = np.argmin(values), np.argmax(values)
+            else:
+                keep = np.flatnonzero(finite)
+                if not keep.size:
+                    continue
+                picks = keep[np.argmin(values[keep])], keep[np.argmax(values[keep])]
+            for k, (i, better) in enumerate(zip(picks, (np.less, np.greater))):
+                if best[k] is None or better(values[i], best[k][0]):
+                    at = start + int(i) if x is None else arrays[1][i]
+                    best[k] = (values[i], at, arrays[0][i])
+        if best[0] is None:
+            raise ValueError(f"no finite values in {y!r}")
+        return tuple((at, value) for _, at, value in best)
+
+    @profiled("data")
+    def downsample(self, x, y, n, method="m4"):
+        """``(x, y)`` arrays reduced to ``n`` x-buckets, in one pass; see the module docstring.
+
+        ``x`` is a column name, or None for the row number. ``y`` is a column
+        name, or a list of names to reduce in the same pass, which returns a
+        list of ``(x, y)`` pairs.
+        """
+        if method not in METHODS:
+            raise ValueError(f"unknown method {method!r}; choose from {', '.join(METHODS)}")
+        names = [y] if isinstance(y, str) else list(y)
+        lo, hi = (0, len(self) - 1) if x is None else self.bounds(x)
+        # Interior bucket edges: bucket k holds edge[k - 1] <= x < edge[k]
+        edges = np.linspace(_as_float(lo), _as_float(hi), n + 1)[1:-1]
+        picks = [_Picks(n) for _ in names]
+        for start, arrays in self.chunks(*(names if x is None else [x, *names])):
+            if x is None:
+                xs, ys = np.arange(start, start + len(arrays[0])), arrays
+            else:
+                xs, ys = arrays[0], arrays[1:]
+            # x is sorted, so each bucket is one run of the chunk: find where the
+            # edges fall in it rather than which bucket each row falls in
+            xf = _as_float(xs)
+            first, last = np.searchsorted(edges, xf[[0, -1]], side="right")
+            starts = np.append(0, np.searchsorted(xf, edges[first:last], side="left"))
+            ids = np.arange(first, last + 1)
+            for pick, values in zip(picks, ys):
+                pick.add(start, xs, values, starts, ids)
+        out = [pick.result(method) for pick in picks]
+        return out[0] if isinstance(y, str) else out
+
+
+class _Picks:
+    """First, last, min and max point of each bucket of one series, merged chunk by chunk."""
+
+    KINDS = ("first", "last", "min", "max")
+
+    def __init__(self, n):
+        self.row = {kind: np.full(n, -1, dtype=np.int64) for kind in self.KINDS}
+        self.key = {kind: np.empty(n) for kind in ("min", "max")}
+        self.x = self.y = None
+        self.n = n
+
+    def add(self, start, xs, values, starts, ids):
+        """Merge a chunk whose bucket ``ids[k]`` starts at row ``starts[k]`` of it."""
+        key = _as_float(values)
+        rows = None
+        finite = np.isfinite(key)
+        if not finite.all():
+            rows = np.flatnonzero(finite)
+            xs, values, key = xs[rows], values[rows], key[rows]
+            starts = np.searchsorted(rows, starts, side="left")
+        if not len(key):
+            return
+        if self.x is None:
+            self.x = {kind: np.empty(self.n, dtype=xs.dtype) for kind in self.KINDS}
+            self.y = {kind: np.empty(self.n, dtype=values.dtype) for kind in self.KINDS}
+        counts = np.diff(np.append(starts, len(key)))
+        starts, ids, counts = starts[counts > 0], ids[counts > 0], counts[counts > 0]
+        new = self.row["first"][ids] < 0
+        local = {"first": (starts, new),
+                 "last": (starts + counts - 1, np.ones(len(ids), dtype=bool))}
+        for kind, reduce, better in (("min", np.minimum, np.less),
+                                     ("max", np.maximum, np.greater)):
+            at = _bucket_arg(key, starts, counts, reduce)
+            local[kind] = (at, new | better(key[at], self.key[kind][ids]))
+            self.key[kind][ids[local[kind][1]]] = key[at[local[kind][1]]]
+        for kind, (at, take) in local.items():
+            b, at = ids[take], at[take]
+            self.row[kind][b] = start + (at if rows is None else rows[at])
+            self.x[kind][b] = xs[at]
+            self.y[kind][b] = values[at]
+
+    def result(self, method):
+        used = np.flatnonzero(self.row["first"] >= 0)
+        if not used.size:
+            raise ValueError("no finite values to downsample")
+        if method == "m4":
+            sel = [(kind, used) for kind in self.KINDS]
+        else:
+            sel = [("first", used[:1]), ("last", used[-1:]), ("min", used), ("max", used)]
+        rows = np.concatenate([self.row[kind][b] for kind, b in sel])
+        _, at = np.unique(rows, return_index=True)
+        return (np.concatenate([self.x[kind][b] for kind, b in sel])[at],
+                np.concatenate([self.y[kind][b] for kind, b in sel])[at])
+
+
+def open_source(data, chunk_rows=CHUNK_ROWS):
+    """A ``Source`` over a file path or in-memory columns; see the module docstring."""
+    if isinstance(data, Source):
+        return data
+    if isinstance(data, (str, os.PathLike)):
+        return _open_path(Path(data), chunk_rows)
+    if type(data).__module__.startswith("pyarrow"):
+        return _arrow_source(data, chunk_rows)
+    if isinstance(data, np.ndarray) and data.dtype.names:
+        return _numpy_source({name: data[name] for name in data.dtype.names}, chunk_rows)
+    if hasattr(data, "keys"):
+        return _numpy_source({name: data[name] for name in data.keys()}, chunk_rows)
+    raise TypeError(f"cannot read columns from {type(data).__name__}")
+
+
+def _open_path(path, chunk_rows):
+    if path.is_dir():
+        files = sorted(path.glob("*.npy"))
+        if not files:
+            raise ValueError(f"no .npy files in {path}")
+        return _numpy_source({f.stem: np.load(f, mmap_mode="r") for f in files}, chunk_rows)
+    suffix = path.suffix.lower()
+    if suffix == ".npy":
+        a = np.load(path, mmap_mode="r")
+        if a.dtype.names:
+            return _numpy_source({name: a[name] for name in a.dtype.names}, chunk_rows)
+        return _numpy_source({path.stem: a}, chunk_rows)
+    if suffix in (".parquet", ".pq"):
+        return _parquet_source(path, chunk_rows)
+    if suffix in (".arrow", ".feather", ".ipc", ".arrows"):
+        import pyarrow as pa
+
+        mapped = pa.memory_map(str(path), "r")
+        try:
+            table = pa.ipc.open_file(mapped).read_all()
+        except pa.ArrowInvalid:
+            mapped.seek(0)
+            table = pa.ipc.open_stream(mapped).read_all()
+        return _arrow_source(table, chunk_rows)
+    raise ValueError(f"cannot read {path.name}: expected .npy, .parquet, .arrow or .feather")
+
+
+def _numpy_source(columns, chunk_rows):
+    columns = {name: np.asarray(a) for name, a in columns.items()}
+    lengths = {len(a) for a in columns.values()}
+    if len(lengths) > 1:
+        raise ValueError(f"columns differ in length: {sorted(lengths)}")
+    for name, a in columns.items():
+        if a.ndim != 1:
+            raise ValueError(f"column {name!r} has shape {a.shape}; expected one dimension")
+    length = lengths.pop() if lengths else 0
+
+    def read(names, rows):
+        for start in range(0, length, rows):
+            yield [columns[name][start:start + rows] for name in names]
+    return Source(columns, length, read, chunk_rows)
+
+
+def _arrow_numpy(array):
+    # Zero-copy for null-free numeric and timestamp columns; nulls become NaN.
+    return array.to_numpy(zero_copy_only=False)
+
+
+def _arrow_source(table, chunk_rows):
+    import pyarrow as pa
+
+    if isinstance(table, pa.RecordBatch):
+        table = pa.Table.from_batches([table])
+    if not isinstance(table, pa.Table):
+        raise TypeError(f"cannot read columns from {type(table).__name__}")
+
+    def read(names, rows):
+        for batch in table.select(names).to_batches(max_chunksize=rows):
+            yield [_arrow_numpy(batch.column(i)) for i in range(len(names))]
+    return Source(table.column_names, table.num_rows, read, chunk_rows)
+
+
+def _parquet_source(path, chunk_rows):
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    file = pq.ParquetFile(path, memory_map=True)
+    schema = file.schema_arrow
+    meta = file.metadata
+
+    def read(names, rows):
+        for batch in file.iter_batches(batch_size=rows, columns=names):
+            yield [_arrow_numpy(batch.column(name)) for name in names]
+
+    def stats(name):
+        # Float statistics may hold NaN or inf, so only integers and dates qualify
+        kind = schema.field(name).type
+        if not (pa.types.is_integer(kind) or pa.types.is_timestamp(kind)
+                or pa.types.is_date(kind)):
+            return None
+        j = schema.get_field_index(name)
+        if meta.schema.column(j).path != name:
+            return None
+        lows, highs = [], []
+        for i in range(meta.num_row_groups):
+            column = meta.row_group(i).column(j)
+            stats = column.statistics
+            if stats is not None and stats.has_min_max:
+                lows.append(stats.min)
+                highs.append(stats.max)
+            elif stats is None or stats.null_count != column.num_values:
+                return None
+        if not lows:
+            return None
+        lo, hi = pa.array([min(lows), max(highs)], type=kind).to_numpy(zero_copy_only=False)
+        return lo, hi
+    return Source(schema.names, meta.num_rows, read, chunk_rows, stats)
+
+
+@profiled("artists")
+def plot_source(ax, source, x, y, *args, method="m4", n=None, **kwargs):
+    """``tufte.downsample.plot_line`` for a ``Source``: one chunked pass, then ``ax.plot``.
+
+    ``source`` is a ``Source`` or anything ``open_source`` accepts. ``m4``
+    keeps the first and last point and the extremes, so ``tufte_axes`` on
+    the plotted line frames the full data.
+    """
+    xs, ys = open_source(source).downsample(x, y, n or pixel_width(ax), method)
+    return ax.plot(xs, ys, *args, **kwargs)
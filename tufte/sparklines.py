@@ -0,0 +1,145 @@
+"""Batch sparklines: many metrics in one Axes.
+
+One Axes per sparkline, with three ``ax.plot`` calls for the min, max and end
+dots, costs thousands of artists for a KPI wall. ``sparklines`` takes a 2-D
+``(metrics, time)`` array instead. Per-row extremes come from one vectorized
+pass, every line goes into a single ``LineCollection``, and every marker of
+a role (min, max, end) goes into a single ``scatter``. That is five artists
+plus optional text, whatever the number of metrics:
+
+    fig, ax = plt.subplots(figsize=(8, 40))
+    sparklines(ax, kpis, labels=kpi_names, columns=4)
+"""
+
+import numpy as np
+
+from tufte.profile import profiled
+
+
+def sparkline_stats(data):
+    """Return per-row ``argmin``, ``argmax``, ``min``, ``max`` and ``last`` of ``data``.
+
+    ``data`` is a ``(metrics, time)`` array; NaN values are ignored when
+    locating extremes. Each entry of the returned dict is a 1-D array.
+    """
+    a = np.asarray(data, dtype=float)
+    if a.ndim != 2:
+        raise ValueError(f"expected a (metrics, time) array, got shape {a.shape}")
+    imin = np.nanargmin(a, axis=1)
+    imax = np.nanargmax(a, axis=1)
+    rows = np.arange(a.shape[0])
+    return {
+        "argmin": imin,
+        "argmax": imax,
+        "min": a[rows, imin],
+        "max": a[rows, imax],
+        "last": a[:, -1],
+    }
+
+
+@profiled("data")
+def sparkline_layout(data, columns=1, pad=0.2, gap=0.6):
+    """Place each row of ``data`` in its own cell of one shared coordinate space.
+
+    Metric ``k`` goes to column ``k // rows_per_column`` and row
+    ``k % rows_per_column`` (top to bottom). Each cell is ``time - 1`` units
+    wide and 1 unit tall; ``pad`` is the fraction of a cell's height left
+    above and below its line, ``gap`` the space between columns as a
+    fraction of the cell width.
+
+    Returns ``(xy, stats, origins)``: an ``(metrics, time, 2)`` array of
+    vertices, ``sparkline_stats(data)``, and the ``(x, y)`` lower-left corner
+    of every cell.
+    """
+    a = np.asarray(data, dtype=float)
+    stats = sparkline_stats(a)
+    n, length = a.shape
+    per_column = -(-n // columns)
+    width = max(length - 1, 1)
+
+    k = np.arange(n)
+    x0 = (k // per_column) * width * (1 + gap)
+    y0 = (per_column - 1 - k % per_column).astype(float)
+
+    span = stats["max"] - stats["min"]
+    scale = np.divide(1 - 2 * pad, span, out=np.zeros_like(span), where=span > 0)
+    norm = np.where(span[:, None] > 0, (a - stats["min"][:, None]) * scale[:, None] + pad, 0.5)
+
+    xy = np.empty((n, length, 2))
+    xy[..., 0] = x0[:, None] + np.arange(length)
+    xy[..., 1] = y0[:, None] + norm
+    return xy, stats, np.column_stack([x0, y0])
+
+
+@profiled("artists")
+def sparklines(ax, data, labels=None, *, columns=1, color="#666666",
+               min_color="#e15759", max_color="#4e79a7", end_color=None,
+               endpoint=True, linewidth=1, markersize=3, values=True, fmt="{:.1f}",
+               label_kw=None, value_kw=None, separators=None, pad=0.2, gap=0.6):
+    """Draw every row of ``data`` as a sparkline on ``ax``.
+
+    Min and max dots are always drawn; the end dot only when ``endpoint``.
+    ``labels`` are written to the left of each line and, when ``values`` is
+    true, the last value to the right using ``fmt``. ``separators`` is a
+    color for thin rules between rows (None for none). Returns a dict with
+    the created artists and the ``sparkline_stats`` of ``data``.
+    """
+    from matplotlib.collections import LineCollection
+
+    xy, stats, origins = sparkline_layout(data, columns=columns, pad=pad, gap=gap)
+    n, length = xy.shape[:2]
+    rows = np.arange(n)
+    artists = {}
+
+    artists["lines"] = ax.add_collection(
+        LineCollection(xy, colors=color, linewidths=linewidth, capstyle="round"),
+        autolim=False)
+
+    # One scatter per marker role; s is in points squared.
+    s = markersize ** 2
+    roles = [("min", stats["argmin"], min_color), ("max", stats["argmax"], max_color)]
+    if endpoint:
+        roles.append(("end", np.full(n, length - 1), end_color or color))
+    for role, idx, role_color in roles:
+        artists[role] = ax.scatter(xy[rows, idx, 0], xy[rows, idx, 1], s=s,
+                                   c=role_color, linewidths=0, zorder=3, clip_on=False)
+
+    width = max(length - 1, 1)
+    if separators:
+        x0, y0 = origins[:, 0], origins[:, 1]
+        below = y0 > 0  # no rule under the bottom row of a column
+        segs = np.stack([
+            np.column_stack([x0[below] - 0.15 * width, y0[below]]),
+            np.column_stack([x0[below] + 1.15 * width, y0[below]]),
+        ], axis=1)
+        artists["separators"] = ax.add_collection(
+            LineCollection(segs, colors=separators, linewidths=0.5), autolim=False)
+
+    text_defaults = dict(fontsize=10, fontfamily="serif", va="center")
+    if labels is not None:
+        kw = {**text_defaults, "color": "#111111", "ha": "right", **(label_kw or {})}
+        artists["labels"] = [ax.text(x - 0.04 * width, y + 0.5, label, **kw)
+                             for (x, y), label in zip(origins, labels)]
+    if values:
+        kw = {**text_defaults, "color": "#666666", "ha": "left", **(value_kw or {})}
+        artists["values"] = [ax.text(x + 0.04 * width, y, fmt.format(v), **kw)
+                             for (x, y), v in zip(xy[:, -1], stats["last"])]
+
+    ax.set_xlim(origins[:, 0].min(), origins[:, 0].max() + width)
+    ax.set_ylim(0, origins[:, 1].max() + 1)
+    ax.set_xticks([])
+    ax.set_yticks([])
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    artists["stats"] = stats
+    return artists
+
+
+def sparkline(ax, data, color="#666666", endpoint=True, **kwargs):
+    """Draw one series as a sparkline filling ``ax``; see ``sparklines``.
+
+    Returns the same artist dict, without value text unless ``values=True``.
+    """
+    kwargs.setdefault("values", False)
+    return sparklines(ax, np.asarray(data, dtype=float)[None], color=color, endpoint=endpoint,
+                      **kwargs)
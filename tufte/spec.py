@@ -0,0 +1,500 @@
+"""Declarative Tufte charts: one spec, compiled once, emitted to every backend.
+
+A spec is plain data (a dict, or a JSON/YAML file) describing what to show,
+not how to draw it:
+
+    {"kind": "line", "title": "Monthly Revenue vs. Target",
+     "x": ["Jan", "Feb", "Mar", "Apr", "May", "Jun"],
+     "series": [{"name": "Target", "values": [4000, 4200, 4400, 4600, 4800, 5000], "dashed": true},
+                {"name": "Revenue", "values": [4200, 4800, 5100, 4900, 5600, 6200], "highlight": true}],
+     "annotations": [{"peak": "Revenue", "text": "Peak: ${y:,.0f}"}]}
+
+``Chart(spec)`` validates it and does the data work once: NumPy arrays,
+range-frame bounds, endpoint and value labels, peak/low positions, sorted
+bar order and resolved theme colors. The emitters only translate that
+compiled chart:
+
+    chart = load_spec("revenue.json")
+    to_matplotlib(chart, ax)           # draws on an Axes
+    to_plotly(chart)                   # go.Figure
+    to_echarts(chart), to_chartjs(chart), to_recharts(chart)   # JSON-ready dicts
+
+Spec keys: ``kind`` (``line`` or ``bar``), ``series`` (``name``,
+``values``, optional ``x``, ``highlight``, ``dashed``, ``color``,
+``label``), shared ``x``, ``title``, ``subtitle``, ``y_label``, ``theme``
+(``light``/``dark``), ``value_format`` (default ``"{:,.0f}"``),
+``padding`` of the y range, and ``annotations``: ``{"x", "y", "text"}`` or
+``{"peak"/"low": series, "text"}``, where ``text`` may use ``{x}``, ``{y}``
+and ``{value}`` (``y`` through ``value_format``). All series share one x:
+a series ``x`` stands in for a missing shared ``x`` and must otherwise
+match it. Bar charts take one series, sorted largest first unless
+``"sort": false``; the leader is highlighted unless ``highlight`` names
+other bars (one name or a list) or is ``false``.
+"""
+
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+
+from tufte.frame import data_bounds
+from tufte.profile import profiled
+from tufte.style import PALETTE, PALETTE_DARK, TUFTE_DARK_RC, TUFTE_RC
+
+SERIF = '"ET Book", "Palatino Linotype", Palatino, Georgia, serif'
+SANS = "system-ui, sans-serif"
+
+THEMES = {
+    "light": {**PALETTE, "bg": TUFTE_RC["figure.facecolor"]},
+    "dark": {**PALETTE_DARK, "bg": TUFTE_DARK_RC["figure.facecolor"]},
+}
+
+KINDS = ("line", "bar")
+
+
+def _number(value):
+    """Plain JSON number for ``value``: int when integral, None for NaN."""
+    value = float(value)
+    if math.isnan(value):
+        return None
+    return int(value) if value.is_integer() and abs(value) < 2**53 else value
+
+
+def _numbers(values):
+    return [_number(v) for v in values.tolist()]
+
+
+def _require(cond, message):
+    if not cond:
+        raise ValueError(f"invalid chart spec: {message}")
+
+
+class Chart:
+    """A validated chart spec with every derived quantity computed once.
+
+    Attributes read by the emitters: ``kind``, ``title``, ``subtitle``,
+    ``y_label``, ``theme``, ``colors`` (the theme palette), ``x`` (labels or
+    numbers), ``categorical``, ``positions`` (numeric x, index positions
+    for categories), ``series`` (dicts with ``name``, ``values``,
+    ``color``, ``width``, ``dashed``, ``end`` index and ``label`` text),
+    ``x_bounds``/``y_bounds`` (data extent, for the range frame),
+    ``y_range`` (padded axis range), ``annotations`` (dicts with ``index``
+    into ``x``, ``series`` index, ``x``, ``y``, ``text``, ``color``) and,
+    for bars, ``labels``, ``values``, ``bar_colors`` and ``value_labels`` in
+    display order.
+    """
+
+    def __init__(self, spec):
+        _require(isinstance(spec, dict), f"expected an object, got {type(spec).__name__}")
+        self.spec = spec
+        self.kind = spec.get("kind", "line")
+        _require(self.kind in KINDS, f"kind must be one of {KINDS}, got {self.kind!r}")
+        self.theme = spec.get("theme", "light")
+        _require(self.theme in THEMES, f"theme must be one of {sorted(THEMES)}, got {self.theme!r}")
+        self.colors = c = THEMES[self.theme]
+        self.title = spec.get("title")
+        self.subtitle = spec.get("subtitle")
+        self.y_label = spec.get("y_label")
+        self.value_format = spec.get("value_format", "{:,.0f}")
+        series = spec.get("series")
+        _require(isinstance(series, list) and series, "'series' must be a non-empty list")
+
+        if self.kind == "bar":
+            _require(len(series) == 1, f"a bar chart takes one series, got {len(series)}")
+            self._compile_bar(series[0], c)
+        else:
+            self._compile_line(series, c)
+
+    def _compile_line(self, series, c):
+        shared = self.spec.get("x")
+        self.series = []
+        for i, s in enumerate(series):
+            _require("values" in s, f"series {i} has no 'values'")
+            values = np.asarray(s["values"], dtype=float)
+            _require(values.ndim == 1 and values.size, f"series {i} 'values' must be a 1-D list")
+            finite = np.flatnonzero(np.isfinite(values))
+            _require(finite.size, f"series {i} has no finite values")
+            name = s.get("name", f"Series {i + 1}")
+            highlight = bool(s.get("highlight"))
+            end = int(finite[-1])
+            self.series.append({
+                "name": name,
+                "values": values,
+                "x": s.get("x"),
+                "color": s.get("color") or (c["highlight"] if highlight else c["gray"]),
+                "width": 2 if highlight else 1,
+                "dashed": bool(s.get("dashed")),
+                "end": end,
+                "label": s.get("label", "{name}").format(
+                    name=name, y=values[end], value=self.value_format.format(values[end])),
+            })
+
+        x = shared if shared is not None else self.series[0]["x"]
+        if x is None:
+            x = list(range(max(len(s["values"]) for s in self.series)))
+        self.x = list(x)
+        self.categorical = any(isinstance(v, str) for v in self.x)
+        self.positions = (np.arange(len(self.x), dtype=float) if self.categorical
+                          else np.asarray(self.x, dtype=float))
+        for i, s in enumerate(self.series):
+            _require(s["x"] is None or list(s["x"]) == self.x,
+                     f"series {i} 'x' differs from the chart's; all series share one x")
+            _require(len(s["values"]) <= len(self.x),
+                     f"series {i} has {len(s['values'])} values for {len(self.x)} x positions")
+
+        self.x_bounds = tuple(float(v) for v in data_bounds(self.positions))
+        self.y_bounds = tuple(float(v) for v in data_bounds(*(s["values"] for s in self.series)))
+        padding = self.spec.get("padding", 0.05)
+        pad = (self.y_bounds[1] - self.y_bounds[0]) * padding or abs(self.y_bounds[0]) * padding or 1
+        self.y_range = (self.y_bounds[0] - pad, self.y_bounds[1] + pad)
+        self.annotations = [self._annotation(a, c) for a in self.spec.get("annotations", [])]
+
+    def _annotation(self, a, c):
+        if "peak" in a or "low" in a:
+            which = "peak" if "peak" in a else "low"
+            names = [s["name"] for s in self.series]
+            _require(a[which] in names, f"annotation refers to unknown series {a[which]!r}")
+            series = names.index(a[which])
+            values = self.series[series]["values"]
+            index = int(np.nanargmax(values) if which == "peak" else np.nanargmin(values))
+            x, y = self.x[index], float(values[index])
+        else:
+            _require("x" in a and "y" in a, "an annotation needs 'x' and 'y', or 'peak'/'low'")
+            x, y = a["x"], float(a["y"])
+            if self.categorical:
+                _require(x in self.x, f"annotation x {x!r} is not one of the x labels")
+            else:
+                _require(isinstance(x, (int, float)), f"annotation x {x!r} is not a number")
+            index = self.x.index(x) if x in self.x else None
+            # Attach it to the series passing closest, for backends that annotate per series.
+            gaps = [abs(s["values"][index] - y) if index is not None and index < len(s["values"])
+                    else np.inf for s in self.series]
+            series = int(np.argmin(np.nan_to_num(gaps, nan=np.inf)))
+        value = self.value_format.format(y)
+        text = a.get("text", "{value}").format(x=x, y=y, value=value)
+        return {"index": index, "series": series, "x": x, "y": y, "text": text,
+                "color": a.get("color", c["note"])}
+
+    def _compile_bar(self, s, c):
+        _require("values" in s, "the bar series has no 'values'")
+        labels = list(self.spec.get("x") or s.get("x") or [])
+        values = np.asarray(s["values"], dtype=float)
+        _require(values.ndim == 1 and len(values), "the bar series 'values' must be a 1-D list")
+        _require(len(labels) == len(values), f"{len(labels)} labels for {len(values)} bars")
+        order = (np.argsort(-values, kind="stable") if self.spec.get("sort", True)
+                 else np.arange(len(values)))
+        self.labels = [labels[i] for i in order]
+        self.values = values[order]
+        highlight = s.get("highlight", self.spec.get("highlight"))
+        if highlight is None or highlight is True:
+            highlight = [self.labels[0]]
+        elif highlight is False:
+            highlight = []
+        elif isinstance(highlight, str):
+            highlight = [highlight]
+        self.bar_colors = [c["highlight"] if name in highlight else c["gray"] for name in self.labels]
+        self.value_labels = [self.value_format.format(v) for v in self.values.tolist()]
+        self.series, self.annotations = [], []
+        self.x = self.labels
+        self.categorical = True
+        self.y_bounds = (0.0, float(np.nanmax(self.values)))
+
+
+def load_spec(source):
+    """Compile a spec from a dict, a JSON/YAML file path or a JSON string."""
+    if isinstance(source, dict):
+        return Chart(source)
+    path = Path(source) if not str(source).lstrip().startswith("{") else None
+    if path is None:
+        return Chart(json.loads(source))
+    if path.suffix in (".yml", ".yaml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ImportError("YAML chart specs need PyYAML: pip install pyyaml") from None
+        return Chart(yaml.safe_load(path.read_text()))
+    return Chart(json.loads(path.read_text()))
+
+
+# --- matplotlib -----------------------------------------------------------------
+
+@profiled("artists")
+def to_matplotlib(chart, ax=None, figsize=(8, 5)):
+    """Draw ``chart`` on ``ax`` (a new pyplot-free figure if None); returns the Axes.
+
+    Colors come from the chart's theme; save under the matching rc
+    (``TUFTE_DARK_RC`` for ``dark``) so ``savefig.facecolor`` agrees.
+    """
+    c = chart.colors
+    if ax is None:
+        from matplotlib.figure import Figure
+
+        ax = Figure(figsize=figsize, facecolor=c["bg"]).add_subplot()
+    ax.set_facecolor(c["bg"])
+    if chart.kind == "bar":
+        _mpl_bar(chart, ax, c)
+    else:
+        _mpl_line(chart, ax, c)
+    top = 1.06
+    if chart.subtitle:
+        ax.text(0, 1.03, chart.subtitle, transform=ax.transAxes, fontsize=12,
+                color=c["text2"], va="bottom")
+        top = 1.11
+    if chart.title:
+        ax.text(0, top, chart.title, transform=ax.transAxes, fontsize=16,
+                color=c["text"], va="bottom")
+    return ax
+
+
+def _mpl_line(chart, ax, c):
+    from tufte.marks import direct_labels
+
+    pos = chart.positions
+    for s in chart.series:
+        n = len(s["values"])
+        ax.plot(pos[:n], s["values"], color=s["color"], linewidth=s["width"],
+                linestyle="--" if s["dashed"] else "-")
+    for a in chart.annotations:
+        x = pos[a["index"]] if chart.categorical else a["x"]
+        ax.annotate(a["text"], xy=(x, a["y"]), xytext=(0, 18), textcoords="offset points",
+                    ha="center", fontsize=11, fontstyle="italic", color=a["color"],
+                    arrowprops=dict(arrowstyle="-", color=c["axis"], lw=0.5))
+    ax.set_ylim(*chart.y_range)
+    ax.spines[["top", "right"]].set_visible(False)
+    ax.spines["bottom"].set_bounds(*chart.x_bounds)
+    ax.spines["left"].set_bounds(*chart.y_bounds)
+    ax.spines[["bottom", "left"]].set_color(c["axis"])
+    ax.tick_params(direction="in", length=3, width=0.5, colors=c["text3"])
+    if chart.categorical:
+        ax.set_xticks(pos, chart.x)
+    if chart.y_label:
+        ax.set_ylabel(chart.y_label, color=c["text2"])
+    direct_labels(ax, [pos[s["end"]] for s in chart.series],
+                  [s["values"][s["end"]] for s in chart.series],
+                  [s["label"] for s in chart.series], [s["color"] for s in chart.series],
+                  offset=6)
+
+
+def _mpl_bar(chart, ax, c):
+    y = np.arange(len(chart.values))
+    ax.barh(y, chart.values, color=chart.bar_colors, height=0.55)
+    for i, (value, text) in enumerate(zip(chart.values, chart.value_labels)):
+        ax.annotate(text, xy=(value, i), xytext=(4, 0), textcoords="offset points",
+                    va="center", fontsize=11, color=c["text2"])
+    ax.set_yticks(y, chart.labels)
+    ax.set_xticks([])
+    ax.tick_params(left=False, labelcolor=c["text"])
+    for spine in ax.spines.values():
+        spine.set_visible(False)
+    ax.invert_yaxis()
+
+
+# --- Plotly ---------------------------------------------------------------------
+
+def to_plotly(chart, validate=False, **layout):
+    """Return a ``go.Figure`` for ``chart``; ``layout`` overrides layout properties."""
+    from tufte.plotly_figure import direct_labels, point_annotation, tufte_figure, tufte_template
+
+    c = chart.colors
+    title = None
+    if chart.title:
+        title = dict(text=chart.title)
+        if chart.subtitle:
+            title["subtitle"] = dict(text=chart.subtitle, font=dict(color=c["text2"]))
+    if chart.kind == "bar":
+        data = [dict(type="bar", orientation="h", y=chart.labels, x=chart.values,
+                     marker=dict(color=chart.bar_colors), text=chart.value_labels,
+                     textposition="outside", textfont=dict(color=c["text2"]),
+                     hovertemplate="%{y}: %{text}<extra></extra>")]
+        return tufte_figure(data, chart.theme, validate=validate, title=title,
+                            xaxis=dict(visible=False),
+                            yaxis=dict(autorange="reversed", ticks="",
+                                       tickfont=dict(family=SERIF, size=13, color=c["text"])),
+                            **layout)
+    data = []
+    for s in chart.series:
+        n = len(s["values"])
+        data.append(dict(type="scatter", mode="lines", name=s["name"], x=chart.x[:n],
+                         y=s["values"], line=dict(color=s["color"], width=s["width"],
+                                                  dash="dash" if s["dashed"] else "solid")))
+    margin = {**tufte_template(chart.theme)["layout"]["margin"], **layout.get("margin", {})}
+    annotations = direct_labels(
+        [chart.x[s["end"]] for s in chart.series],
+        [float(s["values"][s["end"]]) for s in chart.series],
+        [s["label"] for s in chart.series], [s["color"] for s in chart.series], chart.theme,
+        y_range=chart.y_range, plot_height=layout.get("height", 450) - margin["t"] - margin["b"])
+    annotations += [point_annotation(a["x"], a["y"], a["text"], chart.theme)
+                    for a in chart.annotations]
+    return tufte_figure(data, chart.theme, annotations=annotations, validate=validate,
+                        title=title, yaxis_range=list(chart.y_range),
+                        yaxis_title=chart.y_label, **layout)
+
+
+# --- JavaScript libraries (JSON option objects) ------------------------------------
+
+def to_echarts(chart):
+    """ECharts ``option`` object for ``chart``, ready for ``json.dumps``."""
+    c = chart.colors
+    axis_label = {"color": c["text3"], "fontSize": 11, "fontFamily": SANS}
+    option = {
+        "backgroundColor": c["bg"],
+        "textStyle": {"fontFamily": SERIF, "color": c["text"]},
+        "title": {"text": chart.title or "", "subtext": chart.subtitle or "", "left": "left",
+                  "textStyle": {"color": c["text"], "fontWeight": "normal"},
+                  "subtextStyle": {"color": c["text2"]}},
+        "legend": {"show": False},
+        "tooltip": {"trigger": "axis", "borderWidth": 0, "extraCssText": "box-shadow: none;"},
+    }
+    if chart.kind == "bar":
+        option["grid"] = {"show": False, "left": 100, "right": 80, "top": 60, "bottom": 20}
+        option["xAxis"] = {"type": "value", "show": False}
+        option["yAxis"] = {"type": "category", "inverse": True, "data": chart.labels,
+                           "axisLine": {"show": False}, "axisTick": {"show": False},
+                           "axisLabel": {"color": c["text"], "fontSize": 13, "fontFamily": SERIF}}
+        option["series"] = [{
+            "type": "bar", "barWidth": "55%",
+            "data": [{"value": v, "itemStyle": {"color": col}, "label": {"formatter": t}}
+                     for v, col, t in zip(_numbers(chart.values), chart.bar_colors,
+                                          chart.value_labels)],
+            "label": {"show": True, "position": "right", "color": c["text2"]},
+        }]
+        return option
+    option["grid"] = {"show": False, "left": 60, "right": 120, "top": 70, "bottom": 40}
+    option["xAxis"] = {"type": "category" if chart.categorical else "value",
+                       "axisLine": {"lineStyle": {"color": c["axis"], "width": 0.5}},
+                       "axisTick": {"show": False}, "axisLabel": axis_label,
+                       "splitLine": {"show": False}}
+    if chart.categorical:
+        option["xAxis"].update(data=chart.x, boundaryGap=False)
+    else:
+        option["xAxis"].update(min=chart.x_bounds[0], max=chart.x_bounds[1])
+    option["yAxis"] = {"type": "value", "min": chart.y_range[0], "max": chart.y_range[1],
+                       "name": chart.y_label or "", "axisLine": {"show": False},
+                       "axisTick": {"show": False}, "axisLabel": axis_label,
+                       "splitLine": {"show": False}}
+    option["series"] = []
+    for i, s in enumerate(chart.series):
+        values = _numbers(s["values"])
+        data = values if chart.categorical else [[x, v] for x, v in zip(_numbers(chart.positions), values)]
+        series = {
+            "name": s["name"], "type": "line", "data": data, "showSymbol": False,
+            "lineStyle": {"color": s["color"], "width": s["width"],
+                          "type": "dashed" if s["dashed"] else "solid"},
+            "itemStyle": {"color": s["color"]},
+            "endLabel": {"show": True, "formatter": s["label"], "color": s["color"],
+                         "fontSize": 13, "fontFamily": SERIF},
+        }
+        notes = [a for a in chart.annotations if a["series"] == i]
+        if notes:
+            series["markPoint"] = {
+                "symbol": "circle", "symbolSize": 6, "itemStyle": {"color": s["color"]},
+                "label": {"show": True, "position": "top", "formatter": "{b}", "fontSize": 12,
+                          "fontStyle": "italic", "color": c["note"]},
+                "data": [{"name": a["text"], "coord": [a["x"], _number(a["y"])]} for a in notes],
+            }
+        option["series"].append(series)
+    return option
+
+
+def to_chartjs(chart):
+    """Chart.js config (``type``, ``data``, ``options``) for ``chart``.
+
+    Endpoint labels and annotations use ``chartjs-plugin-annotation`` label
+    annotations, so the config holds no callbacks and stays plain JSON.
+    """
+    c = chart.colors
+    font = {"family": SERIF, "size": 13}
+    ticks = {"color": c["text3"], "font": {"family": SANS, "size": 11}, "padding": 8}
+    title = {"display": bool(chart.title), "text": chart.title or "", "align": "start",
+             "color": c["text"], "font": {**font, "size": 18, "weight": "normal"}}
+    subtitle = {"display": bool(chart.subtitle), "text": chart.subtitle or "", "align": "start",
+                "color": c["text2"], "font": font, "padding": {"bottom": 16}}
+    if chart.kind == "bar":
+        return {
+            "type": "bar",
+            "data": {"labels": chart.labels, "datasets": [{
+                "data": _numbers(chart.values), "backgroundColor": chart.bar_colors,
+                "borderWidth": 0, "barPercentage": 0.55}]},
+            "options": {
+                "indexAxis": "y",
+                "scales": {"x": {"display": False},
+                           "y": {"grid": {"display": False}, "border": {"display": False},
+                                 "ticks": {**ticks, "color": c["text"], "font": font}}},
+                "plugins": {"legend": {"display": False}, "title": title, "subtitle": subtitle,
+                            "annotation": {"annotations": {
+                                f"value{i}": {"type": "label", "xValue": v, "yValue": name,
+                                              "content": text, "position": "start",
+                                              "xAdjust": 6, "color": c["text2"], "font": font}
+                                for i, (name, v, text) in enumerate(
+                                    zip(chart.labels, _numbers(chart.values), chart.value_labels))}}},
+                "layout": {"padding": {"right": 80}},
+            },
+        }
+    labels = chart.x if chart.categorical else _numbers(chart.positions)
+    annotations = {}
+    for i, s in enumerate(chart.series):
+        annotations[f"label{i}"] = {
+            "type": "label", "xValue": labels[s["end"]], "yValue": _number(s["values"][s["end"]]),
+            "content": s["label"], "position": "start", "xAdjust": 8, "color": s["color"],
+            "font": font}
+    for i, a in enumerate(chart.annotations):
+        annotations[f"note{i}"] = {
+            "type": "label", "xValue": a["x"] if chart.categorical else _number(a["x"]),
+            "yValue": _number(a["y"]), "content": a["text"], "yAdjust": -16, "color": a["color"],
+            "font": {**font, "size": 12, "style": "italic"}}
+    return {
+        "type": "line",
+        "data": {"labels": labels, "datasets": [
+            {"label": s["name"], "data": _numbers(s["values"]), "borderColor": s["color"],
+             "borderWidth": s["width"], "pointRadius": 0, "tension": 0, "spanGaps": False,
+             **({"borderDash": [4, 3]} if s["dashed"] else {})}
+            for s in chart.series]},
+        "options": {
+            "scales": {
+                "x": {"grid": {"display": False},
+                      "border": {"display": True, "color": c["axis"], "width": 0.5}, "ticks": ticks},
+                "y": {"grid": {"display": False}, "border": {"display": False}, "ticks": ticks,
+                      "min": chart.y_range[0], "max": chart.y_range[1],
+                      "title": {"display": bool(chart.y_label), "text": chart.y_label or "",
+                                "color": c["text2"]}},
+            },
+            "plugins": {"legend": {"display": False}, "title": title, "subtitle": subtitle,
+                        "annotation": {"annotations": annotations}},
+            "layout": {"padding": {"right": 100}},
+        },
+    }
+
+
+def to_recharts(chart):
+    """Props for a Recharts chart: row-shaped ``data`` plus per-element settings.
+
+    Lines: ``data`` rows keyed by ``x`` and each series name, ``lines``
+    (``dataKey``, ``stroke``, ``strokeWidth``, ``strokeDasharray``),
+    ``yDomain``, and ``labels``/``annotations`` for ``ReferenceDot``s.
+    Bars: ``data`` rows with ``name``, ``value``, ``fill`` and ``label``.
+    """
+    c = chart.colors
+    props = {"title": chart.title, "subtitle": chart.subtitle, "background": c["bg"],
+             "font": SERIF, "fontSans": SANS, "axisColor": c["axis"], "tickColor": c["text3"]}
+    if chart.kind == "bar":
+        props["data"] = [{"name": n, "value": v, "fill": f, "label": t}
+                         for n, v, f, t in zip(chart.labels, _numbers(chart.values),
+                                               chart.bar_colors, chart.value_labels)]
+        return props
+    columns = {s["name"]: _numbers(s["values"]) for s in chart.series}
+    props["data"] = [{"x": x, **{name: (v[i] if i < len(v) else None) for name, v in columns.items()}}
+                     for i, x in enumerate(chart.x if chart.categorical else _numbers(chart.positions))]
+    props["lines"] = [{"dataKey": s["name"], "stroke": s["color"], "strokeWidth": s["width"],
+                       **({"strokeDasharray": "4 3"} if s["dashed"] else {})}
+                      for s in chart.series]
+    props["yDomain"] = [_number(v) for v in chart.y_range]
+    props["labels"] = [{"x": props["data"][s["end"]]["x"], "y": _number(s["values"][s["end"]]),
+                        "value": s["label"], "fill": s["color"]} for s in chart.series]
+    props["annotations"] = [{"x": a["x"], "y": _number(a["y"]), "value": a["text"],
+                             "fill": a["color"]} for a in chart.annotations]
+    return props
+
+
+EMITTERS = {"matplotlib": to_matplotlib, "plotly": to_plotly, "echarts": to_echarts,
+            "chartjs": to_chartjs, "recharts": to_recharts}
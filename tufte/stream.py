@@ -0,0 +1,440 @@
+"""Live Tufte line charts that take appended points instead of a rebuilt figure.
+
+A dashboard that redraws its chart every second pays for new artists, a
+layout pass and a full render per tick, and scans the whole series again
+for the range frame. ``StreamBuffer`` keeps the last ``window`` points in a
+ring buffer and the window's extremes in monotonic queues, so appending a
+point and asking for the bounds are O(1) (amortized). ``StreamingChart``
+draws on matplotlib with blitting: lines, range-frame spines, endpoint
+labels and the peak annotation are animated artists redrawn over a cached
+background, and the whole figure is redrawn only when the data leaves the
+current view. The view has ``headroom`` to grow into, so that happens about
+once per ``headroom * window`` points:
+
+    chart = StreamingChart(ax, ["p50", "p99"], window=600, highlight=1, peak=1)
+    plt.show(block=False)
+    while True:
+        chart.append(time.time(), (p50(), p99()))
+        chart.draw()
+        plt.pause(1)
+
+For Plotly, ``PlotlyStream`` builds the initial figure and then, per batch
+of points, a message for ``Plotly.extendTraces`` with only the layout keys
+that changed. ``STREAM_JS`` applies it in the browser; ``apply`` applies it
+to a Python figure (e.g. a ``FigureWidget``).
+
+``x`` must increase: seconds, or matplotlib date numbers.
+"""
+
+from collections import deque
+
+import numpy as np
+
+from tufte.style import PALETTE
+
+
+class RingBuffer:
+    """The last ``capacity`` rows of a stream, always readable as one contiguous array.
+
+    Every row is written twice, ``capacity`` rows apart, so the window is a
+    plain slice of the backing array: no copy, no wrap-around.
+    """
+
+    def __init__(self, capacity, width=1, dtype=float):
+        if capacity < 1:
+            raise ValueError(f"capacity must be at least 1, got {capacity}")
+        self.capacity = capacity
+        self.count = 0          # rows appended in total
+        self._data = np.empty((2 * capacity, width), dtype)
+
+    def __len__(self):
+        return min(self.count, self.capacity)
+
+    def extend(self, rows):
+        """Append ``rows`` (an ``(n, width)`` array), keeping the last ``capacity``."""
+        rows = np.asarray(rows, dtype=self._data.dtype).reshape(-1, self._data.shape[1])
+        skipped = max(len(rows) - self.capacity, 0)
+        rows = rows[skipped:]
+        slots = (self.count + skipped + np.arange(len(rows))) % self.capacity
+        self._data[slots] = rows
+        self._data[slots + self.capacity] = rows
+        self.count += skipped + len(rows)
+
+    def view(self):
+        """The window, oldest row first, as a view into the buffer."""
+        if self.count <= self.capacity:
+            return self._data[:self.count]
+        start = self.count % self.capacity
+        return self._data[start:start + self.capacity]
+
+
+class WindowExtremes:
+    """Minimum and maximum of the last ``window`` values, O(1) amortized per value.
+
+    Two monotonic queues hold ``(sequence number, value)`` pairs that can
+    still become the window's minimum or maximum. NaNs are skipped; the
+    earliest of equal maxima is kept, so a peak marker does not hop.
+    """
+
+    def __init__(self, window):
+        self.window = window
+        self.count = 0
+        self._min = deque()
+        self._max = deque()
+
+    def push(self, value):
+        if value == value:
+            while self._min and self._min[-1][1] >= value:
+                self._min.pop()
+            self._min.append((self.count, value))
+            while self._max and self._max[-1][1] < value:
+                self._max.pop()
+            self._max.append((self.count, value))
+        self.count += 1
+        oldest = self.count - self.window
+        while self._min and self._min[0][0] < oldest:
+            self._min.popleft()
+        while self._max and self._max[0][0] < oldest:
+            self._max.popleft()
+
+    def skip(self, n):
+        """Advance past ``n`` values that are known to fall out of the window."""
+        self.count += n
+
+    @property
+    def min(self):
+        return self._min[0][1] if self._min else None
+
+    @property
+    def max(self):
+        return self._max[0][1] if self._max else None
+
+    @property
+    def argmax(self):
+        """Sequence number of the maximum, or None."""
+        return self._max[0][0] if self._max else None
+
+
+class StreamBuffer:
+    """The last ``window`` points of ``n_series`` series sharing one x, with running bounds."""
+
+    def __init__(self, n_series, window=600):
+        self.n_series = n_series
+        self.window = window
+        self._ring = RingBuffer(window, 1 + n_series)
+        self._extremes = [WindowExtremes(window) for _ in range(n_series)]
+
+    def __len__(self):
+        return len(self._ring)
+
+    @property
+    def count(self):
+        return self._ring.count
+
+    def append(self, x, ys):
+        """Append one point: ``x`` and one ``y`` per series."""
+        self.extend([x], np.reshape(ys, (self.n_series, 1)))
+
+    def extend(self, xs, ys):
+        """Append points: ``xs`` of length n and ``ys`` of shape ``(n_series, n)``."""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float).reshape(self.n_series, len(xs))
+        self._ring.extend(np.column_stack([xs, ys.T]))
+        # Points that cannot survive in the window only advance the counters.
+        skipped = max(len(xs) - self.window, 0)
+        for extremes, y in zip(self._extremes, ys):
+            extremes.skip(skipped)
+            for value in y[skipped:].tolist():
+                extremes.push(value)
+
+    @property
+    def x(self):
+        return self._ring.view()[:, 0]
+
+    def y(self, i):
+        return self._ring.view()[:, 1 + i]
+
+    def last(self):
+        """``(x, ys)`` of the newest point."""
+        row = self._ring.view()[-1]
+        return row[0], row[1:]
+
+    def bounds(self):
+        """``(x_lo, x_hi, y_lo, y_hi)`` of the window, in O(n_series)."""
+        view = self._ring.view()
+        lows = [e.min for e in self._extremes if e.min is not None]
+        highs = [e.max for e in self._extremes if e.max is not None]
+        if not len(view) or not lows:
+            raise ValueError("no finite values in the window")
+        return view[0, 0], view[-1, 0], min(lows), max(highs)
+
+    def peak(self, i):
+        """``(x, y)`` of the maximum of series ``i`` in the window, or None."""
+        seq = self._extremes[i].argmax
+        if seq is None:
+            return None
+        row = self._ring.view()[seq - (self.count - len(self))]
+        return row[0], row[1 + i]
+
+
+class StreamingChart:
+    """A live range-frame line chart on ``ax``, redrawn by blitting; see the module docstring.
+
+    ``names`` label the series at their newest points. ``highlight`` is the
+    index of the series drawn in the highlight color, ``peak`` the index of
+    the series whose window maximum is annotated (``fmt`` formats it).
+    ``headroom`` is the fraction of the data span left free beyond the data
+    when the view has to change.
+    """
+
+    def __init__(self, ax, names, window=600, highlight=None, peak=None, headroom=0.25,
+                 fmt="{:,.0f}", colors=None, label_kw=None):
+        self.ax = ax
+        self.names = list(names)
+        self.buffer = StreamBuffer(len(self.names), window)
+        self.headroom = headroom
+        self.fmt = fmt
+        self.full_draws = 0
+        self.blits = 0
+        if colors is None:
+            colors = [PALETTE["highlight"] if i == highlight else PALETTE["gray"]
+                      for i in range(len(self.names))]
+        self.colors = colors
+        # The view always holds the newest points, so skip the per-draw in-axes check
+        self._label_kw = {"annotation_clip": False, **(label_kw or {})}
+        self._peak = peak
+        self._labels = None
+        self._peak_text = None
+        self._background = None
+        self.lines = [ax.plot([], [], color=color, animated=True,
+                              linewidth=2 if i == highlight else 1.2)[0]
+                      for i, color in enumerate(colors)]
+        ax.spines[["top", "right"]].set_visible(False)
+        ax.spines[["left", "bottom"]].set_animated(True)
+        ax.tick_params(direction="in", length=3, width=0.5)
+        self._cid = ax.figure.canvas.mpl_connect("draw_event", self._on_draw)
+
+    def append(self, x, ys):
+        """Append one point per series; shown by the next ``draw``."""
+        self.buffer.append(x, ys)
+
+    def extend(self, xs, ys):
+        """Append a batch: ``xs`` of length n and ``ys`` of shape ``(n_series, n)``."""
+        self.buffer.extend(xs, ys)
+
+    def artists(self):
+        """The animated artists of the axes, in drawing order."""
+        return sorted((a for a in self.ax.get_children() if a.get_animated()),
+                      key=lambda a: a.get_zorder())
+
+    def draw(self):
+        """Show the appended points. Returns True when the whole figure was redrawn.
+
+        The figure is redrawn (and its background cached again) only when
+        the data left the view; otherwise the background is restored and
+        just the animated artists are drawn and blitted.
+        """
+        if not len(self.buffer):
+            return False
+        canvas = self.ax.figure.canvas
+        full = self._update() or self._background is None
+        if full:
+            self.full_draws += 1
+            canvas.draw()           # caches the background, draws the artists
+        else:
+            self.blits += 1
+            canvas.restore_region(self._background)
+            self._draw_artists()
+        canvas.blit(self.ax.figure.bbox)
+        return full
+
+    def close(self):
+        """Stop following the figure's redraws; the artists stay on ``ax``.
+
+        Call it before dropping the chart while the figure lives on, or
+        before starting another chart on the same axes.
+        """
+        if self._cid is not None:
+            self.ax.figure.canvas.mpl_disconnect(self._cid)
+            self._cid = None
+        self._background = None
+
+    def _on_draw(self, event):
+        canvas = self.ax.figure.canvas
+        if canvas.is_saving():
+            return
+        self._background = canvas.copy_from_bbox(self.ax.figure.bbox)
+        self._draw_artists()
+
+    def _draw_artists(self):
+        for artist in self.artists():
+            self.ax.draw_artist(artist)
+
+    def _update(self):
+        """Move every artist to the new data; True if the view had to change."""
+        buffer = self.buffer
+        x = buffer.x
+        for i, line in enumerate(self.lines):
+            line.set_data(x, buffer.y(i))
+        x_lo, x_hi, y_lo, y_hi = buffer.bounds()
+        changed = self._fit_view(x_lo, x_hi, y_lo, y_hi)
+        self.ax.spines["bottom"].set_bounds(x_lo, x_hi)
+        self.ax.spines["left"].set_bounds(y_lo, y_hi)
+        self._move_labels()
+        self._move_peak()
+        return changed
+
+    def _fit_view(self, x_lo, x_hi, y_lo, y_hi):
+        ax = self.ax
+        (vx_lo, vx_hi), (vy_lo, vy_hi) = ax.get_xlim(), ax.get_ylim()
+        changed = False
+        if self._background is None or x_lo < vx_lo or x_hi > vx_hi:
+            span = (x_hi - x_lo) or 1.0
+            ax.set_xlim(x_lo, x_hi + self.headroom * span)
+            changed = True
+        span = (y_hi - y_lo) or abs(y_hi) or 1.0
+        # Refit when the data leaves the view or shrinks to under half of it
+        if (self._background is None or y_lo < vy_lo or y_hi > vy_hi
+                or span < (vy_hi - vy_lo) / 2):
+            pad = self.headroom * span / 2
+            ax.set_ylim(y_lo - pad, y_hi + pad)
+            changed = True
+        return changed
+
+    def _move_labels(self):
+        from tufte.marks import direct_labels, update_labels
+
+        x, ys = self.buffer.last()
+        if self._labels is None:
+            self._labels = direct_labels(self.ax, np.full(len(ys), x), ys, self.names,
+                                         self.colors, animated=True, **self._label_kw)
+        else:
+            update_labels(self.ax, self._labels, np.full(len(ys), x), ys)
+
+    def _move_peak(self):
+        if self._peak is None:
+            return
+        from tufte.marks import annotate_point
+
+        peak = self.buffer.peak(self._peak)
+        if peak is None:
+            return
+        text = self.fmt.format(peak[1])
+        if self._peak_text is None:
+            self._peak_text = annotate_point(self.ax, *peak, text)
+            self._peak_text.set_animated(True)
+        else:
+            self._peak_text.xy = peak
+            self._peak_text.set_text(text)
+
+
+# --- Plotly --------------------------------------------------------------------------
+
+# Applies a ``PlotlyStream`` message to a chart div in the browser.
+STREAM_JS = """\
+function tufteStream(gd, msg) {
+  Plotly.extendTraces(gd, msg.data, msg.traces, msg.max_points);
+  if (Object.keys(msg.layout).length) Plotly.relayout(gd, msg.layout);
+}
+"""
+
+
+class PlotlyStream:
+    """Incremental updates for a Plotly range-frame line chart; see the module docstring.
+
+    ``figure()`` returns the starting figure; each ``extend`` returns a
+    message with the new points for ``Plotly.extendTraces`` (trimmed to
+    ``window`` points in the browser) and a relayout holding only what
+    changed: the axis ranges, the endpoint labels and the peak annotation.
+    """
+
+    def __init__(self, names, window=600, highlight=None, peak=None, theme="light",
+                 padding=0.02, fmt="{:,.0f}", height=450):
+        from tufte.plotly_figure import THEMES, tufte_template
+
+        self.names = list(names)
+        self.buffer = StreamBuffer(len(self.names), window)
+        self.theme = theme
+        self.padding = padding
+        self.fmt = fmt
+        self.height = height
+        self._peak = peak
+        c = THEMES[theme]
+        self.colors = [c["highlight"] if i == highlight else c["series_default"]
+                       for i in range(len(self.names))]
+        self._widths = [2 if i == highlight else 1.2 for i in range(len(self.names))]
+        margin = tufte_template(theme)["layout"]["margin"]
+        self._plot_height = height - margin["t"] - margin["b"]
+        self._sent = {}
+
+    def figure(self, validate=False, **layout):
+        """The empty starting figure; ``layout`` overrides layout properties."""
+        from tufte.plotly_figure import _plot_height, tufte_figure
+
+        data = [dict(type="scatter", mode="lines", name=name, x=[], y=[],
+                     line=dict(color=color, width=width))
+                for name, color, width in zip(self.names, self.colors, self._widths)]
+        fig = tufte_figure(data, self.theme, validate=validate, height=self.height, **layout)
+        self._plot_height = _plot_height(fig.layout)
+        self._sent = {}
+        return fig
+
+    def extend(self, xs, ys):
+        """Append points (``ys`` shaped ``(n_series, n)``) and return the update message."""
+        xs = np.asarray(xs, dtype=float)
+        ys = np.asarray(ys, dtype=float).reshape(len(self.names), len(xs))
+        self.buffer.extend(xs, ys)
+        keep = min(len(xs), self.buffer.window)
+        return {"data": {"x": [xs[-keep:].tolist()] * len(self.names),
+                         "y": [y[-keep:].tolist() for y in ys]},
+                "traces": list(range(len(self.names))),
+                "max_points": self.buffer.window,
+                "layout": self._relayout()}
+
+    def append(self, x, ys):
+        """``extend`` with a single point."""
+        return self.extend([x], np.reshape(ys, (len(self.names), 1)))
+
+    def _relayout(self):
+        from tufte.frame import padded_range
+        from tufte.plotly_figure import direct_labels, point_annotation
+
+        x_lo, x_hi, y_lo, y_hi = self.buffer.bounds()
+        y_range = padded_range(y_lo, y_hi, self.padding)
+        state = {"xaxis.range": padded_range(x_lo, x_hi, self.padding), "yaxis.range": y_range}
+        x, ys = self.buffer.last()
+        labels = direct_labels(np.full(len(ys), x).tolist(), ys.tolist(), self.names,
+                               self.colors, self.theme, y_range=y_range,
+                               plot_height=self._plot_height)
+        for i, label in enumerate(labels):
+            state[f"annotations[{i}]"] = label
+        if self._peak is not None:
+            peak = self.buffer.peak(self._peak)
+            if peak is not None:
+                state[f"annotations[{len(labels)}]"] = point_annotation(
+                    float(peak[0]), float(peak[1]), self.fmt.format(peak[1]), self.theme)
+        changed = {k: v for k, v in state.items() if self._sent.get(k) != v}
+        self._sent.update(changed)
+        return changed
+
+
+def apply(fig, message):
+    """Apply a ``PlotlyStream`` message to the Python figure ``fig`` in one batch."""
+    window = message["max_points"]
+    with fig.batch_update():
+        for i, x, y in zip(message["traces"], message["data"]["x"], message["data"]["y"]):
+            trace = fig.data[i]
+            trace.x = (tuple(trace.x or ()) + tuple(x))[-window:]
+            trace.y = (tuple(trace.y or ()) + tuple(y))[-window:]
+        annotations = list(fig.layout.annotations)
+        ranges = {}
+        for key, value in message["layout"].items():
+            if key.startswith("annotations["):
+                index = int(key[len("annotations["):-1])
+                annotations += [{}] * (index + 1 - len(annotations))
+                annotations[index] = value
+            else:
+                ranges[key.split(".")[0]] = value
+        fig.update_layout(annotations=annotations,
+                          **{f"{axis}_range": value for axis, value in ranges.items()})
+    return fig
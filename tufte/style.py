@@ -0,0 +1,73 @@
+"""Tufte defaults shared by every renderer: matplotlib rcParams and palettes.
+
+``TUFTE_RC`` and ``TUFTE_DARK_RC`` are meant for ``plt.rc_context`` (or
+``tufte.figures.themed`` when several threads render at once);
+``PALETTE`` and ``PALETTE_DARK``
+hold the colors the drawing code picks from, with the same keys in both
+themes so a chart can be drawn in either by swapping the dict:
+
+    with plt.rc_context(TUFTE_DARK_RC):
+        ax.plot(x, y, color=PALETTE_DARK["highlight"])
+"""
+
+TUFTE_RC = {
+    "font.family": "serif",
+    "font.serif": ["Palatino", "Palatino Linotype", "Georgia", "DejaVu Serif"],
+    "font.size": 12,
+    "figure.facecolor": "#fffff8",
+    "figure.dpi": 200,
+    "axes.facecolor": "#fffff8",
+    "axes.edgecolor": "#cccccc",
+    "axes.linewidth": 0.5,
+    "axes.labelcolor": "#666666",
+    "axes.spines.top": False,
+    "axes.spines.right": False,
+    "axes.grid": False,
+    "xtick.color": "#999999",
+    "ytick.color": "#999999",
+    "xtick.labelsize": 11,
+    "ytick.labelsize": 11,
+    "xtick.direction": "in",
+    "ytick.direction": "in",
+    "xtick.major.size": 3,
+    "ytick.major.size": 3,
+    "xtick.major.width": 0.5,
+    "ytick.major.width": 0.5,
+    "lines.linewidth": 1.5,
+    "savefig.facecolor": "#fffff8",
+    "savefig.bbox": "tight",
+    "savefig.pad_inches": 0.3,
+}
+
+TUFTE_DARK_RC = {
+    **TUFTE_RC,
+    "figure.facecolor": "#151515",
+    "axes.facecolor": "#151515",
+    "axes.edgecolor": "#444444",
+    "axes.labelcolor": "#999999",
+    "xtick.color": "#666666",
+    "ytick.color": "#666666",
+    "savefig.facecolor": "#151515",
+}
+
+PALETTE = {
+    "text": "#111111",
+    "text2": "#666666",
+    "text3": "#999999",
+    "note": "#333333",
+    "gray": "#666666",
+    "highlight": "#e41a1c",
+    "axis": "#cccccc",
+    "cat": ["#4e79a7", "#f28e2b", "#e15759", "#76b7b2"],
+}
+
+PALETTE_DARK = {
+    "text": "#dddddd",
+    "text2": "#999999",
+    "text3": "#666666",
+    "note": "#bbbbbb",
+    "gray": "#999999",
+    "highlight": "#fc8d62",
+    "axis": "#444444",
+    "cat": ["#6a9fd8", "#f2a860", "#e87a7c", "#8accc7"],
+}
@@ -0,0 +1,169 @@
+"""Inline SVG sparklines from NumPy arrays, without matplotlib.
+
+``sparkline_svgs`` turns a 2-D ``(series, time)`` array into one SVG string
+per row, ready to drop into an HTML table cell:
+
+    cells = sparkline_svgs(kpis, labels=kpi_names)
+
+Scaling, extremes and quantization are done for all rows at once. The
+``viewBox`` is ``10 ** precision`` times the display size, so every
+coordinate is an integer and the path is written with short relative
+``l`` commands. Points that lie inside a straight run are dropped, and when
+a series has more points than the sparkline has quantized columns, each
+column keeps only its first, min, max and last point (the M4 reduction from
+``tufte.downsample``), so the drawn line is unchanged.
+
+NaN values are skipped: the line bridges the gap and the end dot marks the
+last finite value.
+"""
+
+from html import escape
+
+import numpy as np
+
+
+def sparkline_points(data, width=80, height=20, inset=2, precision=1):
+    """Return the quantized ``(x, y)`` of every point of every row of ``data``.
+
+    ``x`` is an ``(time,)`` integer array shared by all rows, ``y`` an
+    ``(series, time)`` float array of whole numbers (NaN where the input is
+    NaN), both in viewBox units of ``10 ** -precision`` pixels. Each row is
+    scaled to its own min and max, ``inset`` pixels from the top and bottom;
+    a constant row is drawn at mid-height.
+    """
+    a = np.asarray(data, dtype=float)
+    if a.ndim == 1:
+        a = a[None]
+    if a.ndim != 2:
+        raise ValueError(f"expected a (series, time) array, got shape {a.shape}")
+    scale = 10 ** precision
+    n, length = a.shape
+
+    x = np.rint(np.arange(length) * (width * scale / max(length - 1, 1))).astype(np.int64)
+    lo = np.fmin.reduce(a, axis=1)
+    hi = np.fmax.reduce(a, axis=1)
+    if np.isnan(lo).any():
+        raise ValueError("every series needs at least one finite value")
+    span = hi - lo
+    usable = (height - 2 * inset) * scale
+    k = np.divide(usable, span, out=np.zeros_like(span), where=span > 0)
+    y = np.where(span[:, None] > 0,
+                 (height - inset) * scale - (a - lo[:, None]) * k[:, None],
+                 height * scale / 2)
+    return x, np.rint(y)
+
+
+def _columns(x, y):
+    """Keep the first, min, max and last point of each run of equal ``x``."""
+    starts = np.flatnonzero(np.diff(x, prepend=-1))
+    if len(starts) == len(x):
+        return x, y
+    ends = np.append(starts[1:], len(x)) - 1
+    lo = np.fmin.reduceat(y, starts, axis=1)
+    hi = np.fmax.reduceat(y, starts, axis=1)
+    first = np.where(np.isnan(y[:, starts]), lo, y[:, starts])
+    last = np.where(np.isnan(y[:, ends]), hi, y[:, ends])
+    # Visit the extreme nearer the entry point first to avoid a backtrack.
+    down = first - lo <= hi - first
+    a, b = np.where(down, lo, hi), np.where(down, hi, lo)
+    return np.repeat(x[starts], 4), np.stack([first, a, b, last], axis=2).reshape(len(y), -1)
+
+
+def _paths(x, y):
+    """SVG path data for every row of ``y``: an absolute move, then relative line-tos.
+
+    NaN points, duplicates of the previous point and points in the interior
+    of a straight run are dropped. The test compares each point with the
+    previous and next points that survive, found for all rows at once by
+    forward/backward filling column indices; coordinates are integers, so
+    collinearity is exact.
+    """
+    n, k = y.shape
+    cols = np.arange(k)
+    rows = np.arange(n)[:, None]
+    valid = ~np.isnan(y)
+    yi = np.where(valid, y, 0).astype(np.int64)
+
+    # Last finite column strictly before each column (-1 if none).
+    last = np.maximum.accumulate(np.where(valid, cols, -1), axis=1)
+    before = np.column_stack([np.full(n, -1), last[:, :-1]])
+    bx, by = x[before], yi[rows, before]
+    distinct = valid & ~((before >= 0) & (bx == x) & (by == yi))
+
+    # First distinct column strictly after each column (k if none).
+    first = np.minimum.accumulate(np.where(distinct, cols, k)[:, ::-1], axis=1)[:, ::-1]
+    after = np.column_stack([first[:, 1:], np.full(n, k)])
+    ax, ay = x[np.minimum(after, k - 1)], yi[rows, np.minimum(after, k - 1)]
+
+    d1x, d1y, d2x, d2y = x - bx, yi - by, ax - x, ay - yi
+    straight = ((before >= 0) & (after < k)
+                & (d1x * d2y == d1y * d2x) & (d1x * d2x + d1y * d2y > 0))
+    keep = distinct & ~straight
+
+    r, c = np.nonzero(keep)
+    px, py = x[c], yi[r, c]
+    steps = list(map(str, np.column_stack([np.diff(px), np.diff(py)]).ravel().tolist()))
+    px, py = px.tolist(), py.tolist()
+    ends = np.cumsum(keep.sum(axis=1)).tolist()
+    start = 0
+    for end in ends:
+        d = f"M{px[start]} {py[start]}"
+        if end - start > 1:
+            d += "l" + " ".join(steps[2 * start:2 * end - 2]).replace(" -", "-")
+        yield d
+        start = end
+
+
+def _dot(cx, cy, r, fill):
+    return f'<circle cx="{cx}" cy="{cy}" r="{r}" fill="{fill}"/>'
+
+
+def sparkline_svgs(data, width=80, height=20, *, labels=None, color="#666",
+                   min_color="#e15759", max_color="#4e79a7", end_color=None,
+                   stroke_width=1, radius=1.5, inset=2, precision=1,
+                   style="vertical-align:middle"):
+    """Return one inline ``<svg>`` sparkline string per row of ``data``.
+
+    Each sparkline has min, max and end dots; pass ``None`` as a dot's color
+    to leave it out (``end_color`` defaults to ``color``). ``labels`` gives
+    each SVG a ``role="img"`` and ``aria-label`` for screen readers.
+    ``precision`` is the number of decimal places kept in pixel coordinates.
+    """
+    x, y = sparkline_points(data, width, height, inset, precision)
+    n, length = y.shape
+    rows = np.arange(n)
+    scale = 10 ** precision
+    dots = []
+    for fill, idx in [(min_color, np.nanargmax(y, axis=1)),   # y grows downward
+                      (max_color, np.nanargmin(y, axis=1)),
+                      (color if end_color is None else end_color,
+                       length - 1 - np.argmax(~np.isnan(y[:, ::-1]), axis=1))]:
+        if fill is not None:
+            dots.append((fill, x[idx].tolist(), y[rows, idx].astype(np.int64).tolist()))
+
+    px, py = _columns(x, y)
+    r = _number(radius * scale)
+    head = (f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width * scale} {height * scale}" '
+            f'width="{width}" height="{height}"' + (f' style="{style}"' if style else ""))
+    stroke = (f'fill="none" stroke="{color}" stroke-width="{_number(stroke_width * scale)}" '
+              'stroke-linejoin="round"')
+
+    out = []
+    for i, d in enumerate(_paths(px, py)):
+        label = "" if labels is None else f' role="img" aria-label="{escape(str(labels[i]))}"'
+        parts = [head, label, f'><path d="{d}" {stroke}/>']
+        parts += [_dot(cx[i], cy[i], r, fill) for fill, cx, cy in dots]
+        parts.append("</svg>")
+        out.append("".join(parts))
+    return out
+
+
+def sparkline_svg(values, width=80, height=20, *, label=None, **kwargs):
+    """Return one inline ``<svg>`` sparkline for a 1-D series; see ``sparkline_svgs``."""
+    labels = None if label is None else [label]
+    return sparkline_svgs(np.asarray(values, dtype=float)[None], width, height,
+                          labels=labels, **kwargs)[0]
+
+
+def _number(value):
+    return int(value) if float(value).is_integer() else round(value, 3)
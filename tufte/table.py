@@ -0,0 +1,309 @@
+"""Tufte tables: one measured layout, drawn to matplotlib pages or HTML.
+
+``Table`` formats and measures every cell once, from cached per-glyph
+advances, and fixes the column widths and alignment for the whole table,
+so pages are laid out without a draw pass. Drawing a page places one
+``Text`` per cell at its measured position and adds one ``LineCollection``
+holding every rule. Cells stay text, so PDF readers can select, search
+and read them aloud, and so can SVG viewers when ``svg.fonttype`` is
+``"none"``:
+
+    table = Table(df, styles={(2, 6): {"color": "#e15759"}})
+    table.draw(ax)
+    table.save("recon.pdf", rows_per_page=40)   # multipage PDF
+    html = table.to_html()                  # same columns, .tufte-table CSS
+
+Column widths ignore kerning, so a column can be a fraction of a point
+narrower than its widest cell; right-aligned cells are aligned by
+matplotlib and stay flush.
+"""
+
+import math
+import re
+from html import escape
+from pathlib import Path
+
+from tufte.fonts import glyphs
+from tufte.profile import profiled
+
+# The .tufte-table stylesheet from rules/svg-html.md.
+TUFTE_TABLE_CSS = """\
+.tufte-table {
+  font-family: "ET Book", "Palatino Linotype", Palatino, Georgia, serif;
+  font-size: 14px;
+  color: #111;
+  border-collapse: collapse;
+  width: 100%;
+  background: #fffff8;
+}
+.tufte-table th {
+  font-weight: normal;
+  color: #666;
+  font-size: 12px;
+  text-transform: uppercase;
+  letter-spacing: 0.05em;
+  padding: 8px 12px;
+  border-bottom: 1px solid #999;
+  text-align: left;
+}
+.tufte-table td {
+  padding: 6px 12px;
+  border: none;
+  font-feature-settings: "onum" 1;
+  font-variant-numeric: oldstyle-nums;
+}
+.tufte-table td.num {
+  text-align: right;
+  font-variant-numeric: tabular-nums oldstyle-nums;
+}
+.tufte-table tr.separator td {
+  border-top: 1px solid #e0e0e0;
+}
+"""
+
+_NUMBER = re.compile(r"^[\s$€£¥+\-−(]*[\d.,]+\s*[%KMBkmb)x]*$")
+
+
+def _rows(data):
+    """Split ``data`` into ``(headers, rows)``; DataFrames bring their own headers."""
+    if hasattr(data, "columns") and hasattr(data, "itertuples"):
+        return [str(c) for c in data.columns], [list(r) for r in data.itertuples(index=False)]
+    if hasattr(data, "tolist"):
+        data = data.tolist()
+    return None, [list(r) for r in data]
+
+
+def _format(value, fmt):
+    if isinstance(value, str):
+        return value
+    if value is None or (isinstance(value, float) and math.isnan(value)):
+        return ""
+    if fmt is not None:
+        return fmt.format(value)
+    if isinstance(value, float):
+        return f"{value:,.2f}"
+    if isinstance(value, int):
+        return f"{value:,}"
+    return str(value)
+
+
+class Table:
+    """A formatted, measured table that can be drawn page by page or exported.
+
+    ``data`` is a DataFrame, a 2-D array or a list of rows. ``fmt`` is a
+    format string for non-string cells, or a list with one per column.
+    ``align`` is a list of ``"left"``/``"right"``; by default columns whose
+    every cell looks like a number are right-aligned. Short rows and short
+    ``headers``, ``fmt`` and ``align`` lists are padded with blanks, default
+    formats and default alignments. ``styles`` maps
+    ``(row, column)`` to ``{"color": ..., "weight": ...}`` for emphasis.
+    ``separator_every`` puts a thin rule after every n rows.
+
+    Sizes are in points: ``row_height`` is the row pitch, ``col_gap`` the
+    space between columns and ``overhang`` how far the rules extend past
+    the outer columns.
+    """
+
+    def __init__(self, data, headers=None, *, fmt=None, align=None, styles=None,
+                 fontsize=11, family="serif", color="#111111", header_color="#666666",
+                 header_weight="normal", rule_color="#111111", separator_color="#eeeeee",
+                 separator_every=1, row_height=None, col_gap=None, overhang=None):
+        own_headers, rows = _rows(data)
+        self.headers = list(headers) if headers is not None else own_headers
+        ncols = max([len(r) for r in rows] + [len(self.headers or ())])
+        if self.headers:
+            self.headers += [""] * (ncols - len(self.headers))
+        fmts = list(fmt) if isinstance(fmt, (list, tuple)) else [fmt] * ncols
+        fmts += [None] * (ncols - len(fmts))
+        self.cells = [[_format(v, fmts[j]) for j, v in enumerate(r)] + [""] * (ncols - len(r))
+                      for r in rows]
+        self.styles = dict(styles or {})
+        self.fontsize = fontsize
+        self.family = family
+        self.color = color
+        self.header_color = header_color
+        self.header_weight = header_weight
+        self.rule_color = rule_color
+        self.separator_color = separator_color
+        self.separator_every = separator_every
+        self.row_height = row_height or 2.2 * fontsize
+        self.col_gap = fontsize * 2 if col_gap is None else col_gap
+        self.overhang = fontsize * 0.8 if overhang is None else overhang
+
+        columns = list(zip(*self.cells)) if self.cells else [()] * ncols
+        auto = ["right" if col and all(_NUMBER.match(v) for v in col if v) and any(col)
+                else "left" for col in columns]
+        self.align = auto if align is None else list(align) + auto[len(align):]
+
+        # Measure every cell once; pages reuse these widths.
+        body = glyphs(family, fontsize, "normal")
+        head = glyphs(family, fontsize, header_weight)
+        self.widths = []
+        for j, col in enumerate(columns):
+            w = max(map(body.width, set(col)), default=0)
+            if self.headers:
+                w = max(w, head.width(self.headers[j]))
+            self.widths.append(w)
+        self.lefts = []
+        x = 0.0
+        for w in self.widths:
+            self.lefts.append(x)
+            x += w + self.col_gap
+        self.width = x - self.col_gap if self.widths else 0.0
+
+    def __len__(self):
+        return len(self.cells)
+
+    def page_height(self, nrows):
+        """Height in points of a page showing ``nrows`` rows (plus the header)."""
+        return (nrows + (1 if self.headers else 0)) * self.row_height
+
+    def pages(self, rows_per_page):
+        """Yield ``(start, stop)`` row ranges of at most ``rows_per_page`` rows."""
+        for start in range(0, max(len(self.cells), 1), rows_per_page):
+            yield start, min(start + rows_per_page, len(self.cells))
+
+    @profiled("artists")
+    def draw(self, ax, start=0, stop=None, anchor=(0, 1)):
+        """Draw rows ``start:stop`` on ``ax`` with the header, top-left at ``anchor``.
+
+        ``anchor`` is in axes coordinates; the table is laid out in points
+        from there, so it keeps its size whatever the axes size. The axes
+        is turned off. Returns a dict with the ``"text"`` artists (one per
+        non-empty cell) and the ``"rules"`` collection.
+        """
+        from matplotlib.collections import LineCollection
+        from matplotlib.text import Text
+        from matplotlib.transforms import Affine2D, ScaledTranslation
+
+        stop = len(self.cells) if stop is None else min(stop, len(self.cells))
+        fig = ax.get_figure()
+        points = (Affine2D().scale(1 / 72) + fig.dpi_scale_trans
+                  + ScaledTranslation(*anchor, ax.transAxes))
+        ax.set_axis_off()
+
+        pitch = self.row_height
+        # Baseline sits a little below mid-row: lining figures are ~0.7 em tall.
+        drop = pitch / 2 + 0.35 * self.fontsize
+        text = []
+
+        def cell(value, j, y, weight, color):
+            if value:
+                right = self.align[j] == "right"
+                x = self.lefts[j] + (self.widths[j] if right else 0.0)
+                text.append(Text(x, y, value, color=color, fontfamily=self.family,
+                                 fontsize=self.fontsize, fontweight=weight,
+                                 ha="right" if right else "left", va="baseline",
+                                 transform=points))
+
+        y = 0.0
+        segments, rule_colors, rule_widths = [], [], []
+        x0, x1 = -self.overhang, self.width + self.overhang
+        if self.headers:
+            for j, value in enumerate(self.headers):
+                cell(value, j, y - drop, self.header_weight, self.header_color)
+            y -= pitch
+        segments.append([(x0, y), (x1, y)])
+        rule_colors.append(self.rule_color)
+        rule_widths.append(1.0)
+
+        for i in range(start, stop):
+            for j, value in enumerate(self.cells[i]):
+                style = self.styles.get((i, j)) or {}
+                cell(value, j, y - drop, style.get("weight", "normal"),
+                     style.get("color", self.color))
+            y -= pitch
+            if i < stop - 1 and self.separator_every and (i + 1) % self.separator_every == 0:
+                segments.append([(x0, y), (x1, y)])
+                rule_colors.append(self.separator_color)
+                rule_widths.append(0.5)
+        segments.append([(x0, y), (x1, y)])
+        rule_colors.append(self.rule_color)
+        rule_widths.append(1.0)
+
+        rules = LineCollection(segments, colors=rule_colors, linewidths=rule_widths,
+                               transform=points)
+        for artist in [*text, rules]:
+            artist.set_clip_on(False)
+            ax.add_artist(artist)
+        return {"text": text, "rules": rules}
+
+    def figure_size(self, nrows, margin=0.5):
+        """``(width, height)`` in inches of a figure that fits ``nrows`` rows."""
+        return ((self.width + 2 * self.overhang) / 72 + 2 * margin,
+                self.page_height(nrows) / 72 + 2 * margin)
+
+    def save(self, path, rows_per_page=40, margin=0.5, facecolor="#fffff8", **savefig_kw):
+        """Render every page to ``path``; returns the number of pages.
+
+        A ``.pdf`` path becomes one multipage PDF. Any other path must hold
+        a ``{page}`` field (e.g. ``"recon-{page:03d}.png"``), filled with the
+        1-based page number. One figure is reused for every page.
+        """
+        from tufte.figures import figure
+
+        path = str(path)
+        pdf = Path(path).suffix.lower() == ".pdf"
+        if not pdf and "{page" not in path:
+            raise ValueError("path needs a {page} field unless it is a .pdf")
+        width, height = self.figure_size(min(rows_per_page, max(len(self), 1)), margin)
+        fig = figure(figsize=(width, height), facecolor=facecolor)
+        ax = fig.add_axes((margin / width, margin / height,
+                           1 - 2 * margin / width, 1 - 2 * margin / height))
+        ax.set_facecolor(facecolor)
+        anchor = (self.overhang / 72 / (width - 2 * margin), 1)
+
+        if pdf:
+            from matplotlib.backends.backend_pdf import PdfPages
+            out = PdfPages(path)
+            write = lambda number: out.savefig(fig, **savefig_kw)  # noqa: E731
+        else:
+            write = lambda number: fig.savefig(path.format(page=number), **savefig_kw)  # noqa: E731
+        count = 0
+        try:
+            for count, (start, stop) in enumerate(self.pages(rows_per_page), 1):
+                artists = self.draw(ax, start, stop, anchor=anchor)
+                write(count)
+                for artist in [*artists["text"], artists["rules"]]:
+                    artist.remove()
+        finally:
+            if pdf:
+                out.close()
+        return count
+
+    def to_html(self, start=0, stop=None, css=False):
+        """Return rows ``start:stop`` as a ``<table class="tufte-table">``.
+
+        Right-aligned columns get ``class="num"``, rules become
+        ``class="separator"`` rows and ``styles`` become inline colors and
+        weights. ``css=True`` prepends a ``<style>`` block with
+        ``TUFTE_TABLE_CSS``.
+        """
+        stop = len(self.cells) if stop is None else min(stop, len(self.cells))
+        out = [f"<style>\n{TUFTE_TABLE_CSS}</style>\n"] if css else []
+        out.append('<table class="tufte-table">\n')
+        if self.headers:
+            cells = "".join(
+                f'<th style="text-align: right">{escape(h)}</th>' if a == "right"
+                else f"<th>{escape(h)}</th>" for h, a in zip(self.headers, self.align))
+            out.append(f"  <thead>\n    <tr>{cells}</tr>\n  </thead>\n")
+        out.append("  <tbody>\n")
+        classes = ['' if a == "left" else ' class="num"' for a in self.align]
+        for i in range(start, stop):
+            separator = i > start and self.separator_every and i % self.separator_every == 0
+            cells = []
+            for j, text in enumerate(self.cells[i]):
+                style = self.styles.get((i, j))
+                css_style = ""
+                if style:
+                    rules = []
+                    if "color" in style:
+                        rules.append(f"color: {style['color']}")
+                    if style.get("weight", "normal") != "normal":
+                        rules.append(f"font-weight: {style['weight']}")
+                    css_style = f' style="{"; ".join(rules)}"' if rules else ""
+                cells.append(f"<td{classes[j]}{css_style}>{escape(text)}</td>")
+            row_class = ' class="separator"' if separator else ""
+            out.append(f"    <tr{row_class}>{''.join(cells)}</tr>\n")
+        out.append("  </tbody>\n</table>\n")
+        return "".join(out)
@@ -0,0 +1,213 @@
+"""One chart in every theme: the artists are built once and re-skinned per theme.
+
+Shipping a chart in light and dark used to mean drawing it twice, under
+``TUFTE_RC`` with ``PALETTE`` and again under ``TUFTE_DARK_RC`` with
+``PALETTE_DARK``: twice the artists, twice the layout, and nothing to keep
+the two in step. Here the chart is drawn once, in one theme, and each
+other theme is a recoloring of the same artists. Every color is looked up
+by its role and replaced by the same role's color in the other theme. The
+roles are the palette keys (``text``, ``text2``, ``note``, ``gray``,
+``highlight``, ``axis``, ``cat0``...) and the rc colors (background,
+spines, ticks and labels):
+
+    with themed("light"):
+        fig = figure(figsize=(9, 6))
+        ax = fig.subplots()
+        ax.plot(months, revenue, color=PALETTE["highlight"])
+        tufte_layout(fig, "Revenue Exceeded Target", color=PALETTE["text"])
+    save_themes(fig, {"light": "revenue.png", "dark": "revenue-dark.png"})
+
+    pngs = render_themes(draw, ("light", "dark"))   # draw(fig, palette); {theme: bytes}
+
+The layout is computed once, so the themes share their geometry exactly;
+only the rasterizing and encoding are repeated, and for a PNG they are
+most of the cost. Colors are matched by value. A color that belongs to no
+role (``"#123456"``, a colormap) is the same in every theme, and one that
+happens to equal a role's is re-skinned with it: matplotlib's default
+legend edge is the light ``axis`` gray. Two roles may share a color
+(``text2`` and ``gray``) only if they also do in the other theme;
+``recolor_map`` raises ``ValueError`` otherwise.
+"""
+
+from contextlib import ExitStack, contextmanager
+from functools import lru_cache
+
+from tufte.figures import THEMES, _finish, _save, figure, themed
+from tufte.style import PALETTE, PALETTE_DARK
+
+PALETTES = {"light": PALETTE, "dark": PALETTE_DARK}
+
+# rcParams that hold a theme color
+RC_ROLES = ("figure.facecolor", "axes.facecolor", "axes.edgecolor", "axes.labelcolor",
+            "xtick.color", "ytick.color", "savefig.facecolor")
+
+
+def roles(theme):
+    """``{role: color}`` for ``theme``: palette keys (``cat`` as ``cat0``...) and ``RC_ROLES``."""
+    if theme not in PALETTES:
+        raise ValueError(f"unknown theme {theme!r}; expected one of {sorted(PALETTES)}")
+    out = {}
+    for key, value in PALETTES[theme].items():
+        if isinstance(value, (list, tuple)):
+            out.update({f"{key}{i}": color for i, color in enumerate(value)})
+        else:
+            out[key] = value
+    rc = THEMES[theme]
+    out.update({key: rc[key] for key in RC_ROLES if key in rc})
+    return out
+
+
+@lru_cache(maxsize=None)
+def recolor_map(source, target):
+    """``{"#rrggbb" in source: (r, g, b) in target}``, matched role by role."""
+    from matplotlib.colors import to_hex, to_rgb
+
+    swap, owner = {}, {}
+    dst = roles(target)
+    for role, color in roles(source).items():
+        if role not in dst:
+            continue
+        key, new = to_hex(color), to_rgb(dst[role])
+        if swap.setdefault(key, new) != new:
+            raise ValueError(f"roles {owner[key]!r} and {role!r} share {key} in {source} "
+                             f"but not in {target}")
+        owner.setdefault(key, role)
+    return {key: new for key, new in swap.items() if to_rgb(key) != new}
+
+
+def _swapped(color, swap, single):
+    """``color`` (one color or an array) with its ``swap`` colors replaced, or None."""
+    from matplotlib.colors import to_hex, to_rgba_array
+
+    if color is None or isinstance(color, str) and color.lower() in ("none", "auto", "face"):
+        return None
+    rgba = to_rgba_array(color)
+    hits = [(i, swap[to_hex(c)]) for i, c in enumerate(rgba) if to_hex(c) in swap]
+    if not hits:
+        return None
+    rgba = rgba.copy()
+    for i, rgb in hits:
+        rgba[i, :3] = rgb  # alpha is kept
+    return tuple(rgba[0]) if single else rgba
+
+
+def _recolorings(artist, swap):
+    """``(setter, original, recolored)`` for every color of ``artist`` that ``swap`` changes.
+
+    The originals are the colors as set, not as resolved, so that restoring
+    them keeps ``"auto"`` marker colors and ``None`` defaults as they were.
+    """
+    from matplotlib.collections import Collection
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Patch
+    from matplotlib.text import Text
+
+    nested = []
+    if isinstance(artist, Line2D):
+        props = [(artist.set_color, artist._color),
+                 (artist.set_markerfacecolor, artist._markerfacecolor),
+                 (artist.set_markeredgecolor, artist._markeredgecolor),
+                 (artist.set_markerfacecoloralt, artist._markerfacecoloralt)]
+    elif isinstance(artist, Text):
+        props = [(artist.set_color, artist.get_color())]
+        # Not children of the text, so findobj does not reach them
+        nested = [artist.get_bbox_patch(), getattr(artist, "arrow_patch", None)]
+    elif isinstance(artist, Patch):
+        props = [(artist.set_facecolor, artist._original_facecolor),
+                 (artist.set_edgecolor, artist._original_edgecolor)]
+    elif isinstance(artist, Collection):
+        props = [(artist.set_edgecolor, artist._original_edgecolor)]
+        if artist.get_array() is None:  # colormapped faces follow the data
+            props.append((artist.set_facecolor, artist._original_facecolor))
+    else:
+        return []
+    single = not isinstance(artist, Collection)
+    out = [(setter, color, new) for setter, color in props
+           if (new := _swapped(color, swap, single)) is not None]
+    for patch in nested:
+        if patch is not None:
+            out += _recolorings(patch, swap)
+    return out
+
+
+@contextmanager
+def skinned(fig, theme, drawn_in="light"):
+    """Within the block, ``fig``, drawn in ``drawn_in``, wears ``theme``'s colors and rc.
+
+    A ``TufteLayout`` is applied once, on entry, and the colors are
+    restored on exit. Other threads' ``themed`` blocks wait for this one.
+    """
+    from tufte.layout import laid_out
+
+    swap = recolor_map(drawn_in, theme)
+    with ExitStack() as stack:
+        with themed(drawn_in):
+            stack.enter_context(laid_out(fig))
+            changes = []
+            if swap:
+                for ax in fig.axes:
+                    # Create now, in drawn_in's colors, the ticks the draw will use;
+                    # ticks added later copy the (re-skinned) first one
+                    ax.get_xticklabels(which="both")
+                    ax.get_yticklabels(which="both")
+                changes = [change for artist in fig.findobj(include_self=False)
+                           for change in _recolorings(artist, swap)]
+        stack.enter_context(themed(theme))
+        for setter, _, new in changes:
+            setter(new)
+        try:
+            yield fig
+        finally:
+            for setter, original, _ in changes:
+                setter(original)
+
+
+def save_themes(fig, paths, drawn_in="light", **kwargs):
+    """Save ``fig``, drawn in ``drawn_in``, once per theme; ``paths`` maps theme to file.
+
+    Each file is written with ``tufte.layout.save`` (``kwargs`` go to it)
+    under its theme's rc. Returns ``paths``.
+    """
+    from tufte.layout import laid_out, save
+
+    with themed(drawn_in), laid_out(fig):
+        for theme, path in paths.items():
+            with skinned(fig, theme, drawn_in):
+                save(fig, path, **kwargs)
+    return paths
+
+
+def _tight_bbox(fig, dpi):
+    """The box ``savefig(bbox_inches="tight")`` would measure at ``dpi``, measured once."""
+    from matplotlib import rcParams
+
+    own = fig.dpi
+    fig.dpi = dpi
+    try:
+        fig.draw_without_rendering()
+        return fig.get_tightbbox().padded(rcParams["savefig.pad_inches"])
+    finally:
+        fig.dpi = own
+
+
+def render_themes(draw, themes=("light", "dark"), format="png", size=(8, 5), dpi=100,
+                  **savefig_kw):
+    """Call ``draw(fig, palette)`` once, in the first theme, and return ``{theme: bytes}``.
+
+    The ``render_figure`` of several themes: same arguments, and safe to
+    call from any thread. A ``"tight"`` ``savefig.bbox`` is measured once
+    for all themes.
+    """
+    from matplotlib import rcParams
+
+    drawn_in, saved = themes[0], {}
+    with themed(drawn_in):
+        fig = figure(figsize=size)
+        draw(fig, PALETTES[drawn_in])
+        if format == "png" and "bbox_inches" not in savefig_kw \
+                and rcParams["savefig.bbox"] == "tight" and fig.get_layout_engine() is None:
+            savefig_kw["bbox_inches"] = _tight_bbox(fig, dpi)
+        for theme in themes:
+            with skinned(fig, theme, drawn_in):
+                saved[theme] = _save(fig, format, dpi, savefig_kw)
+    return {theme: _finish(data) for theme, data in saved.items()}
@@ -0,0 +1,292 @@
+"""Small SVG and PDF output for Tufte charts.
+
+Matplotlib writes every vertex with six decimals, draws artists nobody can
+see, repeats each element's full inline style in SVG and keeps encoder
+metadata. A report with hundreds of embedded charts pays for all of it.
+``save_vector`` writes the same chart without that overhead:
+
+    save_vector(fig, "revenue.svg")
+    save_vector(figs, "report.pdf")     # many charts, one file, fonts embedded once
+
+``tufte.layout.save`` takes this route for ``.svg`` and ``.pdf`` paths. Under
+``compact``:
+
+- Path vertices are rounded to the output ``resolution`` (dpi): 300 dpi
+  keeps 0.1pt, finer than a printed pixel. Vertices then lying on one
+  straight segment, or on top of each other, are merged exactly.
+- Invisible artists are skipped: zero alpha, no fill and no edge,
+  zero-length ticks, an axes background identical to the figure's.
+- Fonts are subset to the glyphs used (SVG glyph paths, PDF TrueType).
+  ``fonts="reference"`` embeds none: SVG names the font family, PDF uses
+  the viewer's Times.
+- SVG inline styles become one CSS class per distinct style, unreferenced
+  ids and bare groups are dropped, and text positions are rounded too.
+
+Markers and scatter collections keep matplotlib's own symbol reuse, so they
+are not rounded.
+"""
+
+import math
+import re
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+
+import numpy as np
+
+RESOLUTION = 300
+FONTS = ("embed", "reference")
+METADATA = {
+    ".pdf": {"Creator": None, "Producer": None, "CreationDate": None},
+    ".svg": {"Creator": None, "Date": None, "Format": None, "Type": None},
+}
+
+
+def grid(resolution=RESOLUTION):
+    """Decimal places that keep positions within one pixel at ``resolution`` dpi."""
+    return max(math.ceil(math.log10(resolution / 72)), 0)
+
+
+def _quantize_effect(decimals):
+    from matplotlib.path import Path as MplPath
+    from matplotlib.patheffects import AbstractPathEffect
+    from matplotlib.transforms import IdentityTransform
+
+    class Quantize(AbstractPathEffect):
+        """Draw the path in output units, rounded, with redundant vertices merged."""
+
+        def draw_path(self, renderer, gc, tpath, affine, rgbFace=None):
+            scale = 10 ** decimals
+            vertices = np.rint(affine.transform(tpath.vertices) * scale)
+            keep = _needed(vertices, tpath.codes)
+            codes = None if tpath.codes is None else tpath.codes[keep]
+            renderer.draw_path(gc, MplPath(vertices[keep] / scale, codes),
+                               IdentityTransform(), rgbFace)
+    return Quantize()
+
+
+def _needed(vertices, codes):
+    """Mask of the vertices to keep: drop repeats and interior points of straight runs.
+
+    ``vertices`` are integers (in grid units), so collinearity is exact. A
+    point where the line turns back (an M4 spike) is kept.
+    """
+    from matplotlib.path import Path as MplPath
+
+    n = len(vertices)
+    keep = np.ones(n, dtype=bool)
+    if n < 3:
+        return keep
+    lineto = (np.ones(n, dtype=bool) if codes is None else codes == MplPath.LINETO)
+    if codes is None:
+        lineto[0] = False
+    d_in = vertices[1:-1] - vertices[:-2]
+    d_out = vertices[2:] - vertices[1:-1]
+    cross = d_in[:, 0] * d_out[:, 1] - d_in[:, 1] * d_out[:, 0]
+    dot = (d_in * d_out).sum(axis=1)
+    straight = (cross == 0) & (dot > 0)
+    repeat = (d_in == 0).all(axis=1)
+    # Only a segment continued by another segment can lose its end point
+    keep[1:-1] = ~((straight | repeat) & lineto[1:-1] & lineto[2:])
+    return keep
+
+
+def _invisible(artist):
+    """Whether drawing ``artist`` would put nothing on the page."""
+    from matplotlib.collections import Collection
+    from matplotlib.colors import to_rgba
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Patch
+    from matplotlib.text import Text
+
+    if isinstance(artist, Text):
+        # Matplotlib skips empty text itself, and a hidden axes title would
+        # throw off the placement of its siblings
+        return False
+    if artist.get_alpha() == 0:
+        return True
+    if isinstance(artist, Line2D):
+        line = (artist.get_linestyle() not in ("None", "none", "", " ")
+                and artist.get_linewidth() > 0 and to_rgba(artist.get_color())[3] > 0)
+        marker = (artist.get_marker() not in ("None", "none", "", " ", None)
+                  and artist.get_markersize() > 0
+                  and (to_rgba(artist.get_markeredgecolor())[3] > 0
+                       or to_rgba(artist.get_markerfacecolor())[3] > 0))
+        return not (line or marker)
+    if isinstance(artist, Patch):
+        fill = artist.get_fill() and artist.get_facecolor()[3] > 0
+        edge = artist.get_linewidth() > 0 and artist.get_edgecolor()[3] > 0
+        return not (fill or edge)
+    if isinstance(artist, Collection):
+        if not len(artist.get_paths()):
+            return True
+        face = np.asarray(artist.get_facecolor()).reshape(-1, 4)[:, 3]
+        edge = np.asarray(artist.get_edgecolor()).reshape(-1, 4)[:, 3]
+        widths = np.asarray(artist.get_linewidth())
+        return not ((face > 0).any() or ((edge > 0).any() and (widths > 0).any()))
+    return False
+
+
+def _roundable(artist):
+    from matplotlib.collections import LineCollection, PolyCollection
+    from matplotlib.lines import Line2D
+    from matplotlib.patches import Patch
+
+    if artist.get_path_effects():
+        return False
+    if isinstance(artist, Line2D):
+        # A marker per point is one shared symbol; a single one (a tick) is not
+        return (artist.get_marker() in ("None", "none", "", " ", None)
+                or len(artist.get_xdata()) <= 1)
+    return isinstance(artist, (Patch, LineCollection, PolyCollection))
+
+
+@contextmanager
+def compact(fig, resolution=RESOLUTION, fonts="embed"):
+    """Within the block, ``fig`` saves to SVG/PDF compactly; see the module docstring.
+
+    The figure's artists are restored on exit. The block's rcParams are
+    applied with ``themed``, so it holds ``RC_LOCK``.
+    """
+    from matplotlib.colors import to_rgba
+
+    from tufte.figures import themed
+
+    if fonts not in FONTS:
+        raise ValueError(f"unknown fonts {fonts!r}; choose from {', '.join(FONTS)}")
+    effect = [_quantize_effect(grid(resolution))]
+    face = to_rgba(fig.get_facecolor())
+    backgrounds = {ax.patch for ax in fig.axes if to_rgba(ax.patch.get_facecolor()) == face}
+    hidden, rounded = [], []
+    for artist in fig.findobj(include_self=False):
+        if not artist.get_visible():
+            continue
+        if artist in backgrounds or _invisible(artist):
+            hidden.append(artist)
+            artist.set_visible(False)
+        elif _roundable(artist):
+            rounded.append(artist)
+            artist.set_path_effects(effect)
+    rc = {"pdf.fonttype": 42, "pdf.compression": 9, "svg.fonttype": "path",
+          "svg.hashsalt": "tufte"}
+    if fonts == "reference":
+        rc.update({"svg.fonttype": "none", "pdf.use14corefonts": True})
+    try:
+        with themed(rc):
+            yield fig
+    finally:
+        for artist in hidden:
+            artist.set_visible(True)
+        for artist in rounded:
+            artist.set_path_effects([])
+
+
+def save_vector(figs, path, resolution=RESOLUTION, fonts="embed", **kwargs):
+    """Write ``figs`` (one figure, or several for a multi-page ``.pdf``) compactly.
+
+    ``kwargs`` go to ``savefig``. Figures with a ``TufteLayout`` are laid
+    out first, as ``tufte.layout.save`` does. ``RC_LOCK`` is held throughout.
+    """
+    from tufte.figures import themed
+    from tufte.layout import laid_out
+
+    suffix = Path(path).suffix.lower()
+    if suffix not in METADATA:
+        raise ValueError(f"cannot write {Path(path).name}: expected .svg or .pdf")
+    figs = [figs] if hasattr(figs, "savefig") else list(figs)
+    if len(figs) > 1 and suffix != ".pdf":
+        raise ValueError("several figures need a .pdf path")
+    kwargs.setdefault("metadata", METADATA[suffix])
+    with ExitStack() as stack:
+        stack.enter_context(themed({"savefig.bbox": "standard"}))
+        for fig in figs:
+            stack.enter_context(laid_out(fig))
+            stack.enter_context(compact(fig, resolution, fonts))
+        if suffix == ".svg":
+            from io import StringIO
+
+            buffer = StringIO()
+            figs[0].savefig(buffer, format="svg", **kwargs)
+            Path(path).write_text(minify_svg(buffer.getvalue(), grid(resolution)))
+        elif len(figs) == 1:
+            figs[0].savefig(path, **kwargs)
+        else:
+            from matplotlib.backends.backend_pdf import PdfPages
+
+            # One file: each font is embedded once, subset to every page's glyphs
+            with PdfPages(path, metadata=kwargs.pop("metadata")) as pdf:
+                for fig in figs:
+                    pdf.savefig(fig, **kwargs)
+    return path
+
+
+_TRANSLATE = re.compile(r"translate\((-?[\d.]+)[ ,](-?[\d.]+)\)")
+_SPACES = re.compile(r"\s*([:;])\s*")
+_COMMAND = re.compile(r"\s*([A-Za-z])\s*")
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+# Matplotlib's SVG glyphs are 6400 units per em, scaled by 1/64; 8 units is
+# 1/800 em, 0.045pt at 36pt
+_GLYPH_SCALE = "scale(0.015625)"
+_GLYPH_STEP = 8
+
+
+def minify_svg(svg, decimals):
+    """Matplotlib SVG with shared CSS classes, fewer ids and groups, rounded text positions."""
+    import xml.etree.ElementTree as ET
+
+    ns = {"": "http://www.w3.org/2000/svg", "xlink": "http://www.w3.org/1999/xlink"}
+    for prefix, uri in ns.items():
+        ET.register_namespace(prefix, uri)
+    head, _, body = svg.partition("<svg")
+    root = ET.fromstring("<svg" + body)
+    referenced = set(re.findall(r"(?:href=\"|url\()#([\w.-]+)", svg))
+
+    def rounded(match):
+        return "translate({} {})".format(*(_short(float(v), decimals) for v in match.groups()))
+
+    styles = {}
+    for el in root.iter():
+        if el.text is not None and not el.text.strip():
+            el.text = None
+        el.tail = None
+        if "d" in el.attrib:
+            d = el.get("d")
+            if el.get("transform") == _GLYPH_SCALE:
+                d = _NUMBER.sub(lambda m: str(round(float(m.group(0)) / _GLYPH_STEP)), d)
+                el.set("transform", f"scale({_GLYPH_STEP / 64:g})")
+            el.set("d", _COMMAND.sub(r"\1", d).strip().replace(" -", "-"))
+        if el.tag.endswith("}use"):
+            for name in ("x", "y"):
+                if name in el.attrib:
+                    el.set(name, _short(float(el.get(name)), decimals))
+        style = el.attrib.pop("style", None)
+        if style is not None:
+            style = _SPACES.sub(r"\1", style.strip()).rstrip(";")
+            el.set("class", styles.setdefault(style, f"s{len(styles)}"))
+        if el.tag.endswith("}g") and el.get("id") not in referenced:
+            el.attrib.pop("id", None)
+        if "transform" in el.attrib:
+            el.set("transform", _TRANSLATE.sub(rounded, el.get("transform")))
+    _unwrap_groups(root)
+    css = "".join(f".{name}{{{style}}}" for style, name in styles.items())
+    sheet = root.find("{http://www.w3.org/2000/svg}defs/{http://www.w3.org/2000/svg}style")
+    if sheet is not None:
+        sheet.text = (sheet.text or "").strip() + css
+    out = ET.tostring(root, encoding="unicode", short_empty_elements=True)
+    return head + out + "\n"
+
+
+def _short(value, decimals):
+    return f"{value:.{decimals}f}".rstrip("0").rstrip(".") or "0"
+
+
+def _unwrap_groups(parent):
+    """Replace attribute-less ``<g>`` elements by their children."""
+    i = 0
+    while i < len(parent):
+        child = parent[i]
+        _unwrap_groups(child)
+        if child.tag.endswith("}g") and not child.attrib:
+            parent[i:i + 1] = list(child)
+            i += len(child)
+        else:
+            i += 1